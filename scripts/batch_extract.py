@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Batch Extractor
+
+Scans capture directories for HAR files (*.har, *.har.json) and WebSocket
+logs (*.ws.jsonl), optionally compressed, and runs the matching extractor on
+each of them:
+
+    *.har / *.har.json  ->  <name>.openapi.yaml (and <name>.graphql.json with --graphql)
+    *.ws.jsonl          ->  <name>.asyncapi.yaml
+
+Files run on a bounded pool of worker processes, largest first so the long
+jobs start early and the small ones fill the gaps. A failing file is recorded
+and reported without stopping the batch. Files whose outputs are newer than
+the input are skipped, so repeated (e.g. nightly) runs only redo new captures.
+
+Usage:
+    python scripts/batch_extract.py captures/
+    python scripts/batch_extract.py captures/ -o specs/ --jobs 8 --graphql --report batch.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bounded_cache import BoundedCache
+from compressed_io import EXTENSIONS, open_output
+
+# Capture suffix -> tools run on it
+CAPTURE_SUFFIXES = (
+    ('.har.json', ('openapi',)),
+    ('.har', ('openapi',)),
+    ('.ws.jsonl', ('asyncapi',)),
+)
+
+OUTPUT_SUFFIXES = {
+    'openapi': '.openapi',
+    'asyncapi': '.asyncapi',
+    'graphql': '.graphql',
+}
+
+# Body schemas kept per worker process across the HAR jobs it runs
+BODY_CACHE_SIZE = 100_000
+
+# Per-process body schema cache (a BoundedCache, created by the first HAR job)
+_BODY_CACHE: Optional[BoundedCache] = None
+
+
+def split_capture_name(filename: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    Match a file name against the known capture suffixes.
+
+    Args:
+        filename: File name, optionally with a compression extension
+
+    Returns:
+        Tuple of (stem, tools) or None if the file is not a capture
+    """
+    name = filename
+    extension = os.path.splitext(name)[1].lower()
+    if extension in EXTENSIONS:
+        name = name[:-len(extension)]
+    lowered = name.lower()
+    for suffix, tools in CAPTURE_SUFFIXES:
+        if lowered.endswith(suffix) and len(name) > len(suffix):
+            return name[:-len(suffix)], tools
+    return None
+
+
+def scan_captures(
+    roots: List[str],
+    output_dir: Optional[str] = None,
+    output_format: str = 'yaml',
+    graphql: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Find capture files and plan their jobs.
+
+    Args:
+        roots: Directories (scanned recursively) or individual files
+        output_dir: Directory for outputs, mirroring the input layout;
+            outputs are written next to the inputs when omitted
+        output_format: 'yaml' or 'json' for specs
+        graphql: Also extract GraphQL operations from HAR files
+
+    Returns:
+        Jobs sorted largest input first, each with input, size, root-relative
+        name and a tool -> output path mapping
+    """
+    jobs = []
+    for root in roots:
+        if os.path.isfile(root):
+            candidates = [(os.path.dirname(root) or '.', os.path.basename(root))]
+        else:
+            candidates = [
+                (dirpath, filename)
+                for dirpath, _, filenames in os.walk(root)
+                for filename in filenames
+            ]
+
+        for dirpath, filename in candidates:
+            match = split_capture_name(filename)
+            if match is None:
+                continue
+            stem, tools = match
+            if graphql and 'openapi' in tools:
+                tools = tools + ('graphql',)
+
+            input_path = os.path.join(dirpath, filename)
+            target_dir = dirpath
+            if output_dir:
+                relative = os.path.relpath(dirpath, root) if os.path.isdir(root) else '.'
+                target_dir = os.path.normpath(os.path.join(output_dir, relative))
+
+            outputs = {}
+            for tool in tools:
+                extension = 'json' if tool == 'graphql' else output_format
+                outputs[tool] = os.path.join(target_dir, f"{stem}{OUTPUT_SUFFIXES[tool]}.{extension}")
+
+            jobs.append({
+                'input': input_path,
+                'size': os.path.getsize(input_path),
+                'outputs': outputs,
+            })
+
+    jobs.sort(key=lambda job: job['size'], reverse=True)
+    return jobs
+
+
+def is_up_to_date(job: Dict[str, Any]) -> bool:
+    """
+    Check whether every output of a job is newer than its input.
+
+    Args:
+        job: Planned job
+
+    Returns:
+        True if the job can be skipped
+    """
+    input_mtime = os.path.getmtime(job['input'])
+    for output_path in job['outputs'].values():
+        try:
+            if os.path.getmtime(output_path) < input_mtime:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _write_atomic(output_path: str, data: Any, output_format: str) -> None:
+    """
+    Write a result through a temporary file so interrupted runs never leave
+    a truncated output that looks up to date.
+    """
+    directory = os.path.dirname(output_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".tmp-{os.getpid()}-{os.path.basename(output_path)}")
+    try:
+        with open_output(temp_path) as f:
+            if output_format == 'yaml':
+                import yaml
+                yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            else:
+                json.dump(data, f)
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def run_job(job: Dict[str, Any], stream: bool = False) -> Dict[str, Any]:
+    """
+    Run every extractor of one job (in a worker process).
+
+    Args:
+        job: Planned job
+        stream: Stream HAR entries instead of loading whole files
+
+    Returns:
+        Job result with ok, elapsed seconds and a summary or error
+    """
+    global _BODY_CACHE
+    started = time.perf_counter()
+    result: Dict[str, Any] = {'input': job['input'], 'size': job['size'], 'ok': True, 'summary': {}}
+    try:
+        for tool, output_path in job['outputs'].items():
+            output_format = 'json' if output_path.endswith('.json') else 'yaml'
+
+            if tool == 'openapi':
+                from har_to_openapi import HARToOpenAPIConverter
+                if _BODY_CACHE is None:
+                    _BODY_CACHE = BoundedCache(BODY_CACHE_SIZE)
+                converter = HARToOpenAPIConverter(job['input'], body_cache=_BODY_CACHE, streaming=stream)
+                data = converter.convert()
+                result['summary']['endpoints'] = len(converter.endpoints)
+            elif tool == 'graphql':
+                from graphql_extractor import GraphQLExtractor
+                extractor = GraphQLExtractor(job['input'])
+                data = extractor.extract()
+                result['summary']['queries'] = len(data)
+            else:
+                from ws_schema_extractor import WebSocketSchemaExtractor
+                ws_extractor = WebSocketSchemaExtractor(job['input'])
+                data = ws_extractor.extract()
+                result['summary']['messages'] = len(ws_extractor.messages)
+
+            _write_atomic(output_path, data, output_format)
+
+    except Exception as e:
+        result['ok'] = False
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['elapsed'] = time.perf_counter() - started
+    return result
+
+
+def _format_size(size: float) -> str:
+    """Format a byte count for progress lines."""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _run_round(
+    jobs: List[Dict[str, Any]],
+    workers: Optional[int],
+    stream: bool,
+    on_result: Callable[[Dict[str, Any]], None],
+) -> List[Dict[str, Any]]:
+    """
+    Run jobs on one process pool, passing each result to a callback.
+
+    A job whose future raises is recorded as failed. When a worker dies
+    (OOM, crash in a C extension) the pool breaks and every job still
+    pending in it fails with BrokenProcessPool; those jobs are returned to
+    be rerun instead of being blamed.
+
+    Returns:
+        Jobs lost to a broken pool
+    """
+    broken = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job, stream): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                broken.append(job)
+                continue
+            except Exception as e:
+                result = {'input': job['input'], 'size': job['size'], 'ok': False, 'summary': {},
+                          'error': f"{type(e).__name__}: {e}", 'elapsed': 0.0}
+            on_result(result)
+    return broken
+
+
+def run_batch(
+    jobs: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    stream: bool = False,
+    report: Any = sys.stdout,
+) -> List[Dict[str, Any]]:
+    """
+    Run jobs on a process pool, printing progress as they complete.
+
+    If a worker process dies, the jobs lost with its pool are rerun on a
+    fresh pool, and jobs lost again are rerun one per process so only the
+    file that kills its worker is recorded as failed.
+
+    Args:
+        jobs: Jobs to run (largest first)
+        workers: Worker processes (default: CPU count)
+        stream: Stream HAR entries instead of loading whole files
+        report: Stream for progress lines
+
+    Returns:
+        Job results in completion order
+    """
+    results: List[Dict[str, Any]] = []
+    total_bytes = sum(job['size'] for job in jobs)
+    done_bytes = 0
+    started = time.perf_counter()
+
+    def record(result: Dict[str, Any]) -> None:
+        nonlocal done_bytes
+        results.append(result)
+        done_bytes += result['size']
+
+        elapsed = time.perf_counter() - started
+        throughput = done_bytes / elapsed if elapsed > 0 else 0.0
+        status = '✅' if result['ok'] else '❌'
+        detail = ', '.join(f"{key} {value}" for key, value in result['summary'].items()) \
+            if result['ok'] else result['error']
+        print(
+            f"[{len(results)}/{len(jobs)}] {status} {result['input']} "
+            f"({_format_size(result['size'])}, {result['elapsed']:.2f}s) {detail} | "
+            f"{_format_size(done_bytes)}/{_format_size(total_bytes)} at {_format_size(throughput)}/s",
+            file=report,
+            flush=True,
+        )
+
+    broken = _run_round(jobs, workers, stream, record)
+    if broken:
+        print(f"⚠️  Worker process died: rerunning {len(broken)} files on a fresh pool", file=report, flush=True)
+        broken = _run_round(broken, workers, stream, record)
+    if broken:
+        print(f"⚠️  Worker process died again: rerunning {len(broken)} files one per process",
+              file=report, flush=True)
+        for job in broken:
+            if _run_round([job], 1, stream, record):
+                record({'input': job['input'], 'size': job['size'], 'ok': False, 'summary': {},
+                        'error': 'BrokenProcessPool: worker process died', 'elapsed': 0.0})
+
+    return results
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Run the extractors over every capture in one or more directories',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/batch_extract.py captures/
+  python scripts/batch_extract.py captures/ -o specs/ --jobs 8
+  python scripts/batch_extract.py captures/ -o specs/ --graphql --format json --report batch.json
+  python scripts/batch_extract.py captures/ --dry-run
+        """
+    )
+    parser.add_argument('inputs', nargs='+', help='Capture directories (scanned recursively) or files')
+    parser.add_argument('-o', '--output-dir', help='Output directory mirroring the input layout (default: next to inputs)')
+    parser.add_argument(
+        '-f', '--format',
+        choices=['yaml', 'json'],
+        default='yaml',
+        help='Spec output format (default: yaml)'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help=f'Worker processes (default: {os.cpu_count() or 1})'
+    )
+    parser.add_argument(
+        '--graphql',
+        action='store_true',
+        help='Also extract GraphQL operations from HAR files'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream HAR entries instead of loading whole files'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-run files whose outputs are newer than their inputs'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='List planned jobs without running them'
+    )
+    parser.add_argument('--report', help='Write per-file results as JSON to this path')
+
+    args = parser.parse_args()
+
+    try:
+        jobs = scan_captures(args.inputs, args.output_dir, args.format, args.graphql)
+        pending = jobs if args.force else [job for job in jobs if not is_up_to_date(job)]
+        skipped = len(jobs) - len(pending)
+
+        if args.dry_run:
+            for job in pending:
+                print(f"{job['input']} ({_format_size(job['size'])}) -> {', '.join(job['outputs'].values())}")
+            print(f"   Captures: {len(jobs)} ({skipped} up to date)")
+            return
+
+        started = time.perf_counter()
+        results = run_batch(pending, workers=args.jobs, stream=args.stream)
+        elapsed = time.perf_counter() - started
+        failed = [result for result in results if not result['ok']]
+        processed_bytes = sum(result['size'] for result in results)
+
+        if args.report:
+            with open(args.report, 'w') as f:
+                json.dump({
+                    'captures': len(jobs),
+                    'skipped': skipped,
+                    'processed': len(results),
+                    'failed': len(failed),
+                    'elapsed': round(elapsed, 3),
+                    'results': results,
+                }, f, indent=2)
+
+        print(f"{'⚠️ ' if failed else '✅'} Batch finished: {len(results) - len(failed)} succeeded, {len(failed)} failed")
+        print(f"   Captures: {len(jobs)} ({skipped} up to date, skipped)")
+        print(f"   Processed: {_format_size(processed_bytes)} in {elapsed:.1f}s "
+              f"({_format_size(processed_bytes / elapsed if elapsed > 0 else 0)}/s, {args.jobs} workers)")
+        for result in failed:
+            print(f"   ❌ {result['input']}: {result['error']}")
+
+        if failed:
+            sys.exit(1)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Body Sampling
+
+Stratified body sampling for the extractors. The first N bodies of every
+stratum (endpoint and status, or message direction and type) are always
+processed; after that bodies are sampled at a fixed rate. Cheap metadata
+(counts, sizes, timings) is recorded for every body, sampled or not, so each
+operation can report its sample coverage next to exact traffic figures.
+
+Sampled positions are drawn as geometric skips from a seeded generator, so
+the draw costs one random number per sampled body rather than per body and
+repeated runs pick the same bodies.
+
+Usage:
+    sampler = BodySampler(first=20, rate=0.05)
+    if sampler.sample(('GET:/rest/thread/{id}', '200'), size=len(text), elapsed=entry['time']):
+        ...  # decode and infer the body
+    sampler.coverage(('GET:/rest/thread/{id}', '200'))
+"""
+
+import argparse
+import math
+import random
+from typing import Any, Dict, Hashable, Optional
+
+DEFAULT_SAMPLE_FIRST = 20
+
+
+class SampleStats:
+    """Counters of one sampling stratum."""
+
+    __slots__ = ('seen', 'sampled', 'next_index', 'bytes', 'max_bytes', 'timed', 'time', 'max_time',
+                 'first_timestamp', 'last_timestamp')
+
+    def __init__(self):
+        """Initialize counters."""
+        self.seen = 0
+        self.sampled = 0
+        # 1-based position of the next sampled body after the first N
+        self.next_index = 0
+        self.bytes = 0
+        self.max_bytes = 0
+        self.timed = 0
+        self.time = 0.0
+        self.max_time = 0.0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+
+
+class BodySampler:
+    """Decide which bodies to process, per stratum."""
+
+    def __init__(self, first: int = DEFAULT_SAMPLE_FIRST, rate: float = 1.0, seed: int = 0):
+        """
+        Initialize sampler.
+
+        Args:
+            first: Bodies always processed per stratum
+            rate: Fraction of later bodies processed (0 to 1)
+            seed: Random seed, so repeated runs sample the same bodies
+        """
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1: {rate}")
+        self.first = max(first, 0)
+        self.rate = rate
+        self.rng = random.Random(seed)
+        self.strata: Dict[Hashable, SampleStats] = {}
+        self._log_skip = math.log(1.0 - rate) if 0.0 < rate < 1.0 else 0.0
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> Optional['BodySampler']:
+        """
+        Build a sampler from parsed command line arguments.
+
+        Args:
+            args: Namespace populated by add_sampling_arguments
+
+        Returns:
+            BodySampler instance, or None when sampling is off
+        """
+        if args.sample_rate is None:
+            return None
+        return cls(first=args.sample_first, rate=args.sample_rate)
+
+    def _skip(self) -> int:
+        """Draw the number of bodies skipped before the next sampled one."""
+        if self.rate >= 1.0:
+            return 0
+        if self.rate <= 0.0:
+            return -1
+        return int(math.log(1.0 - self.rng.random()) / self._log_skip)
+
+    def sample(
+        self,
+        stratum: Hashable,
+        size: Optional[int] = None,
+        elapsed: Optional[float] = None,
+        timestamp: Optional[float] = None,
+    ) -> bool:
+        """
+        Record one body and decide whether to process it.
+
+        Args:
+            stratum: Sampling stratum (e.g. endpoint key and status)
+            size: Body size in bytes
+            elapsed: Request time in milliseconds
+            timestamp: Message timestamp in milliseconds
+
+        Returns:
+            True if the body should be processed
+        """
+        stats = self.strata.get(stratum)
+        if stats is None:
+            stats = self.strata[stratum] = SampleStats()
+
+        stats.seen += 1
+        if size is not None:
+            stats.bytes += size
+            if size > stats.max_bytes:
+                stats.max_bytes = size
+        if elapsed is not None and elapsed >= 0:
+            stats.timed += 1
+            stats.time += elapsed
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+        if timestamp is not None:
+            if stats.first_timestamp is None:
+                stats.first_timestamp = timestamp
+            stats.last_timestamp = timestamp
+
+        if stats.seen <= self.first:
+            take = True
+        else:
+            if stats.next_index == 0:
+                skip = self._skip()
+                stats.next_index = stats.seen + skip if skip >= 0 else -1
+            take = stats.seen == stats.next_index
+            if take:
+                stats.next_index = 0
+        if take:
+            stats.sampled += 1
+        return take
+
+    def coverage(self, stratum: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Summarize the sample coverage and metadata of a stratum.
+
+        Args:
+            stratum: Sampling stratum
+
+        Returns:
+            Coverage dictionary, or None if nothing was recorded
+        """
+        stats = self.strata.get(stratum)
+        if stats is None:
+            return None
+
+        result: Dict[str, Any] = {
+            'seen': stats.seen,
+            'sampled': stats.sampled,
+            'coverage': round(stats.sampled / stats.seen, 3),
+        }
+        if stats.bytes:
+            result['bytes'] = {'mean': round(stats.bytes / stats.seen), 'max': stats.max_bytes}
+        if stats.timed:
+            result['time-ms'] = {'mean': round(stats.time / stats.timed, 1), 'max': round(stats.max_time, 1)}
+        if stats.seen > 1 and stats.last_timestamp is not None and stats.last_timestamp > stats.first_timestamp:
+            result['per-second'] = round((stats.seen - 1) * 1000 / (stats.last_timestamp - stats.first_timestamp), 3)
+        return result
+
+    def totals(self) -> Dict[str, int]:
+        """
+        Count bodies seen and sampled over all strata.
+
+        Returns:
+            Dictionary with seen and sampled totals
+        """
+        return {
+            'seen': sum(stats.seen for stats in self.strata.values()),
+            'sampled': sum(stats.sampled for stats in self.strata.values()),
+        }
+
+
+def add_sampling_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add body sampling options to a CLI parser.
+
+    Args:
+        parser: Argument parser
+    """
+    group = parser.add_argument_group(
+        'sampling',
+        'Process a sample of the bodies; counts, sizes and timings still cover every body'
+    )
+    group.add_argument('--sample-rate', type=float, metavar='RATE',
+                       help='Fraction of bodies processed per endpoint/status or message type '
+                            'after the first ones (e.g. 0.05); enables sampling')
+    group.add_argument('--sample-first', type=int, default=DEFAULT_SAMPLE_FIRST, metavar='N',
+                       help=f'Bodies always processed per endpoint/status or message type (default: {DEFAULT_SAMPLE_FIRST})')
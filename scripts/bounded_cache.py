@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Bounded Cache
+
+Thread-safe LRU mapping shared by the long-running entry points (the
+extraction daemon and batch worker processes), so caches reused across many
+captures, such as the body schema cache, cannot grow without bound.
+
+Usage:
+    from bounded_cache import BoundedCache
+
+    body_cache = BoundedCache(100_000)
+    converter = HARToOpenAPIConverter(path, body_cache=body_cache)
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class BoundedCache(OrderedDict):
+    """Thread-safe LRU mapping with a fixed maximum number of entries."""
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self:
+                self.hits += 1
+                self.move_to_end(key)
+                return super().__getitem__(key)
+            self.misses += 1
+            return default
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.max_entries:
+                self.popitem(last=False)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+HTTP Cache Audit
+
+Audits caching and compression per templated endpoint of a HAR capture:
+Cache-Control, ETag, Last-Modified, Content-Encoding and Vary response headers,
+conditional requests (304s), and repeated identical GET/HEAD responses for the same URL
+within the session, detected by body content hash. Endpoints are ranked by the
+bytes and round trips those refetches wasted, and cacheability hints can be
+attached to the OpenAPI spec as `x-caching` fields.
+
+Usage:
+    python scripts/cache_audit.py input.har.json
+    python scripts/cache_audit.py input.har.json --format json -o cache-report.json
+    python scripts/har_to_openapi.py input.har.json -o openapi.yaml --cache-report cache-report.json
+"""
+
+import argparse
+import json
+import sys
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from har_content import content_hash
+from har_filters import EntryFilter, add_filter_arguments
+
+# Response types worth compressing on the wire
+COMPRESSIBLE_MIME_PREFIXES = ('text/', 'application/json', 'application/javascript', 'application/xml',
+                              'image/svg+xml', 'application/graphql')
+
+# Uncompressed bodies smaller than this are not worth flagging
+MIN_COMPRESSIBLE_SIZE = 1024
+
+CACHEABLE_METHODS = ('GET', 'HEAD')
+
+
+def _header(headers: List[Dict[str, Any]], name: str) -> Optional[str]:
+    """Get a header value by case-insensitive name, joining repeated headers."""
+    values = [header.get('value', '') for header in headers if header.get('name', '').lower() == name]
+    return ', '.join(values) if values else None
+
+
+def transfer_size(response: Dict[str, Any]) -> int:
+    """
+    Get the bytes a response cost on the wire.
+
+    Prefers Chrome's `_transferSize`, then headersSize + bodySize, then the
+    decoded content size.
+
+    Args:
+        response: HAR response object
+
+    Returns:
+        Size in bytes
+    """
+    size = response.get('_transferSize')
+    if isinstance(size, int) and size >= 0:
+        return size
+    body_size = response.get('bodySize', -1)
+    if isinstance(body_size, int) and body_size >= 0:
+        headers_size = response.get('headersSize', -1)
+        return body_size + (headers_size if isinstance(headers_size, int) and headers_size > 0 else 0)
+    content = response.get('content', {})
+    size = content.get('size', -1)
+    if isinstance(size, int) and size >= 0:
+        return size
+    return len(content.get('text', ''))
+
+
+class CacheAudit:
+    """Collect caching and compression statistics per endpoint."""
+
+    def __init__(self):
+        """Initialize audit."""
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        # (method, full URL) -> body hash of the last 200 response
+        self._last_body: Dict[str, str] = {}
+        # endpoint key -> hints() result, dropped when the endpoint gets new data
+        self._hints: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, endpoint_key: str, request: Dict[str, Any], response: Dict[str, Any]) -> None:
+        """
+        Record one request/response pair.
+
+        Args:
+            endpoint_key: Templated endpoint key ("METHOD:/path/{param}")
+            request: HAR request object
+            response: HAR response object
+        """
+        stats = self.endpoints.get(endpoint_key)
+        if stats is None:
+            stats = self.endpoints[endpoint_key] = {
+                'method': request.get('method', 'GET').upper(),
+                'responses': 0,
+                'bytes': 0,
+                'cache_control': Counter(),
+                'max_age': None,
+                'etag': 0,
+                'last_modified': 0,
+                'vary': Counter(),
+                'content_encoding': Counter(),
+                'uncompressed_responses': 0,
+                'uncompressed_bytes': 0,
+                'conditional_requests': 0,
+                'not_modified': 0,
+                'redundant_requests': 0,
+                'wasted_bytes': 0,
+            }
+
+        self._hints.pop(endpoint_key, None)
+        headers = response.get('headers', [])
+        size = transfer_size(response)
+        status = response.get('status', 0)
+        stats['responses'] += 1
+        stats['bytes'] += size
+
+        cache_control = _header(headers, 'cache-control')
+        for directive in (cache_control or '').lower().split(','):
+            directive = directive.strip()
+            if not directive:
+                continue
+            name, _, value = directive.partition('=')
+            stats['cache_control'][name] += 1
+            if name in ('max-age', 's-maxage') and value.strip().isdigit():
+                max_age = int(value.strip())
+                stats['max_age'] = max_age if stats['max_age'] is None else min(stats['max_age'], max_age)
+        if cache_control is None:
+            stats['cache_control']['(none)'] += 1
+
+        if _header(headers, 'etag') is not None:
+            stats['etag'] += 1
+        if _header(headers, 'last-modified') is not None:
+            stats['last_modified'] += 1
+        vary = _header(headers, 'vary')
+        if vary:
+            for field in vary.split(','):
+                stats['vary'][field.strip().lower()] += 1
+
+        content = response.get('content', {})
+        encoding = (_header(headers, 'content-encoding') or 'identity').lower()
+        stats['content_encoding'][encoding] += 1
+        mime_type = content.get('mimeType', '').split(';', 1)[0].strip().lower()
+        body_size = content.get('size', 0)
+        if encoding == 'identity' and mime_type.startswith(COMPRESSIBLE_MIME_PREFIXES) \
+                and isinstance(body_size, int) and body_size >= MIN_COMPRESSIBLE_SIZE:
+            stats['uncompressed_responses'] += 1
+            stats['uncompressed_bytes'] += body_size
+
+        request_headers = request.get('headers', [])
+        if _header(request_headers, 'if-none-match') is not None or \
+                _header(request_headers, 'if-modified-since') is not None:
+            stats['conditional_requests'] += 1
+        if status == 304:
+            stats['not_modified'] += 1
+
+        # Same URL answered with the same body again: a cache could have served it
+        if status == 200 and stats['method'] in CACHEABLE_METHODS and content.get('text'):
+            url_key = f"{stats['method']} {request.get('url', '')}"
+            body_hash = content_hash(content)
+            if self._last_body.get(url_key) == body_hash:
+                stats['redundant_requests'] += 1
+                stats['wasted_bytes'] += size
+            self._last_body[url_key] = body_hash
+
+    def hints(self, endpoint_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Build the `x-caching` extension for an endpoint.
+
+        Args:
+            endpoint_key: Templated endpoint key
+
+        Returns:
+            Cacheability summary and hints, or None if nothing was recorded
+        """
+        cached = self._hints.get(endpoint_key)
+        if cached is not None:
+            return cached
+        stats = self.endpoints.get(endpoint_key)
+        if stats is None:
+            return None
+
+        responses = stats['responses']
+        directives = stats['cache_control']
+        no_store = directives.get('no-store', 0) > 0
+        validators = stats['etag'] + stats['last_modified'] > 0
+        hints = []
+
+        if stats['redundant_requests']:
+            hints.append(
+                f"{stats['redundant_requests']} identical refetches ({stats['wasted_bytes']} bytes); "
+                + ("allow caching (no-store is set)" if no_store else "add max-age or serve 304s")
+            )
+        if not validators and stats['method'] in CACHEABLE_METHODS:
+            hints.append("no ETag/Last-Modified: conditional requests impossible")
+        if stats['uncompressed_responses']:
+            hints.append(
+                f"{stats['uncompressed_responses']} compressible responses sent without "
+                f"Content-Encoding ({stats['uncompressed_bytes']} bytes)"
+            )
+        if stats['vary'].get('*'):
+            hints.append("Vary: * defeats caching")
+
+        result: Dict[str, Any] = {
+            'cacheable': stats['method'] in CACHEABLE_METHODS and not no_store,
+            'cache-control': sorted(name for name in directives if name != '(none)'),
+            'validators': {
+                'etag': round(stats['etag'] / responses, 3),
+                'last-modified': round(stats['last_modified'] / responses, 3),
+            },
+            'content-encoding': dict(stats['content_encoding'].most_common()),
+            'redundant-requests': stats['redundant_requests'],
+            'wasted-bytes': stats['wasted_bytes'],
+        }
+        if stats['max_age'] is not None:
+            result['max-age'] = stats['max_age']
+        if stats['vary']:
+            result['vary'] = sorted(stats['vary'])
+        if hints:
+            result['hints'] = hints
+        self._hints[endpoint_key] = result
+        return result
+
+    def report(self) -> List[Dict[str, Any]]:
+        """
+        Rank endpoints by wasted bytes, then redundant round trips.
+
+        Returns:
+            Per-endpoint rows, worst first
+        """
+        rows = []
+        for endpoint_key, stats in self.endpoints.items():
+            method, _, path = endpoint_key.partition(':')
+            rows.append({
+                'endpoint': f"{method} {path}",
+                'responses': stats['responses'],
+                'bytes': stats['bytes'],
+                'redundant_requests': stats['redundant_requests'],
+                'wasted_bytes': stats['wasted_bytes'],
+                'uncompressed_bytes': stats['uncompressed_bytes'],
+                'conditional_requests': stats['conditional_requests'],
+                'not_modified': stats['not_modified'],
+                'hints': self.hints(endpoint_key).get('hints', []),
+            })
+        rows.sort(key=lambda row: (row['wasted_bytes'], row['redundant_requests'], row['uncompressed_bytes']),
+                  reverse=True)
+        return rows
+
+
+def format_report(rows: List[Dict[str, Any]], limit: Optional[int] = None) -> str:
+    """
+    Format a cache report for terminals.
+
+    Args:
+        rows: Rows from CacheAudit.report()
+        limit: Maximum endpoints listed
+
+    Returns:
+        Report text
+    """
+    wasted = sum(row['wasted_bytes'] for row in rows)
+    redundant = sum(row['redundant_requests'] for row in rows)
+    lines = [
+        f"{'⚠️ ' if redundant else '✅'} Cache audit: {redundant} redundant requests, {wasted} wasted bytes",
+        f"   Endpoints: {len(rows)}",
+    ]
+    for row in rows[:limit]:
+        if not (row['redundant_requests'] or row['uncompressed_bytes'] or row['hints']):
+            continue
+        lines.append(
+            f"   {row['endpoint']}: {row['redundant_requests']}/{row['responses']} redundant, "
+            f"{row['wasted_bytes']} bytes wasted, {row['uncompressed_bytes']} bytes uncompressed"
+        )
+        for hint in row['hints']:
+            lines.append(f"      - {hint}")
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Audit HTTP caching and compression per endpoint of a HAR capture',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/cache_audit.py input.har.json
+  python scripts/cache_audit.py input.har.json --format json -o cache-report.json
+  python scripts/cache_audit.py input.har.json.zst --host www.perplexity.ai --top 20
+        """
+    )
+    parser.add_argument('input', help='Input HAR file path (.gz/.zst/.br detected automatically)')
+    parser.add_argument('-o', '--output', help='Write the report to this file instead of stdout')
+    parser.add_argument(
+        '-f', '--format',
+        choices=['text', 'json'],
+        default='text',
+        help='Report format (default: text)'
+    )
+    parser.add_argument('--top', type=int, help='List only the N worst endpoints')
+    add_filter_arguments(parser)
+
+    args = parser.parse_args()
+
+    try:
+        # Imported here: har_to_openapi imports this module
+        from har_to_openapi import HARToOpenAPIConverter
+
+        audit = CacheAudit()
+        converter = HARToOpenAPIConverter(
+            args.input,
+            entry_filter=EntryFilter.from_args(args),
+            streaming=True,
+        )
+        for entry in converter.iter_entries():
+            endpoint_key = converter.endpoint_key(entry)
+            if endpoint_key:
+                audit.add(endpoint_key, entry.get('request', {}), entry.get('response', {}))
+
+        rows = audit.report()
+        if args.format == 'json':
+            text = json.dumps(rows[:args.top], indent=2)
+        else:
+            text = format_report(rows, args.top)
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text + '\n')
+            print(f"✅ Cache report written to {args.output}")
+        else:
+            print(text)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Compressed I/O helpers
+
+Transparent streaming (de)compression for capture inputs and generated outputs.
+Input compression is detected from magic bytes, falling back to the file
+extension; output compression is selected by extension.
+
+Supported codecs:
+    gzip    (.gz)          - standard library
+    zstd    (.zst, .zstd)  - requires `zstandard` (or Python 3.14+ `compression.zstd`)
+    brotli  (.br)          - requires `brotli` or `brotlicffi`
+
+Usage:
+    from compressed_io import open_input, open_output
+
+    with open_input('capture.har.json.zst') as f:
+        har = json.load(f)
+
+    with open_output('openapi.yaml.gz') as f:
+        f.write(text)
+"""
+
+import gzip
+import io
+import os
+import queue
+import threading
+import zlib
+from typing import Any, BinaryIO, Optional, TextIO
+
+CHUNK_SIZE = 1 << 20
+
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+EXTENSIONS = {
+    '.gz': 'gzip',
+    '.gzip': 'gzip',
+    '.zst': 'zstd',
+    '.zstd': 'zstd',
+    '.br': 'brotli',
+}
+
+
+def compression_from_extension(path: str) -> Optional[str]:
+    """
+    Get compression codec implied by a file extension.
+
+    Args:
+        path: File path
+
+    Returns:
+        Codec name ('gzip', 'zstd', 'brotli') or None
+    """
+    return EXTENSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def compression_from_magic(head: bytes) -> Optional[str]:
+    """
+    Get compression codec identified by leading magic bytes.
+
+    Args:
+        head: First bytes of a stream (at least 4 for zstd)
+
+    Returns:
+        Codec name ('gzip', 'zstd') or None
+    """
+    if head.startswith(GZIP_MAGIC):
+        return 'gzip'
+    if head.startswith(ZSTD_MAGIC):
+        return 'zstd'
+    return None
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """
+    Detect compression of an existing file.
+
+    Magic bytes are authoritative for gzip and zstd. Brotli streams have no
+    magic number, so they are recognized by extension only.
+
+    Args:
+        path: File path
+
+    Returns:
+        Codec name ('gzip', 'zstd', 'brotli') or None for plain files
+    """
+    with open(path, 'rb') as f:
+        head = f.read(4)
+
+    codec = compression_from_magic(head)
+    if codec:
+        return codec
+
+    codec = compression_from_extension(path)
+    if codec == 'brotli':
+        return codec
+    return None
+
+
+def _import_zstd() -> Any:
+    """Import a zstd implementation, preferring the standard library."""
+    try:
+        from compression import zstd  # type: ignore[import-not-found]
+        return zstd
+    except ImportError:
+        pass
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        raise ImportError("zstandard library not found. Please install: pip install zstandard")
+
+
+def _import_brotli() -> Any:
+    """Import a brotli implementation."""
+    try:
+        import brotli
+        return brotli
+    except ImportError:
+        pass
+    try:
+        import brotlicffi  # type: ignore[import-not-found]
+        return brotlicffi
+    except ImportError:
+        raise ImportError("brotli library not found. Please install: pip install brotli")
+
+
+def brotli_available() -> bool:
+    """Check whether a brotli implementation can be imported."""
+    try:
+        _import_brotli()
+        return True
+    except ImportError:
+        return False
+
+
+class ChunkDecompressor:
+    """
+    Incremental in-memory decompressor with a uniform interface.
+
+    Wraps zlib, zstd and brotli decompression objects so callers can feed
+    compressed chunks and receive decompressed chunks regardless of codec.
+    """
+
+    def __init__(self, codec: str):
+        """
+        Initialize decompressor.
+
+        Args:
+            codec: Codec name ('gzip', 'zstd' or 'brotli')
+        """
+        self.codec = codec
+        if codec == 'gzip':
+            # 32 + MAX_WBITS accepts both gzip and zlib headers
+            self._obj: Any = zlib.decompressobj(32 + zlib.MAX_WBITS)
+        elif codec == 'zstd':
+            zstd = _import_zstd()
+            if hasattr(zstd.ZstdDecompressor, 'decompressobj'):
+                self._obj = zstd.ZstdDecompressor().decompressobj()
+            else:
+                self._obj = zstd.ZstdDecompressor()
+        elif codec == 'brotli':
+            self._obj = _import_brotli().Decompressor()
+        else:
+            raise ValueError(f"Unsupported compression codec: {codec}")
+
+    def decompress(self, chunk: bytes) -> bytes:
+        """
+        Decompress one chunk.
+
+        Args:
+            chunk: Compressed bytes
+
+        Returns:
+            Decompressed bytes available so far
+        """
+        if self.codec == 'brotli':
+            return self._obj.process(chunk)
+        return self._obj.decompress(chunk)
+
+    def flush(self) -> bytes:
+        """
+        Finish decompression.
+
+        Returns:
+            Remaining decompressed bytes
+        """
+        if hasattr(self._obj, 'flush'):
+            return self._obj.flush()
+        return b''
+
+
+class _BrotliReader(io.RawIOBase):
+    """Streaming brotli decompressor exposed as a raw binary stream."""
+
+    def __init__(self, fileobj: BinaryIO, brotli: Any):
+        self._fileobj = fileobj
+        self._decompressor = brotli.Decompressor()
+        self._pending = memoryview(b'')
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending and not self._eof:
+            chunk = self._fileobj.read(CHUNK_SIZE)
+            if not chunk:
+                self._eof = True
+                # Like gzip: a stream cut off before its end marker is an error
+                if not self._decompressor.is_finished():
+                    raise EOFError("Brotli stream ended before the end-of-stream marker was reached")
+                break
+            self._pending = memoryview(self._decompressor.process(chunk))
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._fileobj.close()
+        super().close()
+
+
+class _BrotliWriter(io.RawIOBase):
+    """Streaming brotli compressor exposed as a raw binary stream."""
+
+    def __init__(self, fileobj: BinaryIO, brotli: Any):
+        self._fileobj = fileobj
+        self._compressor = brotli.Compressor()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._fileobj.write(self._compressor.process(bytes(data)))
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._fileobj.write(self._compressor.finish())
+            self._fileobj.close()
+        super().close()
+
+
+class _ThreadedReader(io.RawIOBase):
+    """
+    Read a binary stream on a background thread.
+
+    Decompressed chunks are produced into a bounded queue so decompression
+    overlaps with parsing on the consuming thread while memory stays capped
+    at roughly `max_chunks * CHUNK_SIZE` bytes.
+    """
+
+    _EOF = object()
+
+    def __init__(self, stream: BinaryIO, max_chunks: int = 8):
+        self._stream = stream
+        self._queue: 'queue.Queue[Any]' = queue.Queue(maxsize=max_chunks)
+        self._pending = memoryview(b'')
+        self._done = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, name='decompress', daemon=True)
+        self._thread.start()
+
+    def _produce(self) -> None:
+        try:
+            while not self._stop.is_set():
+                chunk = self._stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                self._queue.put(chunk)
+            self._queue.put(self._EOF)
+        except BaseException as e:  # re-raised on the consuming thread
+            self._queue.put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending and not self._done:
+            item = self._queue.get()
+            if item is self._EOF:
+                self._done = True
+            elif isinstance(item, BaseException):
+                self._done = True
+                raise item
+            else:
+                self._pending = memoryview(item)
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            # Drain so a blocked producer can observe the stop flag
+            while self._thread.is_alive():
+                try:
+                    self._queue.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            self._stream.close()
+        super().close()
+
+
+def open_binary_input(path: str, threaded: bool = False) -> BinaryIO:
+    """
+    Open a possibly compressed file as a decompressed binary stream.
+
+    Args:
+        path: File path
+        threaded: Decompress on a background thread
+
+    Returns:
+        Readable binary stream of decompressed bytes
+    """
+    codec = detect_compression(path)
+
+    if codec == 'gzip':
+        stream: Any = gzip.open(path, 'rb')
+    elif codec == 'zstd':
+        zstd = _import_zstd()
+        if hasattr(zstd, 'ZstdDecompressor') and hasattr(zstd.ZstdDecompressor, 'stream_reader'):
+            stream = zstd.ZstdDecompressor().stream_reader(
+                open(path, 'rb'), read_across_frames=True, closefd=True
+            )
+        else:
+            stream = zstd.open(path, 'rb')
+    elif codec == 'brotli':
+        stream = _BrotliReader(open(path, 'rb'), _import_brotli())
+    else:
+        stream = open(path, 'rb', buffering=0 if threaded else -1)
+
+    if threaded:
+        stream = _ThreadedReader(stream)
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream, buffer_size=CHUNK_SIZE)
+    return stream
+
+
+def open_input(path: str, threaded: bool = False, encoding: str = 'utf-8') -> TextIO:
+    """
+    Open a possibly compressed file for streaming text reads.
+
+    Args:
+        path: File path
+        threaded: Decompress on a background thread
+        encoding: Text encoding
+
+    Returns:
+        Readable text stream
+    """
+    return io.TextIOWrapper(open_binary_input(path, threaded=threaded), encoding=encoding)
+
+
+def open_output(path: str, encoding: str = 'utf-8') -> TextIO:
+    """
+    Open an output file, compressing according to its extension.
+
+    Args:
+        path: File path ('.gz', '.zst'/'.zstd' and '.br' are compressed)
+        encoding: Text encoding
+
+    Returns:
+        Writable text stream
+    """
+    codec = compression_from_extension(path)
+
+    if codec == 'gzip':
+        stream: Any = gzip.open(path, 'wb')
+    elif codec == 'zstd':
+        zstd = _import_zstd()
+        if hasattr(zstd, 'ZstdCompressor') and hasattr(zstd.ZstdCompressor, 'stream_writer'):
+            stream = zstd.ZstdCompressor().stream_writer(open(path, 'wb'), closefd=True)
+        else:
+            stream = zstd.open(path, 'wb')
+    elif codec == 'brotli':
+        stream = _BrotliWriter(open(path, 'wb'), _import_brotli())
+    else:
+        return open(path, 'w', encoding=encoding)
+
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedWriter(stream, buffer_size=CHUNK_SIZE)
+    return io.TextIOWrapper(stream, encoding=encoding, write_through=False)
@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Extraction Daemon
+
+Long-running worker that serves extraction jobs over a local Unix socket, so
+pipelines processing many small captures pay interpreter startup, imports and
+cache warm-up once instead of once per file.
+
+Protocol: newline-delimited JSON. Each request line gets one response line.
+
+    {"op": "job", "tool": "openapi", "input": "a.har.json", "output": "a.yaml"}
+    {"op": "job", "tool": "graphql", "input": "a.har.json", "options": {"group": true}}
+    {"op": "job", "tool": "asyncapi", "input": "a.ws.jsonl", "output": "a.json", "options": {"format": "json"}}
+    {"op": "health"}
+    {"op": "stats"}
+
+Usage:
+    python scripts/extract_daemon.py serve --socket /tmp/pplx-extract.sock --workers 4
+    python scripts/extract_daemon.py submit openapi capture.har.json -o openapi.yaml
+    python scripts/extract_daemon.py health
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from bounded_cache import BoundedCache
+from compressed_io import open_output
+from har_filters import EntryFilter, parse_status_ranges
+from har_to_openapi import HARToOpenAPIConverter
+from graphql_extractor import GraphQLExtractor, ShardedJSONLWriter, write_operation_dir
+
+DEFAULT_SOCKET = '/tmp/pplx-extract.sock'
+
+TOOLS = ('openapi', 'graphql', 'asyncapi')
+
+
+class ExtractionDaemon:
+    """Serve extraction jobs over a Unix socket with warm shared state."""
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET,
+        workers: int = 4,
+        max_queue: int = 1000,
+        body_cache_size: int = 100_000,
+        result_cache_size: int = 64,
+    ):
+        """
+        Initialize daemon.
+
+        Args:
+            socket_path: Unix socket path
+            workers: Maximum number of jobs running concurrently
+            max_queue: Maximum number of jobs waiting for a worker
+            body_cache_size: Body schemas kept across HAR jobs
+            result_cache_size: Results kept for unchanged inputs
+        """
+        self.socket_path = socket_path
+        self.workers = workers
+        self.max_queue = max_queue
+        self.body_cache = BoundedCache(body_cache_size)
+        self.result_cache = BoundedCache(result_cache_size)
+        self.started_at = time.time()
+        self.stats: Dict[str, Any] = {
+            'completed': 0,
+            'failed': 0,
+            'rejected': 0,
+            'running': 0,
+            'queued': 0,
+            'busy_seconds': 0.0,
+            'by_tool': {tool: 0 for tool in TOOLS},
+        }
+        self.tool_errors: Dict[str, str] = {}
+        self._ws_module: Any = None
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='extract')
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    def warm_up(self) -> None:
+        """Import optional tool dependencies up front and record failures."""
+        try:
+            self._ws_module = self._load_ws_module()
+        except RuntimeError as e:
+            self.tool_errors['asyncapi'] = str(e)
+
+    @staticmethod
+    def _load_ws_module() -> Any:
+        """Import the WebSocket extractor and its genson dependency."""
+        import ws_schema_extractor
+        try:
+            ws_schema_extractor.load_schema_builder()
+        except ImportError as e:
+            raise RuntimeError(str(e))
+        return ws_schema_extractor
+
+    def remove_stale_socket(self) -> None:
+        """
+        Remove a socket file left behind by a daemon that is gone.
+
+        Raises:
+            RuntimeError: If a daemon is still accepting connections on it
+        """
+        if not os.path.exists(self.socket_path):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                os.unlink(self.socket_path)
+                return
+        raise RuntimeError(f"another daemon is already listening on {self.socket_path}")
+
+    async def serve(self) -> None:
+        """Listen on the Unix socket until SIGINT/SIGTERM."""
+        self.remove_stale_socket()
+
+        self._semaphore = asyncio.Semaphore(self.workers)
+        self._server = await asyncio.start_unix_server(self._handle_client, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        assert task is not None
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, task.cancel)
+
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer request lines from one client connection."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                response = await self._dispatch(line)
+                writer.write(json.dumps(response, default=str).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, line: bytes) -> Dict[str, Any]:
+        """
+        Route one request.
+
+        Args:
+            line: Raw JSON request line
+
+        Returns:
+            Response object
+        """
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return {'ok': False, 'error': f"Invalid JSON request: {e}"}
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': 'Request must be a JSON object'}
+
+        op = request.get('op', 'job')
+        response: Dict[str, Any]
+        if op == 'health':
+            response = self.health()
+        elif op == 'stats':
+            response = self.get_stats()
+        elif op == 'job':
+            response = await self._run_job(request)
+        else:
+            response = {'ok': False, 'error': f"Unknown op: {op}"}
+
+        if 'id' in request:
+            response['id'] = request['id']
+        return response
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Get liveness information.
+
+        Returns:
+            Health response
+        """
+        return {
+            'ok': True,
+            'status': 'ok',
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started_at, 3),
+            'running': self.stats['running'],
+            'queued': self.stats['queued'],
+            'unavailable_tools': self.tool_errors,
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get job and cache statistics.
+
+        Returns:
+            Stats response
+        """
+        return {
+            'ok': True,
+            'workers': self.workers,
+            'max_queue': self.max_queue,
+            'uptime': round(time.time() - self.started_at, 3),
+            'jobs': dict(self.stats, busy_seconds=round(self.stats['busy_seconds'], 3)),
+            'caches': {
+                name: {
+                    'entries': len(cache),
+                    'max_entries': cache.max_entries,
+                    'hits': cache.hits,
+                    'misses': cache.misses,
+                }
+                for name, cache in (('body', self.body_cache), ('result', self.result_cache))
+            },
+        }
+
+    async def _run_job(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run a job on the worker pool with bounded concurrency.
+
+        Args:
+            request: Job request
+
+        Returns:
+            Job response
+        """
+        tool = request.get('tool')
+        input_path = request.get('input')
+        if tool not in TOOLS:
+            return {'ok': False, 'error': f"Unknown tool: {tool} (expected one of {', '.join(TOOLS)})"}
+        if not input_path:
+            return {'ok': False, 'error': 'Missing input path'}
+        if tool in self.tool_errors:
+            return {'ok': False, 'error': self.tool_errors[tool]}
+        if self.stats['queued'] >= self.max_queue:
+            self.stats['rejected'] += 1
+            return {'ok': False, 'error': 'Daemon busy: job queue is full'}
+
+        assert self._semaphore is not None
+        self.stats['queued'] += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.stats['queued'] -= 1
+
+        self.stats['running'] += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(self._executor, self.execute, request)
+            self.stats['completed'] += 1
+            self.stats['by_tool'][tool] += 1
+        except Exception as e:
+            self.stats['failed'] += 1
+            response = {'ok': False, 'error': str(e)}
+        finally:
+            elapsed = time.perf_counter() - started
+            self.stats['busy_seconds'] += elapsed
+            self.stats['running'] -= 1
+            self._semaphore.release()
+
+        response.update({'tool': tool, 'input': input_path, 'elapsed_ms': round(elapsed * 1000, 3)})
+        return response
+
+    def execute(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a job synchronously (called on a worker thread).
+
+        Args:
+            request: Job request with tool, input, optional output and options
+
+        Returns:
+            Job response
+        """
+        tool = request['tool']
+        input_path = request['input']
+        output_path = request.get('output')
+        options = request.get('options') or {}
+
+        if tool == 'graphql' and output_path and options.get('format') == 'shards':
+            # Streamed into the shards while extracting: no result is held for the cache
+            _, summary = self._run_graphql(input_path, options, shard_dir=output_path)
+            return {'ok': True, 'cached': False, 'summary': summary, 'output': output_path}
+
+        stat = os.stat(input_path)
+        cache_key = (
+            tool, os.path.abspath(input_path), stat.st_mtime_ns, stat.st_size,
+            json.dumps(options, sort_keys=True),
+        )
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            result, summary = cached
+        else:
+            runner: Callable[[str, Dict[str, Any]], Tuple[Any, Dict[str, Any]]] = {
+                'openapi': self._run_openapi,
+                'graphql': self._run_graphql,
+                'asyncapi': self._run_asyncapi,
+            }[tool]
+            result, summary = runner(input_path, options)
+            self.result_cache[cache_key] = (result, summary)
+
+        response: Dict[str, Any] = {'ok': True, 'cached': cached is not None, 'summary': summary}
+        if output_path:
+            self._write_output(tool, result, output_path, options)
+            response['output'] = output_path
+        else:
+            response['result'] = result
+        return response
+
+    def _run_openapi(self, input_path: str, options: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """Convert a HAR file to OpenAPI using the shared body cache."""
+        filters = dict(options.get('filters') or {})
+        if 'status' in filters:
+            filters['status_ranges'] = parse_status_ranges(filters.pop('status'))
+        kwargs: Dict[str, Any] = {}
+        if 'body_stream_threshold' in options:
+            kwargs['body_stream_threshold'] = options['body_stream_threshold']
+
+        converter = HARToOpenAPIConverter(
+            input_path,
+            body_cache=self.body_cache,
+            entry_filter=EntryFilter(**filters),
+            streaming=bool(options.get('stream')),
+            **kwargs,
+        )
+        spec = converter.convert()
+        filtered, filtered_bytes = converter.entry_filter.removed()
+        return spec, {
+            'endpoints': len(converter.endpoints),
+            'servers': len(converter.servers),
+            'filtered_entries': filtered,
+            'filtered_bytes': filtered_bytes,
+        }
+
+    def _run_graphql(
+        self,
+        input_path: str,
+        options: Dict[str, Any],
+        shard_dir: Optional[str] = None,
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """Extract GraphQL operations from a HAR file, streaming them into shards if shard_dir is given."""
+        result: Any = None
+        if shard_dir is None:
+            extractor = GraphQLExtractor(input_path)
+            queries = extractor.extract()
+            result = extractor.group_by_operation() if options.get('group') else queries
+        else:
+            with ShardedJSONLWriter(shard_dir, num_shards=options.get('shards', 8)) as writer:
+                extractor = GraphQLExtractor(
+                    input_path, sink=lambda query: writer.write(query['operation_name'], query))
+                extractor.extract()
+        return result, {
+            'queries': extractor.total_queries,
+            'operations': len(extractor.operation_counts),
+        }
+
+    def _run_asyncapi(self, input_path: str, options: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """Extract an AsyncAPI spec from a WebSocket log."""
+        extractor = self._ws_module.WebSocketSchemaExtractor(input_path)
+        spec = extractor.extract()
+        return spec, {
+            'messages': len(extractor.messages),
+            'send_types': len(extractor.send_schemas),
+            'receive_types': len(extractor.receive_schemas),
+        }
+
+    @staticmethod
+    def _write_output(tool: str, result: Any, output_path: str, options: Dict[str, Any]) -> None:
+        """
+        Write a job result the same way the standalone scripts do.
+
+        Args:
+            tool: Tool name
+            result: Spec or extracted queries
+            output_path: Output path
+            options: Job options ('format', 'pretty')
+        """
+        output_format = options.get('format', 'json' if tool == 'graphql' else 'yaml')
+        indent = 2 if options.get('pretty') else None
+
+        if tool == 'graphql' and output_format == 'dir':
+            write_operation_dir(output_path, result, indent=indent)
+            return
+
+        with open_output(output_path) as f:
+            if output_format == 'yaml':
+                import yaml
+                yaml.dump(result, f, default_flow_style=False, sort_keys=False)
+            else:
+                json.dump(result, f, indent=indent)
+
+
+def send_request(socket_path: str, request: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Send one request to a running daemon and wait for its response.
+
+    Args:
+        socket_path: Unix socket path
+        request: Request object
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Response object
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as f:
+            line = f.readline()
+    if not line:
+        raise ConnectionError('Daemon closed the connection without a response')
+    return json.loads(line)
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Serve extraction jobs from a resident process over a Unix socket',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/extract_daemon.py serve --socket /tmp/pplx-extract.sock --workers 4
+  python scripts/extract_daemon.py submit openapi capture.har.json -o openapi.yaml
+  python scripts/extract_daemon.py submit graphql capture.har.json -o queries.json --option group=true
+  python scripts/extract_daemon.py stats
+        """
+    )
+    parser.add_argument('--socket', default=DEFAULT_SOCKET, help=f'Unix socket path (default: {DEFAULT_SOCKET})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Run the daemon')
+    serve_parser.add_argument('--workers', type=int, default=os.cpu_count() or 4,
+                              help='Maximum concurrent jobs (default: CPU count)')
+    serve_parser.add_argument('--max-queue', type=int, default=1000,
+                              help='Maximum jobs waiting for a worker (default: 1000)')
+    serve_parser.add_argument('--body-cache-size', type=int, default=100_000,
+                              help='Body schemas kept between jobs (default: 100000)')
+    serve_parser.add_argument('--result-cache-size', type=int, default=64,
+                              help='Results kept for unchanged inputs (default: 64)')
+
+    submit_parser = subparsers.add_parser('submit', help='Submit a job to a running daemon')
+    submit_parser.add_argument('tool', choices=TOOLS, help='Extraction tool')
+    submit_parser.add_argument('input', help='Input file path')
+    submit_parser.add_argument('-o', '--output', help='Output path (result is printed when omitted)')
+    submit_parser.add_argument('--option', action='append', default=[], metavar='KEY=JSON',
+                               help='Job option, value parsed as JSON when possible (e.g. format=json)')
+
+    subparsers.add_parser('health', help='Check daemon health')
+    subparsers.add_parser('stats', help='Show daemon job and cache statistics')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'serve':
+            daemon = ExtractionDaemon(
+                socket_path=args.socket,
+                workers=args.workers,
+                max_queue=args.max_queue,
+                body_cache_size=args.body_cache_size,
+                result_cache_size=args.result_cache_size,
+            )
+            daemon.warm_up()
+            print(f"🚀 Extraction daemon listening on {args.socket} ({args.workers} workers)")
+            for tool, error in daemon.tool_errors.items():
+                print(f"⚠️  {tool} unavailable: {error}")
+            asyncio.run(daemon.serve())
+            print("👋 Extraction daemon stopped")
+            return
+
+        if args.command == 'submit':
+            options: Dict[str, Any] = {}
+            for option in args.option:
+                key, _, value = option.partition('=')
+                try:
+                    options[key] = json.loads(value)
+                except json.JSONDecodeError:
+                    options[key] = value
+            # The daemon resolves paths against its own working directory
+            request: Dict[str, Any] = {
+                'op': 'job', 'tool': args.tool, 'input': os.path.abspath(args.input), 'options': options,
+            }
+            if args.output:
+                request['output'] = os.path.abspath(args.output)
+        else:
+            request = {'op': args.command}
+
+        response = send_request(args.socket, request)
+        print(json.dumps(response, indent=2, default=str))
+        if not response.get('ok'):
+            import sys
+            sys.exit(1)
+
+    except (ConnectionError, FileNotFoundError) as e:
+        print(f"❌ Error: cannot reach daemon at {args.socket}: {e}")
+        import sys
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import sys
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,33 +8,58 @@ Detects GraphQL operations, extracts queries, mutations, and variables.
 Usage:
     python scripts/graphql_extractor.py input.har.json -o queries/
     python scripts/graphql_extractor.py input.har.json -o queries.json --format json
+    python scripts/graphql_extractor.py input.har.json -o queries/ --format shards --shards 8
+    capture-tool | python scripts/graphql_extractor.py - --ndjson > operations.ndjson
 """
 
 import argparse
+import contextlib
+import itertools
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional
+import sys
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from compressed_io import open_binary_input, open_input, open_output
+from har_content import ContentDecodeError, decode_content
+from ndjson_stream import add_ndjson_arguments, stream_records
 
 
 class GraphQLExtractor:
     """Extract and analyze GraphQL queries from HAR files."""
 
-    def __init__(self, har_file: str):
+    def __init__(
+        self,
+        har_file: str,
+        threaded_decompression: bool = False,
+        sink: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ):
         """
         Initialize extractor with HAR file.
 
         Args:
-            har_file: Path to HAR file
+            har_file: Path to HAR file (optionally gzip/zstd/brotli compressed)
+            threaded_decompression: Decompress input on a background thread
+            sink: Called with each extracted operation instead of collecting
+                it in self.queries (e.g. a shard writer)
         """
         self.har_file = har_file
+        self.threaded_decompression = threaded_decompression
+        self.sink = sink
         self.har_data: Dict[str, Any] = {}
         self.queries: List[Dict[str, Any]] = []
+        # Counted for every operation, whether collected or passed to the sink
+        self.operation_counts: Dict[str, int] = {}
+        self.type_counts: Dict[str, int] = {'query': 0, 'mutation': 0, 'subscription': 0}
 
     def load_har(self) -> None:
         """Load and parse HAR file."""
         try:
-            with open(self.har_file, 'r', encoding='utf-8') as f:
+            with open_input(self.har_file, threaded=self.threaded_decompression) as f:
                 self.har_data = json.load(f)
         except FileNotFoundError:
             raise FileNotFoundError(f"HAR file not found: {self.har_file}")
@@ -51,39 +76,61 @@ class GraphQLExtractor:
         entries = self.har_data.get('log', {}).get('entries', [])
 
         for entry_idx, entry in enumerate(entries):
-            request = entry.get('request', {})
+            self.add_entry(entry, entry_idx)
 
-            if not self._is_graphql_request(entry):
-                continue
+        return self.queries
 
-            # Extract query from request
-            query, variables, operation_name = self._extract_query_from_request(request)
+    def add_entry(self, entry: Dict[str, Any], entry_idx: int) -> Optional[Dict[str, Any]]:
+        """
+        Extract the GraphQL operation of one HAR entry, if any.
 
-            if not query:
-                continue
+        Args:
+            entry: HAR entry
+            entry_idx: Entry position, used to name anonymous operations
 
-            # Extract response
-            response = entry.get('response', {})
-            response_data = self._extract_response_data(response)
+        Returns:
+            Extracted operation (also appended to self.queries or passed to
+            the sink) or None
+        """
+        request = entry.get('request', {})
 
-            # Determine operation type
-            operation_type = self._determine_operation_type(query)
+        if not self._is_graphql_request(entry):
+            return None
 
-            # Extract operation name from query if not in request
-            if not operation_name:
-                operation_name = self._extract_operation_name(query)
+        # Extract query from request
+        query, variables, operation_name = self._extract_query_from_request(request)
 
-            self.queries.append({
-                'operation_name': operation_name or f'operation_{entry_idx}',
-                'operation_type': operation_type,
-                'query': query,
-                'variables': variables,
-                'url': request.get('url', ''),
-                'response': response_data,
-                'timestamp': entry.get('startedDateTime', '')
-            })
+        if not query:
+            return None
 
-        return self.queries
+        # Extract response
+        response = entry.get('response', {})
+        response_data = self._extract_response_data(response)
+
+        # Determine operation type
+        operation_type = self._determine_operation_type(query)
+
+        # Extract operation name from query if not in request
+        if not operation_name:
+            operation_name = self._extract_operation_name(query)
+
+        operation = {
+            'operation_name': operation_name or f'operation_{entry_idx}',
+            'operation_type': operation_type,
+            'query': query,
+            'variables': variables,
+            'url': request.get('url', ''),
+            'response': response_data,
+            'timestamp': entry.get('startedDateTime', '')
+        }
+        name = operation['operation_name']
+        self.operation_counts[name] = self.operation_counts.get(name, 0) + 1
+        self.type_counts[operation_type] += 1
+        if self.sink is not None:
+            self.sink(operation)
+        else:
+            self.queries.append(operation)
+        return operation
 
     def _is_graphql_request(self, entry: Dict[str, Any]) -> bool:
         """
@@ -195,17 +242,20 @@ class GraphQLExtractor:
             Response data or None
         """
         content = response.get('content', {})
-        text = content.get('text', '')
-
-        if not text:
-            return None
 
         try:
-            data = json.loads(text)
-            return data
-        except json.JSONDecodeError:
+            payload = decode_content(content)
+            if payload is None:
+                return None
+            return json.loads(payload)
+        except (ContentDecodeError, UnicodeDecodeError, json.JSONDecodeError):
             return None
 
+    @property
+    def total_queries(self) -> int:
+        """Number of operations extracted so far."""
+        return sum(self.type_counts.values())
+
     def group_by_operation(self) -> Dict[str, List[Dict[str, Any]]]:
         """
         Group queries by operation name.
@@ -234,6 +284,219 @@ class GraphQLExtractor:
         return self.extract_queries()
 
 
+class ShardedJSONLWriter:
+    """
+    Write JSON records into a fixed number of JSONL shard files.
+
+    Records are serialized on the calling thread and appended to an in-memory
+    buffer per shard. Full buffers are handed to a background thread pool and
+    written with positional writes, so extraction never waits on file I/O and
+    the number of files stays constant regardless of the number of queries.
+    An index mapping each key to its (shard, offset, length) locations is
+    written on close for random access.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(
+        self,
+        output_dir: str,
+        num_shards: int = 8,
+        buffer_size: int = 1 << 20,
+        max_workers: int = 4,
+    ):
+        """
+        Initialize writer and create shard files.
+
+        Args:
+            output_dir: Directory receiving shard and index files
+            num_shards: Number of shard files
+            buffer_size: Bytes buffered per shard before a background flush
+            max_workers: Number of background writer threads
+        """
+        if num_shards < 1:
+            raise ValueError(f"num_shards must be positive, got {num_shards}")
+
+        self.output_dir = output_dir
+        self.num_shards = num_shards
+        self.buffer_size = buffer_size
+        self.index: Dict[str, List[Tuple[int, int, int]]] = {}
+        self.records_written = 0
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.shard_names = [f"shard-{idx:05d}.jsonl" for idx in range(num_shards)]
+        self._fds = [
+            os.open(
+                os.path.join(output_dir, name),
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0),
+                0o644,
+            )
+            for name in self.shard_names
+        ]
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+        self._buffers = [bytearray() for _ in range(num_shards)]
+        self._buffer_offsets = [0] * num_shards
+        self._positions = [0] * num_shards
+        self._pending: List[Future] = []
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='shard-writer')
+
+    def write(self, key: str, record: Any) -> Tuple[int, int, int]:
+        """
+        Append a record to the shard selected by its key.
+
+        Args:
+            key: Index key (e.g. operation name); equal keys share a shard
+            record: JSON-serializable record
+
+        Returns:
+            Tuple of (shard, offset, length) locating the record
+        """
+        data = json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+        shard = zlib.crc32(key.encode('utf-8')) % self.num_shards
+        offset = self._positions[shard]
+        length = len(data) - 1
+
+        self._buffers[shard] += data
+        self._positions[shard] += len(data)
+        self.index.setdefault(key, []).append((shard, offset, length))
+        self.records_written += 1
+
+        if len(self._buffers[shard]) >= self.buffer_size:
+            self._flush_shard(shard)
+
+        return shard, offset, length
+
+    def _flush_shard(self, shard: int) -> None:
+        """
+        Hand the buffered bytes of a shard to the background pool.
+
+        Args:
+            shard: Shard number
+        """
+        buffer = self._buffers[shard]
+        if not buffer:
+            return
+
+        offset = self._buffer_offsets[shard]
+        self._buffers[shard] = bytearray()
+        self._buffer_offsets[shard] = self._positions[shard]
+        self._pending.append(self._executor.submit(self._write_at, shard, bytes(buffer), offset))
+
+        # Surface write errors early and keep the pending list short
+        if len(self._pending) > 64:
+            done = [future for future in self._pending if future.done()]
+            for future in done:
+                future.result()
+            self._pending = [future for future in self._pending if not future.done()]
+
+    def _write_at(self, shard: int, data: bytes, offset: int) -> None:
+        """
+        Write bytes at an absolute offset of a shard file.
+
+        Args:
+            shard: Shard number
+            data: Bytes to write
+            offset: Absolute file offset
+        """
+        fd = self._fds[shard]
+        if hasattr(os, 'pwrite'):
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+            return
+
+        with self._locks[shard]:
+            os.lseek(fd, offset, os.SEEK_SET)
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+
+    def close(self) -> str:
+        """
+        Flush all shards, wait for background writes and write the index.
+
+        Returns:
+            Path of the index file
+        """
+        try:
+            for shard in range(self.num_shards):
+                self._flush_shard(shard)
+            for future in self._pending:
+                future.result()
+        finally:
+            self._executor.shutdown(wait=True)
+            for fd in self._fds:
+                os.close(fd)
+
+        index_path = os.path.join(self.output_dir, self.INDEX_FILE)
+        with open(index_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'shards': self.shard_names,
+                'records': self.records_written,
+                'operations': {key: [list(loc) for loc in locs] for key, locs in self.index.items()},
+            }, f)
+
+        return index_path
+
+    def __enter__(self) -> 'ShardedJSONLWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def read_sharded_record(output_dir: str, shard: int, offset: int, length: int) -> Any:
+    """
+    Read one record written by ShardedJSONLWriter.
+
+    Args:
+        output_dir: Directory containing shard and index files
+        shard: Shard number from the index
+        offset: Byte offset from the index
+        length: Byte length from the index
+
+    Returns:
+        Decoded JSON record
+    """
+    with open(os.path.join(output_dir, f"shard-{shard:05d}.jsonl"), 'rb') as f:
+        f.seek(offset)
+        return json.loads(f.read(length))
+
+
+def write_operation_dir(
+    output_dir: str,
+    operations: Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]],
+    indent: Optional[int] = None,
+) -> List[Tuple[str, int]]:
+    """
+    Write operations as separate JSON files.
+
+    Args:
+        output_dir: Directory receiving the files (created if missing)
+        operations: Operations (one file each, named after operation and
+            position) or operations grouped by name (one file per operation)
+        indent: JSON indent
+
+    Returns:
+        List of (file path, operations in file)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    if isinstance(operations, dict):
+        files = [(f"{name}.json", ops, len(ops)) for name, ops in operations.items()]
+    else:
+        files = [(f"{query['operation_name']}_{idx}.json", query, 1) for idx, query in enumerate(operations)]
+
+    saved = []
+    for file_name, payload, count in files:
+        file_path = os.path.join(output_dir, file_name)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=indent)
+        saved.append((file_path, count))
+    return saved
+
+
 def main() -> None:
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -243,15 +506,29 @@ def main() -> None:
 Examples:
   python scripts/graphql_extractor.py input.har.json -o queries/
   python scripts/graphql_extractor.py input.har.json -o queries.json --format json
+  python scripts/graphql_extractor.py input.har.json -o queries/ --format shards --shards 8
+  capture-tool | python scripts/graphql_extractor.py - --ndjson > operations.ndjson
         """
     )
-    parser.add_argument('input', help='Input HAR file path')
-    parser.add_argument('-o', '--output', required=True, help='Output directory or file path')
+    parser.add_argument('input', help='Input HAR file path (.gz/.zst/.br detected automatically), "-" for stdin with --ndjson')
+    parser.add_argument('-o', '--output', help='Output directory or file path; optional with --ndjson')
     parser.add_argument(
         '-f', '--format',
-        choices=['dir', 'json'],
+        choices=['dir', 'shards', 'json'],
         default='dir',
-        help='Output format: dir (separate files) or json (single file)'
+        help='Output format: dir (separate files), shards (sharded JSONL + index) or json (single file)'
+    )
+    parser.add_argument(
+        '--shards',
+        type=int,
+        default=8,
+        help='Number of shard files for --format shards (default: 8)'
+    )
+    parser.add_argument(
+        '--writer-threads',
+        type=int,
+        default=4,
+        help='Background writer threads for --format shards (default: 4)'
     )
     parser.add_argument(
         '--pretty',
@@ -263,66 +540,94 @@ Examples:
         action='store_true',
         help='Group queries by operation name'
     )
+    parser.add_argument(
+        '--decompress-thread',
+        action='store_true',
+        help='Decompress input on a background thread'
+    )
+    add_ndjson_arguments(parser, default_emit='records')
 
     args = parser.parse_args()
+    if not args.output and not args.ndjson:
+        parser.error('-o/--output is required unless --ndjson is used')
+
+    # With --ndjson, stdout carries results: report on stderr
+    report = sys.stderr if args.ndjson else sys.stdout
 
     try:
-        # Extract GraphQL queries
-        extractor = GraphQLExtractor(args.input)
-        queries = extractor.extract()
+        # Sharded output is written while extracting, so queries are never held in memory
+        shard_writer = None
+        if args.output and args.format == 'shards':
+            shard_writer = ShardedJSONLWriter(args.output, num_shards=args.shards,
+                                              max_workers=args.writer_threads)
+
+        sink: Optional[Callable[[Dict[str, Any]], Any]] = None
+        if shard_writer:
+            sink = lambda query: shard_writer.write(query['operation_name'], query)
+        elif args.ndjson and not args.output:
+            # Operations only go to stdout: drop them once emitted, snapshots use counters
+            sink = lambda query: None
+
+        with shard_writer or contextlib.nullcontext():
+            extractor = GraphQLExtractor(args.input, threaded_decompression=args.decompress_thread, sink=sink)
+
+            if args.ndjson:
+                input_stream = sys.stdin.buffer if args.input == '-' else open_binary_input(args.input)
+                entry_counter = itertools.count()
+                with input_stream:
+                    stream_records(
+                        process=lambda entry: extractor.add_entry(entry, next(entry_counter)),
+                        snapshot=lambda: {'operations': dict(extractor.operation_counts)},
+                        input_stream=input_stream,
+                        emit=args.emit,
+                        snapshot_every=args.snapshot_every,
+                        snapshot_interval=args.snapshot_interval,
+                    )
+            else:
+                extractor.extract()
 
-        if not queries:
-            print("⚠️  No GraphQL queries found in HAR file")
-            return
+        queries = extractor.queries
 
-        # Write output
-        if args.format == 'dir':
-            # Create output directory
-            os.makedirs(args.output, exist_ok=True)
+        if not extractor.total_queries:
+            print("⚠️  No GraphQL queries found in HAR file", file=report)
+            return
 
+        # Write output (optional in --ndjson mode)
+        if args.output and args.format == 'dir':
+            saved = write_operation_dir(
+                args.output,
+                extractor.group_by_operation() if args.group else queries,
+                indent=2 if args.pretty else None,
+            )
             if args.group:
-                # Group by operation and save
-                grouped = extractor.group_by_operation()
-                for operation_name, ops in grouped.items():
-                    file_path = os.path.join(args.output, f"{operation_name}.json")
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(ops, f, indent=2 if args.pretty else None)
-                    print(f"   Saved {len(ops)} operations to {file_path}")
-            else:
-                # Save each query separately
-                for idx, query in enumerate(queries):
-                    operation_name = query['operation_name']
-                    file_path = os.path.join(args.output, f"{operation_name}_{idx}.json")
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(query, f, indent=2 if args.pretty else None)
+                for file_path, count in saved:
+                    print(f"   Saved {count} operations to {file_path}", file=report)
 
-        else:
+        elif shard_writer:
+            print(f"   Saved {shard_writer.records_written} operations to {args.shards} shards", file=report)
+
+        elif args.output:
             # Save as single JSON file
             output_data = queries
             if args.group:
                 output_data = extractor.group_by_operation()
 
-            with open(args.output, 'w', encoding='utf-8') as f:
+            with open_output(args.output) as f:
                 json.dump(output_data, f, indent=2 if args.pretty else None)
 
-        print(f"✅ Successfully extracted GraphQL queries")
-        print(f"   Input: {args.input}")
-        print(f"   Output: {args.output}")
-        print(f"   Total queries: {len(queries)}")
-        print(f"   Unique operations: {len(set(q['operation_name'] for q in queries))}")
+        print(f"✅ Successfully extracted GraphQL queries", file=report)
+        print(f"   Input: {args.input}", file=report)
+        print(f"   Output: {args.output or 'stdout (ndjson)'}", file=report)
+        print(f"   Total queries: {extractor.total_queries}", file=report)
+        print(f"   Unique operations: {len(extractor.operation_counts)}", file=report)
 
         # Print operation type breakdown
-        query_count = sum(1 for q in queries if q['operation_type'] == 'query')
-        mutation_count = sum(1 for q in queries if q['operation_type'] == 'mutation')
-        subscription_count = sum(1 for q in queries if q['operation_type'] == 'subscription')
-
-        print(f"   Queries: {query_count}")
-        print(f"   Mutations: {mutation_count}")
-        print(f"   Subscriptions: {subscription_count}")
+        print(f"   Queries: {extractor.type_counts['query']}", file=report)
+        print(f"   Mutations: {extractor.type_counts['mutation']}", file=report)
+        print(f"   Subscriptions: {extractor.type_counts['subscription']}", file=report)
 
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import sys
+        print(f"❌ Error: {e}", file=report)
         sys.exit(1)
 
 
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+HAR Content Decoding
+
+Decodes HAR `content` / `postData` bodies into bytes or text.
+Handles `encoding: base64` bodies (as exported by Chrome for binary and some
+compressed JSON responses) and transparently decompresses gzip, zlib, zstd and
+brotli payloads found inside them. Bodies larger than a threshold are streamed
+through the decoder in chunks instead of being copied whole at every stage.
+
+Usage:
+    from har_content import content_hash, decode_content
+
+    key = content_hash(content)
+    body = decode_content(content)
+    data = json.loads(body)
+"""
+
+import base64
+import binascii
+import hashlib
+from typing import Any, Dict, Optional, Union
+
+from compressed_io import ChunkDecompressor, brotli_available, compression_from_magic
+
+DEFAULT_STREAM_THRESHOLD = 1 << 20
+
+# Base64 characters decoded per step when streaming (multiple of 4)
+BASE64_CHUNK_CHARS = 1 << 16
+
+# Leading bytes of plausible text: printable ASCII, whitespace, UTF-8 BOM
+_TEXT_LEADING_BYTES = frozenset(range(0x20, 0x7f)) | {0x09, 0x0a, 0x0d, 0xef}
+
+
+class ContentDecodeError(ValueError):
+    """Raised when a HAR body cannot be decoded."""
+
+
+def content_hash(content: Dict[str, Any]) -> str:
+    """
+    Hash a HAR content object without decoding it.
+
+    The hash covers the raw text together with its encoding and MIME type, so
+    identical payloads exported differently are still told apart.
+
+    Args:
+        content: HAR content or postData object
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(content.get('mimeType', '').encode('utf-8', 'surrogatepass'))
+    digest.update(b'\0')
+    digest.update((content.get('encoding') or '').encode('utf-8', 'surrogatepass'))
+    digest.update(b'\0')
+    digest.update(content.get('text', '').encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def decode_content(
+    content: Dict[str, Any],
+    stream_threshold: int = DEFAULT_STREAM_THRESHOLD,
+) -> Optional[Union[str, bytes, bytearray]]:
+    """
+    Decode a HAR content object into its payload.
+
+    Plain text bodies are returned unchanged. Base64 bodies are decoded and,
+    if the decoded bytes are compressed, decompressed as well.
+
+    Args:
+        content: HAR content or postData object
+        stream_threshold: Text length above which base64 bodies are decoded
+            and decompressed chunk by chunk
+
+    Returns:
+        Decoded payload (str for plain text, bytes otherwise) or None when empty
+
+    Raises:
+        ContentDecodeError: If the body is malformed or uses an unknown encoding
+    """
+    text = content.get('text', '')
+    if not text:
+        return None
+
+    encoding = (content.get('encoding') or '').lower()
+    if not encoding:
+        return text
+    if encoding != 'base64':
+        raise ContentDecodeError(f"Unsupported content encoding: {encoding}")
+
+    if len(text) > stream_threshold:
+        return _decode_base64_streaming(text)
+
+    try:
+        data = base64.b64decode(text)
+    except (binascii.Error, ValueError) as e:
+        raise ContentDecodeError(f"Invalid base64 body: {e}")
+
+    codec = _detect_codec(data)
+    if not codec:
+        return data
+
+    decompressor = ChunkDecompressor(codec)
+    try:
+        return decompressor.decompress(data) + decompressor.flush()
+    except Exception as e:
+        if codec == 'brotli':
+            # Brotli was only guessed, keep the raw bytes
+            return data
+        raise ContentDecodeError(f"Invalid {codec} body: {e}")
+
+
+def _detect_codec(head: bytes) -> Optional[str]:
+    """
+    Detect compression of decoded body bytes.
+
+    Args:
+        head: Leading decoded bytes
+
+    Returns:
+        Codec name or None for uncompressed bytes
+    """
+    codec = compression_from_magic(head)
+    if codec:
+        return codec
+
+    # Bare zlib stream (deflate content-encoding)
+    if len(head) >= 2 and head[0] == 0x78 and (head[0] << 8 | head[1]) % 31 == 0:
+        return 'gzip'
+
+    # Brotli has no magic number: only try it on bytes that cannot be text
+    if head and head[0] not in _TEXT_LEADING_BYTES and brotli_available():
+        return 'brotli'
+
+    return None
+
+
+def _decode_base64_streaming(text: str) -> bytearray:
+    """
+    Decode and decompress a large base64 body chunk by chunk.
+
+    Only one chunk of intermediate data is alive at a time; the decoded output
+    accumulates in a single buffer.
+
+    Args:
+        text: Base64 text
+
+    Returns:
+        Decoded, decompressed payload
+    """
+    output = bytearray()
+    decompressor: Optional[ChunkDecompressor] = None
+    first = True
+    carry = ''
+
+    for start in range(0, len(text), BASE64_CHUNK_CHARS):
+        piece = text[start:start + BASE64_CHUNK_CHARS]
+        # Tolerate MIME-style line breaks; a no-op without whitespace
+        piece = carry + ''.join(piece.split())
+        usable = len(piece) - len(piece) % 4
+        carry = piece[usable:]
+
+        try:
+            chunk = base64.b64decode(piece[:usable])
+        except (binascii.Error, ValueError) as e:
+            raise ContentDecodeError(f"Invalid base64 body: {e}")
+
+        if first and chunk:
+            first = False
+            codec = _detect_codec(chunk)
+            if codec:
+                decompressor = ChunkDecompressor(codec)
+
+        if not decompressor:
+            output += chunk
+            continue
+
+        try:
+            output += decompressor.decompress(chunk)
+        except Exception as e:
+            if decompressor.codec == 'brotli' and not output:
+                # Brotli was only guessed from the first chunk, keep raw bytes
+                decompressor = None
+                output += chunk
+                continue
+            raise ContentDecodeError(f"Invalid {decompressor.codec} body: {e}")
+
+    if carry:
+        raise ContentDecodeError("Invalid base64 body: truncated input")
+
+    if decompressor:
+        output += decompressor.flush()
+
+    return output
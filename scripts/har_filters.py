@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+HAR Entry Filters
+
+Compiled entry filters that are evaluated before any header, query string or
+body of a HAR entry is decoded. In streaming mode the same criteria are first
+checked against the raw entry bytes, so rejected entries are never parsed.
+
+Usage:
+    entry_filter = EntryFilter(hosts=['www.perplexity.ai'], path_prefixes=['/rest/', '/api/'])
+    if entry_filter.accepts(entry):
+        ...
+"""
+
+import argparse
+import fnmatch
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+FILTER_NAMES = ('method', 'host', 'path', 'status', 'mime')
+
+# Cheap field extraction from raw entry bytes (see EntryFilter.accepts_raw)
+_RAW_REQUEST = re.compile(rb'"request"\s*:\s*\{')
+_RAW_RESPONSE = re.compile(rb'"response"\s*:\s*\{')
+_RAW_METHOD = re.compile(rb'"method"\s*:\s*"([A-Za-z]+)"')
+_RAW_URL = re.compile(rb'"url"\s*:\s*("[^"\\]*(?:\\.[^"\\]*)*")')
+_RAW_STATUS = re.compile(rb'"status"\s*:\s*(-?\d+)')
+
+
+def parse_status_ranges(specs: Iterable[str]) -> List[Tuple[int, int]]:
+    """
+    Parse status range expressions.
+
+    Args:
+        specs: Expressions like '200', '200-299', '4xx' or comma-separated lists
+
+    Returns:
+        List of inclusive (low, high) ranges
+
+    Raises:
+        ValueError: If an expression is malformed
+    """
+    ranges = []
+    for spec in specs:
+        for part in spec.split(','):
+            part = part.strip().lower()
+            if not part:
+                continue
+            if re.fullmatch(r'[1-5]xx', part):
+                low = int(part[0]) * 100
+                ranges.append((low, low + 99))
+            elif re.fullmatch(r'\d+-\d+', part):
+                low, high = (int(value) for value in part.split('-'))
+                ranges.append((low, high))
+            elif part.isdigit():
+                ranges.append((int(part), int(part)))
+            else:
+                raise ValueError(f"Invalid status range: {part}")
+    return ranges
+
+
+class EntryFilter:
+    """Compiled HAR entry filter with per-criterion removal statistics."""
+
+    def __init__(
+        self,
+        hosts: Optional[List[str]] = None,
+        path_prefixes: Optional[List[str]] = None,
+        path_regexes: Optional[List[str]] = None,
+        methods: Optional[List[str]] = None,
+        mime_types: Optional[List[str]] = None,
+        status_ranges: Optional[List[Tuple[int, int]]] = None,
+    ):
+        """
+        Compile filter criteria.
+
+        Every given criterion must match for an entry to be kept. Path prefixes
+        and path regexes form one criterion: matching any of them is enough.
+
+        Args:
+            hosts: Host globs (e.g. '*.perplexity.ai'), case-insensitive
+            path_prefixes: URL path prefixes (e.g. '/rest/')
+            path_regexes: Regular expressions searched in the URL path
+            methods: HTTP methods
+            mime_types: Response MIME allowlist; globs like 'text/*' allowed
+            status_ranges: Inclusive (low, high) response status ranges
+        """
+        self.host_pattern = self._compile_globs(hosts)
+        self.path_prefixes = tuple(path_prefixes or ())
+        self.path_regexes = [re.compile(regex) for regex in path_regexes or ()]
+        self.methods = frozenset(method.upper() for method in methods or ())
+        self.mime_pattern = self._compile_globs(mime_types)
+        self.status_ranges = list(status_ranges or ())
+
+        self.kept = 0
+        self.stats: Dict[str, Dict[str, int]] = {
+            name: {'entries': 0, 'bytes': 0} for name in FILTER_NAMES
+        }
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace) -> 'EntryFilter':
+        """
+        Build a filter from parsed command line arguments.
+
+        Args:
+            args: Namespace populated by add_filter_arguments
+
+        Returns:
+            EntryFilter instance
+        """
+        return cls(
+            hosts=args.host,
+            path_prefixes=args.path_prefix,
+            path_regexes=args.path_regex,
+            methods=args.method,
+            mime_types=args.mime,
+            status_ranges=parse_status_ranges(args.status or ()),
+        )
+
+    @staticmethod
+    def _compile_globs(globs: Optional[List[str]]) -> Optional['re.Pattern[str]']:
+        """Compile a list of globs into one case-insensitive regex."""
+        if not globs:
+            return None
+        return re.compile('|'.join(fnmatch.translate(glob) for glob in globs), re.IGNORECASE)
+
+    @property
+    def active(self) -> bool:
+        """True if any criterion is configured."""
+        return bool(
+            self.host_pattern or self.path_prefixes or self.path_regexes
+            or self.methods or self.mime_pattern or self.status_ranges
+        )
+
+    def _reject(self, name: str, size: int) -> bool:
+        """Record a rejection and return False."""
+        self.stats[name]['entries'] += 1
+        self.stats[name]['bytes'] += size
+        return False
+
+    def _check_request(self, method: Optional[str], url: Optional[str], size: int) -> Optional[bool]:
+        """
+        Check request-level criteria.
+
+        Returns:
+            False if rejected, None if the checks passed or were not applicable
+        """
+        if self.methods and method is not None and method.upper() not in self.methods:
+            return self._reject('method', size)
+
+        if url is not None and (self.host_pattern or self.path_prefixes or self.path_regexes):
+            parts = urlsplit(url)
+            if self.host_pattern and not self.host_pattern.match(parts.hostname or ''):
+                return self._reject('host', size)
+            if self.path_prefixes or self.path_regexes:
+                path = parts.path or '/'
+                if not path.startswith(self.path_prefixes) and \
+                        not any(regex.search(path) for regex in self.path_regexes):
+                    return self._reject('path', size)
+
+        return None
+
+    def _check_status(self, status: Optional[int], size: int) -> Optional[bool]:
+        """
+        Check the response status criterion.
+
+        Returns:
+            False if rejected, None otherwise
+        """
+        if self.status_ranges and status is not None and \
+                not any(low <= status <= high for low, high in self.status_ranges):
+            return self._reject('status', size)
+        return None
+
+    def accepts(self, entry: Dict[str, Any], size: Optional[int] = None) -> bool:
+        """
+        Check a decoded HAR entry without touching its bodies.
+
+        Args:
+            entry: HAR entry
+            size: Entry size in bytes for statistics; defaults to the
+                request and response body sizes
+
+        Returns:
+            True if the entry should be processed
+        """
+        if not self.active:
+            self.kept += 1
+            return True
+
+        request = entry.get('request', {})
+        response = entry.get('response', {})
+        if size is None:
+            size = _body_size(request, response)
+
+        if self._check_request(request.get('method', 'GET'), request.get('url', ''), size) is False:
+            return False
+        if self._check_status(response.get('status'), size) is False:
+            return False
+
+        if self.mime_pattern:
+            mime_type = response.get('content', {}).get('mimeType', '').split(';', 1)[0].strip()
+            if not self.mime_pattern.match(mime_type):
+                return self._reject('mime', size)
+
+        self.kept += 1
+        return True
+
+    def accepts_raw(self, raw: bytes) -> bool:
+        """
+        Pre-check raw entry bytes before they are decoded.
+
+        Only fields that can be located reliably (request method and URL,
+        response status) are checked; anything else is left to accepts().
+        Rejections are counted here, acceptances are counted by accepts().
+
+        Args:
+            raw: Raw JSON bytes of one HAR entry
+
+        Returns:
+            False if the entry can be skipped without decoding
+        """
+        if not (self.methods or self.host_pattern or self.path_prefixes
+                or self.path_regexes or self.status_ranges):
+            return True
+
+        size = len(raw)
+        request = _RAW_REQUEST.search(raw)
+        if request:
+            method = _RAW_METHOD.search(raw, request.end())
+            url = _RAW_URL.search(raw, request.end())
+            try:
+                url_value = json.loads(url.group(1)) if url else None
+            except ValueError:
+                url_value = None
+            if self._check_request(method.group(1).decode('ascii') if method else None,
+                                   url_value, size) is False:
+                return False
+
+        response = _RAW_RESPONSE.search(raw)
+        if response and self.status_ranges:
+            status = _RAW_STATUS.search(raw, response.end())
+            if status and self._check_status(int(status.group(1)), size) is False:
+                return False
+
+        return True
+
+    def removed(self) -> Tuple[int, int]:
+        """
+        Get totals removed by all criteria.
+
+        Returns:
+            Tuple of (entries, bytes)
+        """
+        return (
+            sum(stat['entries'] for stat in self.stats.values()),
+            sum(stat['bytes'] for stat in self.stats.values()),
+        )
+
+    def summary_lines(self) -> List[str]:
+        """
+        Format removal statistics for CLI output.
+
+        Returns:
+            Lines describing what each filter removed
+        """
+        if not self.active:
+            return []
+
+        entries, size = self.removed()
+        lines = [f"Filtered out: {entries} entries ({_format_bytes(size)}), kept {self.kept}"]
+        for name in FILTER_NAMES:
+            stat = self.stats[name]
+            if stat['entries']:
+                lines.append(f"  {name}: {stat['entries']} entries ({_format_bytes(stat['bytes'])})")
+        return lines
+
+
+def _body_size(request: Dict[str, Any], response: Dict[str, Any]) -> int:
+    """Estimate the body bytes of an entry from HAR size fields."""
+    content = response.get('content', {})
+    response_size = content.get('size', -1)
+    if not isinstance(response_size, int) or response_size < 0:
+        response_size = len(content.get('text', ''))
+    request_size = len(request.get('postData', {}).get('text', ''))
+    return response_size + request_size
+
+
+def _format_bytes(size: int) -> str:
+    """Format a byte count for humans."""
+    value = float(size)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if value < 1024 or unit == 'GB':
+            return f"{value:.0f} {unit}" if unit == 'B' else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{size} B"
+
+
+def add_filter_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add entry filter options to a CLI parser.
+
+    Args:
+        parser: Argument parser
+    """
+    group = parser.add_argument_group(
+        'entry filters',
+        'Applied before any body is decoded; repeat a flag to allow several values'
+    )
+    group.add_argument('--host', action='append', metavar='GLOB',
+                       help='Keep hosts matching glob (e.g. "*.perplexity.ai")')
+    group.add_argument('--path-prefix', action='append', metavar='PREFIX',
+                       help='Keep URL paths starting with prefix (e.g. /rest/)')
+    group.add_argument('--path-regex', action='append', metavar='REGEX',
+                       help='Keep URL paths matching regular expression')
+    group.add_argument('--method', action='append', metavar='METHOD',
+                       help='Keep HTTP method (e.g. GET)')
+    group.add_argument('--mime', action='append', metavar='GLOB',
+                       help='Keep response MIME types matching glob (e.g. application/json, text/*)')
+    group.add_argument('--status', action='append', metavar='RANGE',
+                       help='Keep response statuses (e.g. 200-299, 4xx, 429)')
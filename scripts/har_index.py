@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+HAR SQLite Indexer
+
+Indexes HAR entries into a local SQLite database for ad-hoc querying without
+re-parsing captures. Entries are read with the same streaming and filtering
+logic as HARToOpenAPIConverter; bodies are deduplicated by content hash.
+
+Usage:
+    python scripts/har_index.py capture.har.json -o captures.db
+    python scripts/har_index.py session-*/*.har.json -o captures.db --host www.perplexity.ai
+
+Example queries:
+    sqlite3 captures.db "SELECT method, path_template, COUNT(*) FROM entries WHERE status = 429 GROUP BY 1, 2"
+    sqlite3 captures.db "SELECT DISTINCT e.path_template FROM entries e JOIN bodies b
+                         ON b.hash = e.response_body_hash WHERE b.content LIKE '%\"backend_uuid\"%'"
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+
+from compressed_io import detect_compression
+from har_content import ContentDecodeError, content_hash, decode_content
+from har_filters import EntryFilter, add_filter_arguments
+from har_to_openapi import HARToOpenAPIConverter
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    size INTEGER,
+    mtime REAL,
+    compression TEXT,
+    entries INTEGER,
+    indexed_at REAL
+);
+
+CREATE TABLE IF NOT EXISTS bodies (
+    hash TEXT PRIMARY KEY,
+    mime_type TEXT,
+    encoding TEXT,
+    size INTEGER,
+    content
+);
+
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    capture_id INTEGER NOT NULL REFERENCES captures(id) ON DELETE CASCADE,
+    entry_index INTEGER NOT NULL,
+    started TEXT,
+    method TEXT,
+    scheme TEXT,
+    host TEXT,
+    path TEXT,
+    path_template TEXT,
+    query TEXT,
+    status INTEGER,
+    status_text TEXT,
+    mime_type TEXT,
+    time_ms REAL,
+    blocked_ms REAL,
+    dns_ms REAL,
+    connect_ms REAL,
+    ssl_ms REAL,
+    send_ms REAL,
+    wait_ms REAL,
+    receive_ms REAL,
+    request_headers_size INTEGER,
+    request_body_size INTEGER,
+    response_headers_size INTEGER,
+    response_body_size INTEGER,
+    content_size INTEGER,
+    request_body_hash TEXT REFERENCES bodies(hash),
+    response_body_hash TEXT REFERENCES bodies(hash),
+    byte_offset INTEGER,
+    byte_length INTEGER
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_entries_capture ON entries(capture_id);
+CREATE INDEX IF NOT EXISTS idx_entries_endpoint ON entries(method, path_template);
+CREATE INDEX IF NOT EXISTS idx_entries_host ON entries(host);
+CREATE INDEX IF NOT EXISTS idx_entries_status ON entries(status);
+CREATE INDEX IF NOT EXISTS idx_entries_mime ON entries(mime_type);
+CREATE INDEX IF NOT EXISTS idx_entries_response_body ON entries(response_body_hash);
+CREATE INDEX IF NOT EXISTS idx_entries_request_body ON entries(request_body_hash);
+"""
+
+ENTRY_COLUMNS = (
+    'capture_id', 'entry_index', 'started', 'method', 'scheme', 'host', 'path', 'path_template',
+    'query', 'status', 'status_text', 'mime_type', 'time_ms', 'blocked_ms', 'dns_ms',
+    'connect_ms', 'ssl_ms', 'send_ms', 'wait_ms', 'receive_ms', 'request_headers_size',
+    'request_body_size', 'response_headers_size', 'response_body_size', 'content_size',
+    'request_body_hash', 'response_body_hash', 'byte_offset', 'byte_length',
+)
+
+TIMING_PHASES = ('blocked', 'dns', 'connect', 'ssl', 'send', 'wait', 'receive')
+
+
+class HARIndexer:
+    """Index HAR entries into a SQLite database."""
+
+    def __init__(
+        self,
+        db_file: str,
+        batch_size: int = 1000,
+        entry_filter: Optional[EntryFilter] = None,
+    ):
+        """
+        Initialize indexer and create the schema if needed.
+
+        Args:
+            db_file: Path to SQLite database
+            batch_size: Rows inserted per transaction
+            entry_filter: Filter applied to entries before anything is decoded
+        """
+        self.db_file = db_file
+        self.batch_size = batch_size
+        self.entry_filter = entry_filter or EntryFilter()
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        self._known_bodies: Set[str] = set()
+        self.entries_indexed = 0
+        self.bodies_stored = 0
+
+    def index_file(self, har_file: str) -> int:
+        """
+        Index one HAR file, replacing any previous rows for it.
+
+        Args:
+            har_file: Path to HAR file (optionally compressed)
+
+        Returns:
+            Number of entries indexed
+        """
+        converter = HARToOpenAPIConverter(har_file, entry_filter=self.entry_filter, streaming=True)
+        path = os.path.abspath(har_file)
+        stat = os.stat(har_file)
+
+        with self.conn:
+            self.conn.execute('DELETE FROM captures WHERE path = ?', (path,))
+            capture_id = self.conn.execute(
+                'INSERT INTO captures (path, size, mtime, compression, entries, indexed_at) '
+                'VALUES (?, ?, ?, ?, 0, ?)',
+                (path, stat.st_size, stat.st_mtime, detect_compression(har_file), time.time()),
+            ).lastrowid
+
+        insert_entry = (
+            f"INSERT INTO entries ({', '.join(ENTRY_COLUMNS)}) "
+            f"VALUES ({', '.join('?' for _ in ENTRY_COLUMNS)})"
+        )
+        rows: List[Tuple[Any, ...]] = []
+        bodies: List[Tuple[Any, ...]] = []
+        count = 0
+
+        for entry_index, offset, length, entry in converter.iter_located_entries():
+            request = entry.get('request', {})
+            response = entry.get('response', {})
+            request_hash = self._collect_body(request.get('postData', {}), bodies)
+            response_hash = self._collect_body(response.get('content', {}), bodies)
+            rows.append(self._entry_row(converter, capture_id, entry_index, entry,
+                                        request_hash, response_hash, offset, length))
+            count += 1
+
+            if len(rows) >= self.batch_size:
+                self._flush(insert_entry, rows, bodies)
+
+        self._flush(insert_entry, rows, bodies)
+
+        with self.conn:
+            self.conn.execute('UPDATE captures SET entries = ? WHERE id = ?', (count, capture_id))
+
+        self.entries_indexed += count
+        return count
+
+    def finalize(self) -> None:
+        """Create query indexes and update planner statistics."""
+        with self.conn:
+            self.conn.executescript(INDEXES)
+        self.conn.execute('ANALYZE')
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+    def _flush(self, insert_entry: str, rows: List[Tuple[Any, ...]], bodies: List[Tuple[Any, ...]]) -> None:
+        """
+        Insert buffered rows in a single transaction.
+
+        Args:
+            insert_entry: Entry INSERT statement
+            rows: Buffered entry rows (cleared)
+            bodies: Buffered body rows (cleared)
+        """
+        if not rows and not bodies:
+            return
+        with self.conn:
+            if bodies:
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO bodies (hash, mime_type, encoding, size, content) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    bodies,
+                )
+            if rows:
+                self.conn.executemany(insert_entry, rows)
+        self.bodies_stored += len(bodies)
+        rows.clear()
+        bodies.clear()
+
+    def _collect_body(self, content: Dict[str, Any], bodies: List[Tuple[Any, ...]]) -> Optional[str]:
+        """
+        Hash a body and queue it for storage if it has not been stored yet.
+
+        Args:
+            content: HAR content or postData object
+            bodies: Pending body rows
+
+        Returns:
+            Content hash or None for empty bodies
+        """
+        if not content.get('text'):
+            return None
+
+        body_hash = content_hash(content)
+        if body_hash in self._known_bodies:
+            return body_hash
+
+        self._known_bodies.add(body_hash)
+        exists = self.conn.execute('SELECT 1 FROM bodies WHERE hash = ?', (body_hash,)).fetchone()
+        if exists:
+            return body_hash
+
+        # Store decoded text when possible so bodies can be searched with LIKE
+        try:
+            payload = decode_content(content)
+        except ContentDecodeError:
+            payload = content.get('text')
+        if isinstance(payload, (bytes, bytearray)):
+            try:
+                payload = payload.decode('utf-8')
+            except UnicodeDecodeError:
+                payload = bytes(payload)
+
+        bodies.append((
+            body_hash,
+            content.get('mimeType', ''),
+            content.get('encoding'),
+            len(payload) if payload is not None else 0,
+            payload,
+        ))
+        return body_hash
+
+    @staticmethod
+    def _entry_row(
+        converter: HARToOpenAPIConverter,
+        capture_id: int,
+        entry_index: int,
+        entry: Dict[str, Any],
+        request_hash: Optional[str],
+        response_hash: Optional[str],
+        offset: Optional[int],
+        length: Optional[int],
+    ) -> Tuple[Any, ...]:
+        """
+        Build an entries row.
+
+        Returns:
+            Row tuple matching ENTRY_COLUMNS
+        """
+        request = entry.get('request', {})
+        response = entry.get('response', {})
+        content = response.get('content', {})
+        timings = entry.get('timings', {})
+
+        parsed_url = urlsplit(request.get('url', ''))
+        path = parsed_url.path or '/'
+        endpoint_key = converter.endpoint_key(entry)
+        path_template = endpoint_key.partition(':')[2] if endpoint_key else path
+
+        return (
+            capture_id,
+            entry_index,
+            entry.get('startedDateTime'),
+            request.get('method', 'GET').upper(),
+            parsed_url.scheme,
+            parsed_url.hostname,
+            path,
+            path_template,
+            parsed_url.query or None,
+            response.get('status'),
+            response.get('statusText'),
+            content.get('mimeType', '').split(';', 1)[0].strip() or None,
+            _non_negative(entry.get('time')),
+            *(_non_negative(timings.get(phase)) for phase in TIMING_PHASES),
+            _non_negative(request.get('headersSize')),
+            _non_negative(request.get('bodySize')),
+            _non_negative(response.get('headersSize')),
+            _non_negative(response.get('bodySize')),
+            _non_negative(content.get('size')),
+            request_hash,
+            response_hash,
+            offset,
+            length,
+        )
+
+
+def _non_negative(value: Any) -> Optional[Any]:
+    """Map HAR's -1 'not available' marker (and non-numbers) to NULL."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0:
+        return value
+    return None
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Index HAR entries into a SQLite database for ad-hoc querying',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/har_index.py capture.har.json -o captures.db
+  python scripts/har_index.py session-*/*.har.json -o captures.db --host www.perplexity.ai
+
+  sqlite3 captures.db "SELECT method, path_template, COUNT(*) FROM entries WHERE status = 429 GROUP BY 1, 2"
+        """
+    )
+    parser.add_argument('inputs', nargs='+', help='Input HAR file paths (.gz/.zst/.br detected automatically)')
+    parser.add_argument('-o', '--output', required=True, help='SQLite database path (created or updated)')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1000,
+        help='Rows inserted per transaction (default: 1000)'
+    )
+    add_filter_arguments(parser)
+
+    args = parser.parse_args()
+
+    try:
+        indexer = HARIndexer(args.output, batch_size=args.batch_size,
+                             entry_filter=EntryFilter.from_args(args))
+        started = time.perf_counter()
+        try:
+            for har_file in args.inputs:
+                count = indexer.index_file(har_file)
+                print(f"   Indexed {count} entries from {har_file}")
+            indexer.finalize()
+        finally:
+            indexer.close()
+        elapsed = time.perf_counter() - started
+
+        print(f"✅ Successfully indexed HAR entries")
+        print(f"   Inputs: {len(args.inputs)}")
+        print(f"   Output: {args.output}")
+        print(f"   Entries: {indexer.entries_indexed}")
+        print(f"   New bodies: {indexer.bodies_stored}")
+        print(f"   Time: {elapsed:.2f}s")
+        for line in indexer.entry_filter.summary_lines():
+            print(f"   {line}")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import sys
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Streaming HAR Reader
+
+Iterates over `log.entries` of a HAR file without loading the whole document.
+The byte stream is scanned for structural tokens only; each entry's raw bytes
+are located first and can be rejected by a cheap filter before they are
+decoded into Python objects.
+
+Usage:
+    from compressed_io import open_binary_input
+    from har_stream import iter_har_entries
+
+    with open_binary_input('capture.har.json.gz') as f:
+        for offset, length, entry in iter_har_entries(f):
+            ...
+"""
+
+import json
+import re
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+
+CHUNK_SIZE = 1 << 20
+
+# Complete string, structural character, or a lone quote (string cut off by
+# the end of the buffer)
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"', re.DOTALL)
+
+_ENTRIES_KEY = b'"entries"'
+
+
+def iter_har_entries(
+    stream: BinaryIO,
+    raw_filter: Optional[Callable[[bytes], bool]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+    """
+    Stream entries from a HAR document.
+
+    Args:
+        stream: Binary stream positioned at the start of the HAR JSON
+        raw_filter: Optional predicate on the raw entry bytes; entries it
+            rejects are skipped without being decoded
+        chunk_size: Minimum number of bytes read at a time
+
+    Yields:
+        Tuples of (byte offset, byte length, entry) where offset and length
+        locate the entry's JSON object in the (decompressed) stream
+
+    Raises:
+        ValueError: If the document is truncated or malformed
+    """
+    buf = b''
+    base = 0
+    pos = 0
+    depth = 0
+    previous = b''
+    entries_depth: Optional[int] = None
+    entry_start: Optional[int] = None
+    eof = False
+
+    while True:
+        match = _TOKEN.search(buf, pos)
+
+        if match is None or match.end() - match.start() == 1 and buf[match.start()] == 0x22:
+            # Need more data: keep the current entry (or cut-off string)
+            restart = match.start() if match else len(buf)
+            if eof:
+                if match is not None or entries_depth is not None:
+                    raise ValueError(f"Truncated HAR document at byte {base + restart}")
+                return
+            keep = restart if entry_start is None else min(restart, entry_start)
+            chunk = stream.read(max(chunk_size, len(buf) - keep))
+            if not chunk:
+                eof = True
+            buf = buf[keep:] + chunk
+            base += keep
+            pos = restart - keep
+            if entry_start is not None:
+                entry_start -= keep
+            continue
+
+        token = match.group()
+        pos = match.end()
+        char = token[0]
+
+        if char == 0x7b or char == 0x5b:  # { [
+            if entries_depth is not None and depth == entries_depth and char == 0x7b:
+                entry_start = match.start()
+            elif entries_depth is None and char == 0x5b and depth == 2 and previous == _ENTRIES_KEY:
+                entries_depth = depth + 1
+            depth += 1
+        elif char == 0x7d or char == 0x5d:  # } ]
+            depth -= 1
+            if entries_depth is not None:
+                if depth == entries_depth and entry_start is not None:
+                    raw = buf[entry_start:pos]
+                    if raw_filter is None or raw_filter(raw):
+                        yield base + entry_start, len(raw), json.loads(raw)
+                    entry_start = None
+                elif depth < entries_depth:
+                    return
+
+        previous = token
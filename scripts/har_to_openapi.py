@@ -8,27 +8,81 @@ Extracts endpoints, normalizes paths, detects parameters, and generates schemas.
 Usage:
     python scripts/har_to_openapi.py input.har.json -o output.yaml
     python scripts/har_to_openapi.py input.har.json -o output.json --format json
+    python scripts/har_to_openapi.py input.har.json.zst -o output.yaml.gz
+    python scripts/har_to_openapi.py input.har.json -o output.yaml --stream --host www.perplexity.ai --path-prefix /rest/
+    python scripts/har_to_openapi.py input.har.json -o output.yaml --sample-rate 0.05 --sample-first 20
+    capture-tool | python scripts/har_to_openapi.py - --ndjson --emit both > results.ndjson
 """
 
 import argparse
+import copy
 import json
+import random
 import re
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from typing import Any, Dict, Iterator, List, MutableMapping, Optional, Set, Tuple
 from urllib.parse import urlparse, parse_qs
-import yaml
+
+from body_sampling import BodySampler, add_sampling_arguments
+from cache_audit import CacheAudit
+from compressed_io import open_binary_input, open_input, open_output
+from har_content import DEFAULT_STREAM_THRESHOLD, ContentDecodeError, content_hash, decode_content
+from har_filters import EntryFilter, add_filter_arguments
+from har_stream import iter_har_entries
+from ndjson_stream import add_ndjson_arguments, stream_records
+from value_profile import DEFAULT_ENUM_THRESHOLD, DEFAULT_RESERVOIR_SIZE, ParameterProfile, ValueProfiler
+
+# Body cache sentinel: None is a valid cached value (body is not JSON)
+_MISSING = object()
 
 
 class HARToOpenAPIConverter:
     """Convert HAR files to OpenAPI 3.0 specifications."""
 
-    def __init__(self, har_file: str):
+    def __init__(
+        self,
+        har_file: str,
+        threaded_decompression: bool = False,
+        body_stream_threshold: int = DEFAULT_STREAM_THRESHOLD,
+        body_cache: Optional[MutableMapping[str, Optional[Dict[str, Any]]]] = None,
+        entry_filter: Optional[EntryFilter] = None,
+        streaming: bool = False,
+        value_profiler: Optional[ValueProfiler] = None,
+        cache_audit: Optional[CacheAudit] = None,
+        body_sampler: Optional[BodySampler] = None,
+    ):
         """
         Initialize converter with HAR file.
 
         Args:
-            har_file: Path to HAR file
+            har_file: Path to HAR file (optionally gzip/zstd/brotli compressed)
+            threaded_decompression: Decompress input on a background thread
+            body_stream_threshold: Encoded body size above which bodies are
+                decoded in chunks
+            body_cache: Body schema cache keyed by content hash; may be shared
+                between converters
+            entry_filter: Filter applied to entries before anything is decoded
+            streaming: Stream entries from the file instead of loading it whole
+            value_profiler: Profile body values into schema keywords (enum,
+                format, minimum/maximum, ...)
+            cache_audit: Audit caching/compression headers and refetches;
+                adds x-caching hints to the spec
+            body_sampler: Process only a sample of the bodies per endpoint and
+                status; adds x-sampling coverage to the spec
         """
         self.har_file = har_file
+        self.threaded_decompression = threaded_decompression
+        self.body_stream_threshold = body_stream_threshold
+        self.body_cache: MutableMapping[str, Optional[Dict[str, Any]]] = {} if body_cache is None else body_cache
+        self.entry_filter = entry_filter or EntryFilter()
+        self.streaming = streaming
+        self.value_profiler = value_profiler
+        self.cache_audit = cache_audit
+        self.body_sampler = body_sampler
+        # (scope, body hash) pairs already fed to the value profiler
+        self._profiled: Set[Tuple[Tuple[str, str], str]] = set()
+        # Seeded so sampled query parameter examples are reproducible
+        self.rng = random.Random(0)
         self.har_data: Dict[str, Any] = {}
         self.endpoints: Dict[str, Dict[str, Any]] = {}
         self.servers: List[str] = []
@@ -36,88 +90,221 @@ class HARToOpenAPIConverter:
     def load_har(self) -> None:
         """Load and parse HAR file."""
         try:
-            with open(self.har_file, 'r', encoding='utf-8') as f:
+            with open_input(self.har_file, threaded=self.threaded_decompression) as f:
                 self.har_data = json.load(f)
         except FileNotFoundError:
             raise FileNotFoundError(f"HAR file not found: {self.har_file}")
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in HAR file: {e}")
 
+    def iter_located_entries(self) -> Iterator[Tuple[int, Optional[int], Optional[int], Dict[str, Any]]]:
+        """
+        Iterate over HAR entries that pass the entry filter, with their location.
+
+        In streaming mode entries are read one by one from the file and
+        checked against the filter on their raw bytes before being decoded.
+
+        Yields:
+            Tuples of (entry index, byte offset, byte length, entry); the
+            index is the entry's position in log.entries before filtering,
+            offset and length locate the entry in the decompressed file and
+            are None when the HAR was loaded whole
+        """
+        if not self.streaming:
+            for index, entry in enumerate(self.har_data.get('log', {}).get('entries', [])):
+                if self.entry_filter.accepts(entry):
+                    yield index, None, None, entry
+            return
+
+        # Called once per raw entry, just before that entry is yielded
+        index = -1
+
+        def raw_filter(raw: bytes) -> bool:
+            nonlocal index
+            index += 1
+            return self.entry_filter.accepts_raw(raw)
+
+        try:
+            with open_binary_input(self.har_file, threaded=self.threaded_decompression) as f:
+                for offset, length, entry in iter_har_entries(f, raw_filter=raw_filter):
+                    if self.entry_filter.accepts(entry, size=length):
+                        yield index, offset, length, entry
+        except FileNotFoundError:
+            raise FileNotFoundError(f"HAR file not found: {self.har_file}")
+
+    def iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over HAR entries that pass the entry filter.
+
+        Yields:
+            HAR entries
+        """
+        for _, _, _, entry in self.iter_located_entries():
+            yield entry
+
     def extract_endpoints(self) -> None:
         """Extract all HTTP endpoints from HAR entries."""
-        entries = self.har_data.get('log', {}).get('entries', [])
+        for entry in self.iter_entries():
+            self.add_entry(entry)
 
-        for entry in entries:
-            request = entry.get('request', {})
-            response = entry.get('response', {})
+    def add_entry(self, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Add one HAR entry to the endpoint index.
 
-            method = request.get('method', 'GET').upper()
-            url = request.get('url', '')
+        Args:
+            entry: HAR entry (already accepted by the entry filter)
 
-            if not url:
-                continue
+        Returns:
+            Endpoint key ("METHOD:/path/{param}") or None if the entry has no URL
+        """
+        request = entry.get('request', {})
+        response = entry.get('response', {})
 
-            # Parse URL
-            parsed_url = urlparse(url)
-            base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-
-            # Track servers
-            if base_url not in self.servers:
-                self.servers.append(base_url)
-
-            # Extract path pattern
-            path = parsed_url.path or '/'
-            path_pattern, path_params = self._extract_path_pattern(path)
-
-            # Create endpoint key
-            endpoint_key = f"{method}:{path_pattern}"
-
-            # Initialize endpoint if not exists
-            if endpoint_key not in self.endpoints:
-                self.endpoints[endpoint_key] = {
-                    'method': method,
-                    'path': path_pattern,
-                    'path_params': path_params,
-                    'query_params': {},
-                    'headers': {},
-                    'request_bodies': [],
-                    'responses': {},
-                }
+        method = request.get('method', 'GET').upper()
+        url = request.get('url', '')
 
-            # Extract query parameters
-            query_params = parse_qs(parsed_url.query)
-            for param, values in query_params.items():
-                if param not in self.endpoints[endpoint_key]['query_params']:
-                    self.endpoints[endpoint_key]['query_params'][param] = {
-                        'type': 'string',
-                        'examples': []
-                    }
-                if values:
-                    self.endpoints[endpoint_key]['query_params'][param]['examples'].extend(values[:3])
-
-            # Extract request headers
-            for header in request.get('headers', []):
-                header_name = header.get('name', '')
-                if header_name.lower() not in ['cookie', 'authorization', 'user-agent']:
-                    continue
-                if header_name not in self.endpoints[endpoint_key]['headers']:
-                    self.endpoints[endpoint_key]['headers'][header_name] = {'type': 'string'}
-
-            # Extract request body
-            request_body = self._extract_body(request)
+        if not url:
+            return None
+
+        # Parse URL
+        parsed_url = urlparse(url)
+        base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
+
+        # Track servers
+        if base_url not in self.servers:
+            self.servers.append(base_url)
+
+        # Extract path pattern
+        path = parsed_url.path or '/'
+        path_pattern, path_params = self._extract_path_pattern(path)
+
+        # Create endpoint key
+        endpoint_key = f"{method}:{path_pattern}"
+
+        # Initialize endpoint if not exists
+        if endpoint_key not in self.endpoints:
+            self.endpoints[endpoint_key] = {
+                'method': method,
+                'path': path_pattern,
+                'path_params': path_params,
+                'requests': 0,
+                'query_params': {},
+                'headers': {},
+                'request_bodies': [],
+                'responses': {},
+            }
+
+        self.endpoints[endpoint_key]['requests'] += 1
+        if self.cache_audit is not None:
+            self.cache_audit.add(endpoint_key, request, response)
+
+        # Profile query parameters (constant memory per parameter)
+        query_params = parse_qs(parsed_url.query)
+        for param, values in query_params.items():
+            profile = self.endpoints[endpoint_key]['query_params'].get(param)
+            if profile is None:
+                profile = self.endpoints[endpoint_key]['query_params'][param] = ParameterProfile(self.rng)
+            profile.add(values)
+
+        # Extract request headers
+        for header in request.get('headers', []):
+            header_name = header.get('name', '')
+            if header_name.lower() not in ['cookie', 'authorization', 'user-agent']:
+                continue
+            if header_name not in self.endpoints[endpoint_key]['headers']:
+                self.endpoints[endpoint_key]['headers'][header_name] = {'type': 'string'}
+
+        # Extract request body
+        post_data = request.get('postData', {})
+        if not post_data.get('text') or self._sampled((endpoint_key, 'request'), len(post_data['text'])):
+            request_body = self._extract_body(request, scope=(endpoint_key, 'request'))
             if request_body:
                 self.endpoints[endpoint_key]['request_bodies'].append(request_body)
 
-            # Extract response
-            status_code = str(response.get('status', 200))
-            response_body = self._extract_response_body(response)
-            if status_code not in self.endpoints[endpoint_key]['responses']:
-                self.endpoints[endpoint_key]['responses'][status_code] = {
-                    'description': response.get('statusText', 'OK'),
-                    'bodies': []
-                }
-            if response_body:
-                self.endpoints[endpoint_key]['responses'][status_code]['bodies'].append(response_body)
+        # Extract response
+        status_code = str(response.get('status', 200))
+        content = response.get('content', {})
+        size = content.get('size', -1)
+        if not isinstance(size, int) or size < 0:
+            size = len(content.get('text', ''))
+        response_body = None
+        if self._sampled((endpoint_key, status_code), size, entry.get('time')):
+            response_body = self._extract_response_body(response, scope=(endpoint_key, status_code))
+        if status_code not in self.endpoints[endpoint_key]['responses']:
+            self.endpoints[endpoint_key]['responses'][status_code] = {
+                'description': response.get('statusText', 'OK'),
+                'bodies': []
+            }
+        if response_body:
+            self.endpoints[endpoint_key]['responses'][status_code]['bodies'].append(response_body)
+
+        return endpoint_key
+
+    def add_record(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Filter and add one streamed NDJSON record.
+
+        A record is a single HAR entry; a complete HAR document ({"log": ...})
+        is accepted too and all of its entries are added.
+
+        Args:
+            record: HAR entry or HAR document
+
+        Returns:
+            Classification result, or None if the entry was filtered out
+        """
+        if 'log' in record:
+            added = [self.add_record(entry) for entry in record.get('log', {}).get('entries', [])]
+            return {'entries': len(added), 'accepted': sum(1 for result in added if result)}
+
+        if not self.entry_filter.accepts(record):
+            return None
+
+        known_endpoints = len(self.endpoints)
+        endpoint_key = self.add_entry(record)
+        if endpoint_key is None:
+            return None
+
+        endpoint = self.endpoints[endpoint_key]
+        return {
+            'endpoint': f"{endpoint['method']} {endpoint['path']}",
+            'url': record.get('request', {}).get('url', ''),
+            'status': record.get('response', {}).get('status'),
+            'new_endpoint': len(self.endpoints) > known_endpoints,
+        }
+
+    def _sampled(self, scope: Tuple[str, str], size: int, elapsed: Optional[float] = None) -> bool:
+        """
+        Record body metadata and decide whether to process the body.
+
+        Args:
+            scope: Sampling stratum (endpoint key, 'request' or status code)
+            size: Body size in bytes
+            elapsed: Request time in milliseconds
+
+        Returns:
+            True if the body should be decoded (always without a sampler)
+        """
+        if self.body_sampler is None:
+            return True
+        return self.body_sampler.sample(scope, size=size, elapsed=elapsed)
+
+    def endpoint_key(self, entry: Dict[str, Any]) -> Optional[str]:
+        """
+        Get the templated endpoint key of an entry without recording it.
+
+        Args:
+            entry: HAR entry
+
+        Returns:
+            Endpoint key ("METHOD:/path/{param}") or None if the entry has no URL
+        """
+        request = entry.get('request', {})
+        url = request.get('url', '')
+        if not url:
+            return None
+        path_pattern, _ = self._extract_path_pattern(urlparse(url).path or '/')
+        return f"{request.get('method', 'GET').upper()}:{path_pattern}"
 
     def _extract_path_pattern(self, path: str) -> Tuple[str, List[Dict[str, str]]]:
         """
@@ -185,12 +372,13 @@ class HARToOpenAPIConverter:
         uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
         return bool(re.match(uuid_pattern, value, re.IGNORECASE))
 
-    def _extract_body(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _extract_body(self, request: Dict[str, Any], scope: Optional[Tuple[str, str]] = None) -> Optional[Dict[str, Any]]:
         """
         Extract request body schema.
 
         Args:
             request: HAR request object
+            scope: Value profiling scope (endpoint key, 'request')
 
         Returns:
             Body schema or None
@@ -204,14 +392,7 @@ class HARToOpenAPIConverter:
 
         # Handle JSON
         if 'application/json' in mime_type:
-            try:
-                data = json.loads(text)
-                return {
-                    'type': 'application/json',
-                    'schema': self._infer_schema(data)
-                }
-            except json.JSONDecodeError:
-                return None
+            return self._cached_json_body(post_data, scope)
 
         # Handle form data
         if 'application/x-www-form-urlencoded' in mime_type:
@@ -226,12 +407,13 @@ class HARToOpenAPIConverter:
             'schema': {'type': 'string', 'format': 'binary'}
         }
 
-    def _extract_response_body(self, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _extract_response_body(self, response: Dict[str, Any], scope: Optional[Tuple[str, str]] = None) -> Optional[Dict[str, Any]]:
         """
         Extract response body schema.
 
         Args:
             response: HAR response object
+            scope: Value profiling scope (endpoint key, status code)
 
         Returns:
             Body schema or None
@@ -243,16 +425,9 @@ class HARToOpenAPIConverter:
         if not text:
             return None
 
-        # Handle JSON
+        # Handle JSON (possibly base64 encoded and compressed)
         if 'application/json' in mime_type:
-            try:
-                data = json.loads(text)
-                return {
-                    'type': 'application/json',
-                    'schema': self._infer_schema(data)
-                }
-            except json.JSONDecodeError:
-                return None
+            return self._cached_json_body(content, scope)
 
         # Handle text
         if 'text/' in mime_type:
@@ -267,6 +442,49 @@ class HARToOpenAPIConverter:
             'schema': {'type': 'string', 'format': 'binary'}
         }
 
+    def _cached_json_body(self, content: Dict[str, Any], scope: Optional[Tuple[str, str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Decode a JSON body and infer its schema, once per distinct payload.
+
+        Bodies are decoded lazily: the raw content is hashed first and the
+        decode/parse/infer work only happens for payloads not seen before.
+        Value profiling sees each distinct payload once per scope, so a
+        payload shared by two endpoints is profiled under both.
+
+        Args:
+            content: HAR content or postData object
+            scope: Value profiling scope of the body
+
+        Returns:
+            Body schema (a copy the caller may modify) or None if the body
+            is not valid JSON
+        """
+        body_key = content_hash(content)
+        profile = self.value_profiler is not None and scope is not None \
+            and (scope, body_key) not in self._profiled
+        cached = self.body_cache.get(body_key, _MISSING)
+        if cached is not _MISSING and not (cached and profile):
+            return copy.deepcopy(cached) if cached else None
+
+        body: Optional[Dict[str, Any]] = None
+        try:
+            payload = decode_content(content, self.body_stream_threshold)
+            if payload is not None:
+                data = json.loads(payload)
+                body = {
+                    'type': 'application/json',
+                    'schema': self._infer_schema(data)
+                } if cached is _MISSING else cached
+                if profile:
+                    self._profiled.add((scope, body_key))
+                    self.value_profiler.add(scope, data)
+        except (ContentDecodeError, UnicodeDecodeError, json.JSONDecodeError):
+            body = None
+
+        if cached is _MISSING:
+            self.body_cache[body_key] = body
+        return copy.deepcopy(body) if body else None
+
     def _infer_schema(self, data: Any) -> Dict[str, Any]:
         """
         Infer JSON schema from data.
@@ -348,13 +566,16 @@ class HARToOpenAPIConverter:
             if endpoint['query_params']:
                 if 'parameters' not in operation:
                     operation['parameters'] = []
-                for param_name, param_info in endpoint['query_params'].items():
+                for param_name, profile in endpoint['query_params'].items():
                     operation['parameters'].append({
                         'name': param_name,
                         'in': 'query',
-                        'required': False,
-                        'schema': {'type': param_info['type']},
-                        'examples': param_info['examples'][:3] if param_info['examples'] else []
+                        # Present in every request (of more than one) to the endpoint
+                        'required': endpoint['requests'] > 1 and profile.presence == endpoint['requests'],
+                        'schema': profile.schema(),
+                        'examples': profile.examples(),
+                        'x-presence': round(profile.presence / endpoint['requests'], 3),
+                        'x-distinct': profile.distinct,
                     })
 
             # Add request body
@@ -364,7 +585,7 @@ class HARToOpenAPIConverter:
                 operation['requestBody'] = {
                     'content': {
                         body['type']: {
-                            'schema': body['schema']
+                            'schema': self._profiled_schema((endpoint_key, 'request'), body['schema'])
                         }
                     }
                 }
@@ -379,16 +600,45 @@ class HARToOpenAPIConverter:
                     body = response_info['bodies'][0]
                     response_obj['content'] = {
                         body['type']: {
-                            'schema': body['schema']
+                            'schema': self._profiled_schema((endpoint_key, status_code), body['schema'])
                         }
                     }
 
                 operation['responses'][status_code] = response_obj
 
+            if self.cache_audit is not None:
+                caching = self.cache_audit.hints(endpoint_key)
+                if caching:
+                    operation['x-caching'] = caching
+
+            if self.body_sampler is not None:
+                sampling = {}
+                for location in ['request'] + list(endpoint['responses']):
+                    coverage = self.body_sampler.coverage((endpoint_key, location))
+                    if coverage:
+                        sampling[location] = coverage
+                if sampling:
+                    operation['x-sampling'] = sampling
+
             openapi_spec['paths'][path][method] = operation
 
         return openapi_spec
 
+    def _profiled_schema(self, scope: Tuple[str, str], schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Attach profiled value keywords to a body schema.
+
+        Args:
+            scope: Value profiling scope
+            schema: Inferred body schema
+
+        Returns:
+            Annotated copy of the schema, or the schema itself without profiling
+        """
+        if self.value_profiler is None:
+            return schema
+        return self.value_profiler.annotate(scope, schema)
+
     def convert(self) -> Dict[str, Any]:
         """
         Convert HAR to OpenAPI (main method).
@@ -396,7 +646,8 @@ class HARToOpenAPIConverter:
         Returns:
             OpenAPI specification
         """
-        self.load_har()
+        if not self.streaming:
+            self.load_har()
         self.extract_endpoints()
         return self.generate_openapi()
 
@@ -410,10 +661,16 @@ def main() -> None:
 Examples:
   python scripts/har_to_openapi.py input.har.json -o output.yaml
   python scripts/har_to_openapi.py input.har.json -o output.json --format json
+  python scripts/har_to_openapi.py input.har.json.zst -o output.yaml.gz
+  python scripts/har_to_openapi.py input.har.json -o output.yaml --stream --host www.perplexity.ai --path-prefix /rest/
+  python scripts/har_to_openapi.py input.har.json -o output.yaml --profile-values --enum-threshold 10
+  python scripts/har_to_openapi.py input.har.json -o output.yaml --cache-report cache-report.json
+  python scripts/har_to_openapi.py input.har.json -o output.yaml --sample-rate 0.05 --sample-first 20
+  capture-tool | python scripts/har_to_openapi.py - --ndjson --emit both > results.ndjson
         """
     )
-    parser.add_argument('input', help='Input HAR file path')
-    parser.add_argument('-o', '--output', required=True, help='Output file path')
+    parser.add_argument('input', help='Input HAR file path (.gz/.zst/.br detected automatically), "-" for stdin with --ndjson')
+    parser.add_argument('-o', '--output', help='Output file path (.gz/.zst/.br to compress); optional with --ndjson')
     parser.add_argument(
         '-f', '--format',
         choices=['yaml', 'json'],
@@ -425,33 +682,123 @@ Examples:
         action='store_true',
         help='Pretty print JSON output'
     )
+    parser.add_argument(
+        '--decompress-thread',
+        action='store_true',
+        help='Decompress input on a background thread'
+    )
+    parser.add_argument(
+        '--body-stream-threshold',
+        type=int,
+        default=DEFAULT_STREAM_THRESHOLD,
+        help=f'Encoded body size in bytes above which bodies are decoded in chunks (default: {DEFAULT_STREAM_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream entries from the HAR instead of loading the whole file'
+    )
+    parser.add_argument(
+        '--profile-values',
+        action='store_true',
+        help='Profile body values into schema keywords (enum, format, minimum/maximum, example)'
+    )
+    parser.add_argument(
+        '--enum-threshold',
+        type=int,
+        default=DEFAULT_ENUM_THRESHOLD,
+        help=f'Maximum distinct strings proposed as an enum with --profile-values (default: {DEFAULT_ENUM_THRESHOLD})'
+    )
+    parser.add_argument(
+        '--reservoir-size',
+        type=int,
+        default=DEFAULT_RESERVOIR_SIZE,
+        help=f'Example values kept per body field with --profile-values (default: {DEFAULT_RESERVOIR_SIZE})'
+    )
+    parser.add_argument(
+        '--cache-report',
+        metavar='FILE',
+        help='Audit caching/compression per endpoint: write a JSON report ranked by wasted bytes '
+             'and add x-caching hints to the spec'
+    )
+    add_filter_arguments(parser)
+    add_sampling_arguments(parser)
+    add_ndjson_arguments(parser)
 
     args = parser.parse_args()
+    if not args.output and not args.ndjson:
+        parser.error('-o/--output is required unless --ndjson is used')
+
+    # With --ndjson, stdout carries results: report on stderr
+    report = sys.stderr if args.ndjson else sys.stdout
 
     try:
         # Convert HAR to OpenAPI
-        converter = HARToOpenAPIConverter(args.input)
-        openapi_spec = converter.convert()
+        converter = HARToOpenAPIConverter(
+            args.input,
+            threaded_decompression=args.decompress_thread,
+            body_stream_threshold=args.body_stream_threshold,
+            entry_filter=EntryFilter.from_args(args),
+            streaming=args.stream,
+            value_profiler=ValueProfiler(
+                reservoir_size=args.reservoir_size,
+                enum_threshold=args.enum_threshold,
+            ) if args.profile_values else None,
+            cache_audit=CacheAudit() if args.cache_report else None,
+            body_sampler=BodySampler.from_args(args),
+        )
+
+        if args.ndjson:
+            input_stream = sys.stdin.buffer if args.input == '-' else open_binary_input(args.input)
+            with input_stream:
+                stream_stats = stream_records(
+                    process=converter.add_record,
+                    snapshot=lambda: {'spec': converter.generate_openapi()},
+                    input_stream=input_stream,
+                    emit=args.emit,
+                    snapshot_every=args.snapshot_every,
+                    snapshot_interval=args.snapshot_interval,
+                )
+            openapi_spec = converter.generate_openapi()
+        else:
+            openapi_spec = converter.convert()
 
         # Write output
-        with open(args.output, 'w', encoding='utf-8') as f:
-            if args.format == 'yaml':
-                yaml.dump(openapi_spec, f, default_flow_style=False, sort_keys=False)
-            else:
-                if args.pretty:
-                    json.dump(openapi_spec, f, indent=2)
+        if args.output:
+            with open_output(args.output) as f:
+                if args.format == 'yaml':
+                    import yaml
+                    yaml.dump(openapi_spec, f, default_flow_style=False, sort_keys=False)
                 else:
-                    json.dump(openapi_spec, f)
-
-        print(f"✅ Successfully converted HAR to OpenAPI")
-        print(f"   Input: {args.input}")
-        print(f"   Output: {args.output}")
-        print(f"   Endpoints: {len(converter.endpoints)}")
-        print(f"   Servers: {len(converter.servers)}")
+                    if args.pretty:
+                        json.dump(openapi_spec, f, indent=2)
+                    else:
+                        json.dump(openapi_spec, f)
+
+        cache_rows = None
+        if converter.cache_audit is not None:
+            cache_rows = converter.cache_audit.report()
+            with open_output(args.cache_report) as f:
+                json.dump(cache_rows, f, indent=2)
+
+        print(f"✅ Successfully converted HAR to OpenAPI", file=report)
+        print(f"   Input: {args.input}", file=report)
+        print(f"   Output: {args.output or 'stdout (ndjson)'}", file=report)
+        if args.ndjson:
+            print(f"   Records: {stream_stats['records']} ({stream_stats['errors']} errors)", file=report)
+        print(f"   Endpoints: {len(converter.endpoints)}", file=report)
+        print(f"   Servers: {len(converter.servers)}", file=report)
+        if cache_rows is not None:
+            print(f"   Cache report: {args.cache_report} ({sum(row['redundant_requests'] for row in cache_rows)} redundant "
+                  f"requests, {sum(row['wasted_bytes'] for row in cache_rows)} wasted bytes)", file=report)
+        if converter.body_sampler is not None:
+            totals = converter.body_sampler.totals()
+            print(f"   Sampled bodies: {totals['sampled']}/{totals['seen']}", file=report)
+        for line in converter.entry_filter.summary_lines():
+            print(f"   {line}", file=report)
 
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import sys
+        print(f"❌ Error: {e}", file=report)
         sys.exit(1)
 
 
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+HAR Mock Server
+
+Serves recorded responses from a HAR capture on a local asyncio HTTP server,
+for offline testing and load testing of API clients. Requests are matched by
+method and templated path, using the same path normalization as the OpenAPI
+converter (/rest/thread/123 -> /rest/thread/{id}); the recorded responses of
+an endpoint are served round-robin.
+
+Response bodies are decoded once, deduplicated, and preloaded into one
+memory-mapped buffer; responses are sent as slices of that buffer with a
+prebuilt header block. Server-sent event streams (text/event-stream) are
+replayed event by event. HARs carry no per-event timestamps, so the events
+are spread over the recorded receive time of the response, scaled by
+--time-scale (0 sends them at once).
+
+The built-in load generator replays the recorded request paths over
+keep-alive connections and reports requests per second and latency quantiles.
+Without --url it starts its own mock server in a separate process, measuring
+the mock server's throughput.
+
+Usage:
+    python scripts/mock_server.py serve capture.har.json --port 8080
+    python scripts/mock_server.py serve capture.har.json --time-scale 0.5
+    python scripts/mock_server.py bench capture.har.json --connections 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import mmap
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from har_content import ContentDecodeError, content_hash, decode_content
+from har_filters import EntryFilter, add_filter_arguments
+from har_to_openapi import HARToOpenAPIConverter
+
+# Response headers not replayed: bodies are served decoded with our own framing
+SKIPPED_HEADERS = frozenset({
+    'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'keep-alive',
+})
+
+SSE_MIME_TYPE = 'text/event-stream'
+
+_BAD_REQUEST_BODY = b'{"error": "malformed request body framing"}'
+_BAD_REQUEST = (
+    b'HTTP/1.1 400 Bad Request\r\nContent-Type: application/json\r\n'
+    + f"Content-Length: {len(_BAD_REQUEST_BODY)}\r\n".encode()
+    + b'Connection: close\r\n\r\n'
+    + _BAD_REQUEST_BODY
+)
+
+
+class RecordedResponse:
+    """A recorded response ready to be sent from the body buffer."""
+
+    __slots__ = ('status', 'head', 'body', 'events', 'event_delay')
+
+    def __init__(self, status: int, head: bytes, body: Tuple[int, int],
+                 events: Optional[List[Tuple[int, int]]] = None, event_delay: float = 0.0):
+        """
+        Initialize response.
+
+        Args:
+            status: HTTP status
+            head: Status line and headers without the framing headers
+            body: (offset, length) of the body in the body buffer
+            events: (offset, length) of each SSE event, for event streams
+            event_delay: Seconds between SSE events at time scale 1
+        """
+        self.status = status
+        self.head = head
+        self.body = body
+        self.events = events
+        self.event_delay = event_delay
+
+
+class MockServer:
+    """Replay recorded HAR responses over HTTP/1.1."""
+
+    def __init__(self, har_file: str, time_scale: float = 1.0, entry_filter: Optional[EntryFilter] = None):
+        """
+        Initialize server.
+
+        Args:
+            har_file: Path to HAR file (optionally compressed)
+            time_scale: Multiplier for recorded SSE timing (0 disables delays)
+            entry_filter: Filter applied to entries before loading
+        """
+        self.time_scale = time_scale
+        self.converter = HARToOpenAPIConverter(har_file, entry_filter=entry_filter, streaming=True)
+        self.routes: Dict[str, List[RecordedResponse]] = {}
+        self.targets: List[Tuple[str, str]] = []
+        self.buffer: Any = b''
+        self.view = memoryview(self.buffer)
+        self.stats = {'requests': 0, 'matched': 0, 'unmatched': 0}
+        self._cursor: Dict[str, int] = {}
+
+    def load(self) -> None:
+        """Index recorded responses and preload their bodies into a memory-mapped buffer."""
+        offsets: Dict[str, Tuple[int, int]] = {}
+        with tempfile.TemporaryFile() as spool:
+            position = 0
+            for entry in self.converter.iter_entries():
+                endpoint_key = self.converter.endpoint_key(entry)
+                if endpoint_key is None:
+                    continue
+                request = entry.get('request', {})
+                response = entry.get('response', {})
+                content = response.get('content', {})
+
+                body_key = content_hash(content)
+                if body_key not in offsets:
+                    body = self._decode_body(content)
+                    spool.write(body)
+                    offsets[body_key] = (position, len(body))
+                    position += len(body)
+
+                self.routes.setdefault(endpoint_key, []).append(
+                    self._prepare(entry, response, offsets[body_key], content)
+                )
+                parts = urlsplit(request.get('url', ''))
+                target = parts.path + (f"?{parts.query}" if parts.query else '')
+                self.targets.append((request.get('method', 'GET').upper(), target or '/'))
+
+            spool.flush()
+            if position:
+                self.buffer = mmap.mmap(spool.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.view = memoryview(self.buffer)
+        if isinstance(self.buffer, mmap.mmap):
+            self._event_offsets()
+
+    @staticmethod
+    def _decode_body(content: Dict[str, Any]) -> bytes:
+        """Decode a recorded body to the bytes a client would see."""
+        try:
+            payload = decode_content(content)
+        except ContentDecodeError:
+            return b''
+        if payload is None:
+            return b''
+        return payload.encode('utf-8') if isinstance(payload, str) else payload
+
+    def _prepare(self, entry: Dict[str, Any], response: Dict[str, Any], body: Tuple[int, int],
+                 content: Dict[str, Any]) -> RecordedResponse:
+        """Prebuild the header block of a recorded response."""
+        status = response.get('status') or 200
+        try:
+            reason = response.get('statusText') or HTTPStatus(status).phrase
+        except ValueError:
+            reason = 'Unknown'
+
+        lines = [f"HTTP/1.1 {status} {reason}"]
+        for header in response.get('headers', []):
+            name = header.get('name', '')
+            if not name or name.startswith(':') or name.lower() in SKIPPED_HEADERS:
+                continue
+            lines.append(f"{name}: {header.get('value', '')}")
+        head = ('\r\n'.join(lines) + '\r\n').encode('latin-1', 'replace')
+
+        recorded = RecordedResponse(status, head, body)
+        if content.get('mimeType', '').startswith(SSE_MIME_TYPE):
+            # Event boundaries are resolved once the buffer is mapped
+            recorded.events = []
+            receive_ms = entry.get('timings', {}).get('receive', 0)
+            recorded.event_delay = max(receive_ms, 0) / 1000.0
+        return recorded
+
+    def _event_offsets(self) -> None:
+        """Split SSE bodies into events and turn receive time into per-event delays."""
+        for responses in self.routes.values():
+            for response in responses:
+                if response.events is None:
+                    continue
+                offset, length = response.body
+                end = offset + length
+                start = offset
+                while start < end:
+                    boundary = self.buffer.find(b'\n\n', start, end)
+                    stop = end if boundary < 0 else boundary + 2
+                    response.events.append((start, stop - start))
+                    start = stop
+                if response.events:
+                    response.event_delay /= len(response.events)
+
+    def match(self, method: str, path: str) -> Optional[RecordedResponse]:
+        """
+        Find the next recorded response for a request.
+
+        Args:
+            method: HTTP method
+            path: Request path without query string
+
+        Returns:
+            Recorded response or None
+        """
+        path_pattern, _ = self.converter._extract_path_pattern(path or '/')
+        endpoint_key = f"{method.upper()}:{path_pattern}"
+        responses = self.routes.get(endpoint_key)
+        if not responses:
+            return None
+        cursor = self._cursor.get(endpoint_key, 0)
+        self._cursor[endpoint_key] = cursor + 1
+        return responses[cursor % len(responses)]
+
+    @staticmethod
+    async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> None:
+        """
+        Consume a request body framed by Content-Length or chunked encoding.
+
+        Raises:
+            ValueError: If the length or a chunk size is malformed
+        """
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            while True:
+                size_line = await reader.readuntil(b'\r\n')
+                size = int(size_line.split(b';', 1)[0].strip(), 16)
+                if size < 0:
+                    raise ValueError(f"Invalid chunk size: {size_line!r}")
+                if not size:
+                    # Skip trailer fields up to the terminating empty line
+                    while await reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    return
+                await reader.readexactly(size + 2)
+
+        value = headers.get('content-length', '0') or '0'
+        if not value.isdigit():
+            raise ValueError(f"Invalid Content-Length: {value!r}")
+        length = int(value)
+        if length:
+            await reader.readexactly(length)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests on one connection."""
+        view = self.view
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(':')
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+                try:
+                    await self._read_body(reader, headers)
+                except ValueError:
+                    # Malformed framing: the rest of the stream cannot be parsed
+                    writer.write(_BAD_REQUEST)
+                    await writer.drain()
+                    break
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                self.stats['requests'] += 1
+                response = self.match(method, urlsplit(target).path)
+
+                if response is None:
+                    self.stats['unmatched'] += 1
+                    body = f'{{"error": "no recorded response for {method} {urlsplit(target).path}"}}'.encode()
+                    writer.write(
+                        b'HTTP/1.1 404 Not Found\r\nContent-Type: application/json\r\n'
+                        + f"Content-Length: {len(body)}\r\n".encode()
+                        + (b'\r\n' if keep_alive else b'Connection: close\r\n\r\n')
+                        + body
+                    )
+                elif response.events is not None:
+                    # Event streams end with the connection
+                    self.stats['matched'] += 1
+                    writer.write(response.head + b'Connection: close\r\n\r\n')
+                    delay = response.event_delay * self.time_scale
+                    for offset, event_length in response.events:
+                        if delay:
+                            await asyncio.sleep(delay)
+                        writer.write(view[offset:offset + event_length])
+                        await writer.drain()
+                    break
+                else:
+                    self.stats['matched'] += 1
+                    offset, body_length = response.body
+                    writer.write(
+                        response.head
+                        + f"Content-Length: {body_length}\r\n".encode()
+                        + (b'\r\n' if keep_alive else b'Connection: close\r\n\r\n')
+                    )
+                    if body_length:
+                        writer.write(view[offset:offset + body_length])
+
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        """
+        Serve until SIGINT/SIGTERM.
+
+        Args:
+            host: Bind address
+            port: Port (0 picks a free one)
+        """
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        bound_port = server.sockets[0].getsockname()[1]
+        # First stdout line is read by `bench` to find the port
+        print(f"✅ Mock server listening on http://{host}:{bound_port}", flush=True)
+        print(f"   Endpoints: {len(self.routes)}, responses: {sum(map(len, self.routes.values()))}, "
+              f"body buffer: {len(self.buffer)} bytes", flush=True)
+
+        loop = asyncio.get_running_loop()
+        stop = loop.create_future()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+        async with server:
+            await stop
+        print(f"   Served: {self.stats['requests']} requests "
+              f"({self.stats['matched']} matched, {self.stats['unmatched']} unmatched)", flush=True)
+
+
+async def _load_worker(host: str, port: int, targets: List[Tuple[str, str]], start_index: int,
+                       deadline: float, budget: Dict[str, int], latencies: array,
+                       counters: Dict[str, int]) -> None:
+    """Send requests over one keep-alive connection until the deadline or request budget."""
+    reader: Optional[asyncio.StreamReader] = None
+    writer: Optional[asyncio.StreamWriter] = None
+    index = start_index
+    try:
+        while time.perf_counter() < deadline and budget['remaining'] > 0:
+            budget['remaining'] -= 1
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+
+            method, target = targets[index % len(targets)]
+            index += 1
+            request = f"{method} {target} HTTP/1.1\r\nHost: {host}\r\nContent-Length: 0\r\n\r\n".encode('latin-1')
+
+            started = time.perf_counter()
+            try:
+                writer.write(request)
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = None
+                close = False
+                for line in head.split(b'\r\n')[1:]:
+                    name, _, value = line.partition(b':')
+                    name = name.strip().lower()
+                    if name == b'content-length':
+                        length = int(value)
+                    elif name == b'connection' and value.strip().lower() == b'close':
+                        close = True
+                if length is None:
+                    await reader.read()
+                    close = True
+                elif length:
+                    await reader.readexactly(length)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                counters['errors'] += 1
+                writer.close()
+                writer = None
+                continue
+
+            latencies.append(time.perf_counter() - started)
+            status = int(head.split(b' ', 2)[1])
+            counters['2xx' if 200 <= status < 300 else 'other'] += 1
+            if close:
+                writer.close()
+                writer = None
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+async def run_load(host: str, port: int, targets: List[Tuple[str, str]], connections: int = 16,
+                   duration: float = 10.0, requests: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Generate load against a server and measure throughput and latency.
+
+    Args:
+        host: Server host
+        port: Server port
+        targets: (method, path with query) pairs replayed in order
+        connections: Concurrent keep-alive connections
+        duration: Maximum run time in seconds
+        requests: Stop after this many requests
+
+    Returns:
+        Requests, errors, requests per second and latency quantiles in ms
+    """
+    latencies = array('d')
+    counters = {'2xx': 0, 'other': 0, 'errors': 0}
+    budget = {'remaining': requests if requests else sys.maxsize}
+    started = time.perf_counter()
+    deadline = started + duration
+    step = max(len(targets) // connections, 1)
+    await asyncio.gather(*(
+        _load_worker(host, port, targets, worker * step, deadline, budget, latencies, counters)
+        for worker in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+
+    def quantile(q: float) -> float:
+        return round(ordered[min(int(q * len(ordered)), len(ordered) - 1)] * 1000, 3) if ordered else 0.0
+
+    return {
+        'requests': len(ordered),
+        'responses_2xx': counters['2xx'],
+        'responses_other': counters['other'],
+        'errors': counters['errors'],
+        'elapsed': round(elapsed, 3),
+        'rps': round(len(ordered) / elapsed, 1) if elapsed > 0 else 0.0,
+        'latency_ms': {
+            'p50': quantile(0.50),
+            'p90': quantile(0.90),
+            'p99': quantile(0.99),
+            'max': round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+    }
+
+
+def _start_server_process(args: argparse.Namespace) -> Tuple[subprocess.Popen, int]:
+    """Start `serve` in a child process on a free port and wait until it listens."""
+    command = [sys.executable, os.path.abspath(__file__), 'serve', args.input,
+               '--bind', '127.0.0.1', '--port', '0', '--time-scale', str(args.time_scale)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if 'listening on' not in line:
+        process.kill()
+        raise RuntimeError(f"Mock server failed to start: {line.strip()}")
+    return process, int(line.rsplit(':', 1)[1])
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Serve recorded HAR responses and load-test against them',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/mock_server.py serve capture.har.json --port 8080
+  python scripts/mock_server.py serve capture.har.json --time-scale 0 --path-prefix /rest/
+  python scripts/mock_server.py bench capture.har.json --connections 32 --duration 10
+  python scripts/mock_server.py bench capture.har.json --url http://127.0.0.1:8080 --requests 100000
+        """
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='Serve recorded responses')
+    bench_parser = subparsers.add_parser('bench', help='Load-test a mock server with the recorded requests')
+    for sub in (serve_parser, bench_parser):
+        sub.add_argument('input', help='Input HAR file path (.gz/.zst/.br detected automatically)')
+        sub.add_argument('--time-scale', type=float, default=1.0,
+                         help='Multiplier for recorded SSE event timing, 0 for no delay (default: 1.0)')
+    serve_parser.add_argument('--bind', default='127.0.0.1', help='Bind address (default: 127.0.0.1)')
+    serve_parser.add_argument('--port', type=int, default=8080, help='Port, 0 for any free port (default: 8080)')
+    add_filter_arguments(serve_parser)
+
+    bench_parser.add_argument('--url', help='Target server (default: start a mock server for the HAR)')
+    bench_parser.add_argument('-c', '--connections', type=int, default=16,
+                              help='Concurrent keep-alive connections (default: 16)')
+    bench_parser.add_argument('-d', '--duration', type=float, default=10.0,
+                              help='Maximum duration in seconds (default: 10)')
+    bench_parser.add_argument('-n', '--requests', type=int, help='Stop after this many requests')
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'serve':
+            server = MockServer(args.input, time_scale=args.time_scale, entry_filter=EntryFilter.from_args(args))
+            server.load()
+            asyncio.run(server.serve(args.bind, args.port))
+            return
+
+        # Only the request targets are needed on the client side
+        converter = HARToOpenAPIConverter(args.input, streaming=True)
+        targets = []
+        for entry in converter.iter_entries():
+            parts = urlsplit(entry.get('request', {}).get('url', ''))
+            if parts.path:
+                targets.append((entry['request'].get('method', 'GET').upper(),
+                                parts.path + (f"?{parts.query}" if parts.query else '')))
+        if not targets:
+            raise ValueError("No requests recorded in HAR file")
+
+        process = None
+        if args.url:
+            parts = urlsplit(args.url)
+            host, port = parts.hostname or '127.0.0.1', parts.port or 80
+        else:
+            process, port = _start_server_process(args)
+            host = '127.0.0.1'
+
+        try:
+            result = asyncio.run(run_load(host, port, targets, args.connections, args.duration, args.requests))
+        finally:
+            if process is not None:
+                process.send_signal(signal.SIGTERM)
+                process.wait(timeout=10)
+
+        latency = result['latency_ms']
+        print(f"✅ Load test finished against {host}:{port}")
+        print(f"   Requests: {result['requests']} in {result['elapsed']}s "
+              f"({result['responses_2xx']} 2xx, {result['responses_other']} other, {result['errors']} errors)")
+        print(f"   Throughput: {result['rps']} req/s over {args.connections} connections")
+        print(f"   Latency: p50 {latency['p50']} ms, p90 {latency['p90']} ms, "
+              f"p99 {latency['p99']} ms, max {latency['max']} ms")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+NDJSON Streaming Driver
+
+Runs an extractor incrementally over newline-delimited JSON records (HAR
+entries or WebSocket frames) arriving on stdin, and writes per-record results
+and periodic spec snapshots as NDJSON to stdout. Capture tools can pipe into
+the extractors directly, with no intermediate files.
+
+Output lines:
+    {"type": "record", "seq": 1, ...}                      per-record result
+    {"type": "snapshot", "records": 1000, "final": false, ...}
+    {"type": "error", "error": "Invalid JSON on line 7: ..."}
+
+Usage:
+    from ndjson_stream import add_ndjson_arguments, stream_records
+
+    stats = stream_records(process=extractor.add_entry, snapshot=snapshot, emit='both')
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, TextIO
+
+EMIT_CHOICES = ('snapshots', 'records', 'both')
+
+# Yielded by _iter_timed when no record arrived before the timeout
+_IDLE = object()
+
+
+def iter_ndjson(stream: BinaryIO, sizes: bool = False) -> Iterator[Any]:
+    """
+    Decode NDJSON lines as they arrive.
+
+    Malformed lines are yielded as `ValueError` instances so the caller can
+    report them without stopping the stream.
+
+    Args:
+        stream: Binary input stream
+        sizes: Yield (record, line length in bytes) pairs instead of records
+
+    Yields:
+        Decoded records (or pairs) or ValueError for malformed lines
+    """
+    for line_num, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield ValueError(f"Invalid JSON on line {line_num}: {e}")
+            continue
+        yield (record, len(line)) if sizes else record
+
+
+def _iter_timed(records: Iterator[Any], timeout: Callable[[], Optional[float]]) -> Iterator[Any]:
+    """
+    Read records on a background thread so the consumer can wake up between them.
+
+    Args:
+        records: Record iterator (read on the background thread)
+        timeout: Returns seconds to wait for the next record, or None to block
+
+    Yields:
+        Records, or _IDLE when none arrived within the timeout
+    """
+    pending: queue.Queue = queue.Queue(maxsize=1024)
+    done = object()
+    failure: list = []
+
+    def pump() -> None:
+        try:
+            for record in records:
+                pending.put(record)
+        except BaseException as e:
+            failure.append(e)
+        finally:
+            pending.put(done)
+
+    threading.Thread(target=pump, name='ndjson-reader', daemon=True).start()
+    while True:
+        wait = timeout()
+        try:
+            record = pending.get(timeout=None if wait is None else max(wait, 0.0))
+        except queue.Empty:
+            yield _IDLE
+            continue
+        if record is done:
+            break
+        yield record
+    if failure:
+        raise failure[0]
+
+
+def stream_records(
+    process: Callable[..., Optional[Dict[str, Any]]],
+    snapshot: Callable[[], Dict[str, Any]],
+    input_stream: Optional[BinaryIO] = None,
+    output_stream: Optional[TextIO] = None,
+    emit: str = 'snapshots',
+    snapshot_every: int = 1000,
+    snapshot_interval: Optional[float] = None,
+    record_sizes: bool = False,
+) -> Dict[str, int]:
+    """
+    Feed NDJSON records to an extractor and stream results.
+
+    Args:
+        process: Called with each decoded record; returns a per-record result
+            (or None when the record was skipped)
+        snapshot: Builds the current snapshot payload
+        input_stream: Binary input (default: stdin)
+        output_stream: Text output (default: stdout)
+        emit: 'snapshots', 'records' or 'both'
+        snapshot_every: Emit a snapshot every N records (0 disables)
+        snapshot_interval: Also emit a snapshot when this many seconds passed
+            since the previous one and records arrived since; checked on a
+            timer, so a snapshot follows the last records even if input stalls
+        record_sizes: Call process(record, size) with the length in bytes of
+            the record's input line
+
+    Returns:
+        Counters: records, results, errors, snapshots
+    """
+    input_stream = input_stream or sys.stdin.buffer
+    output_stream = output_stream or sys.stdout
+    emit_records = emit in ('records', 'both')
+    emit_snapshots = emit in ('snapshots', 'both')
+    stats = {'records': 0, 'results': 0, 'errors': 0, 'snapshots': 0}
+    last_snapshot = time.monotonic()
+    snapshot_records = 0
+
+    def write(obj: Dict[str, Any]) -> None:
+        output_stream.write(json.dumps(obj, default=str) + '\n')
+        output_stream.flush()
+
+    def write_snapshot(final: bool) -> None:
+        nonlocal last_snapshot, snapshot_records
+        write({'type': 'snapshot', 'records': stats['records'], 'final': final, **snapshot()})
+        stats['snapshots'] += 1
+        last_snapshot = time.monotonic()
+        snapshot_records = stats['records']
+
+    def snapshot_due() -> Optional[float]:
+        # Sleep until the interval elapses, but only while unreported records are pending
+        if stats['records'] == snapshot_records:
+            return None
+        return snapshot_interval - (time.monotonic() - last_snapshot)
+
+    records: Iterator[Any] = iter_ndjson(input_stream, sizes=record_sizes)
+    if emit_snapshots and snapshot_interval:
+        records = _iter_timed(records, snapshot_due)
+
+    for record in records:
+        if record is _IDLE:
+            if stats['records'] != snapshot_records and time.monotonic() - last_snapshot >= snapshot_interval:
+                write_snapshot(final=False)
+            continue
+
+        if isinstance(record, ValueError):
+            stats['errors'] += 1
+            write({'type': 'error', 'error': str(record)})
+            continue
+
+        stats['records'] += 1
+        try:
+            result = process(*record) if record_sizes else process(record)
+        except Exception as e:
+            stats['errors'] += 1
+            write({'type': 'error', 'seq': stats['records'], 'error': str(e)})
+            continue
+
+        if result is not None:
+            stats['results'] += 1
+            if emit_records:
+                write({'type': 'record', 'seq': stats['records'], **result})
+
+        if emit_snapshots and (
+            (snapshot_every and stats['records'] % snapshot_every == 0)
+            or (snapshot_interval and time.monotonic() - last_snapshot >= snapshot_interval)
+        ):
+            write_snapshot(final=False)
+
+    if emit_snapshots:
+        write_snapshot(final=True)
+
+    return stats
+
+
+def add_ndjson_arguments(parser: argparse.ArgumentParser, default_emit: str = 'snapshots') -> None:
+    """
+    Add NDJSON streaming options to a CLI parser.
+
+    Args:
+        parser: Argument parser
+        default_emit: Default for --emit
+    """
+    group = parser.add_argument_group(
+        'ndjson streaming',
+        'Read one record per line from stdin (input "-") and stream results to stdout'
+    )
+    group.add_argument('--ndjson', action='store_true',
+                       help='Enable NDJSON stdin/stdout streaming mode')
+    group.add_argument('--emit', choices=EMIT_CHOICES, default=default_emit,
+                       help=f'What to write to stdout (default: {default_emit})')
+    group.add_argument('--snapshot-every', type=int, default=1000, metavar='N',
+                       help='Emit a snapshot every N records, 0 to disable (default: 1000)')
+    group.add_argument('--snapshot-interval', type=float, metavar='SECONDS',
+                       help='Also emit a snapshot at least this often while new records are pending')
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+pplx-analyze
+
+Single entry point for the capture analysis tools. Each subcommand is the
+`main()` of one script, imported only when that subcommand runs, so
+`pplx-analyze --help` and small jobs do not pay for unrelated imports.
+Heavy dependencies (yaml, genson, jsonschema, numpy) are imported by the
+tools on first use.
+
+Usage:
+    pplx-analyze har input.har.json -o openapi.yaml
+    pplx-analyze ws input.ws.jsonl -o asyncapi.yaml
+    pplx-analyze batch captures/ -o specs/
+    pplx-analyze selfcheck --help-budget-ms 150
+"""
+
+import importlib
+import os
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+__version__ = '1.0.0'
+
+# Subcommand -> (module, description); modules are imported on dispatch
+COMMANDS: Dict[str, Tuple[str, str]] = {
+    'har': ('har_to_openapi', 'Convert HAR files to OpenAPI 3.0 specifications'),
+    'ws': ('ws_schema_extractor', 'Extract AsyncAPI specs from WebSocket logs'),
+    'graphql': ('graphql_extractor', 'Extract GraphQL operations from HAR files'),
+    'index': ('har_index', 'Index HAR entries into SQLite'),
+    'diff': ('spec_diff', 'Structural diff between generated specs'),
+    'cache': ('cache_audit', 'Audit HTTP caching and compression per endpoint'),
+    'mock': ('mock_server', 'Serve recorded HAR responses and load-test them'),
+    'validate': ('validate_bodies', 'Validate captured bodies against generated specs'),
+    'batch': ('batch_extract', 'Run the extractors over capture directories'),
+    'daemon': ('extract_daemon', 'Resident extraction daemon on a Unix socket'),
+}
+
+HEAVY_MODULES = ('yaml', 'genson', 'jsonschema', 'numpy', 'zstandard', 'brotli')
+
+# Run inside a fresh interpreter: dispatch `--help` and report heavy imports
+_IMPORT_PROBE = """
+import sys
+import pplx_cli
+sys.argv = ['pplx-analyze', '--help']
+pplx_cli.main()
+for name in pplx_cli.COMMANDS:
+    sys.argv = ['pplx-analyze', name, '--help']
+    try:
+        pplx_cli.main()
+    except SystemExit:
+        pass
+print(','.join(m for m in pplx_cli.HEAVY_MODULES if m in sys.modules), file=sys.stderr)
+"""
+
+# Run a command inside a fresh interpreter and report heavy imports on exit
+_RUN_PROBE = """
+import sys
+import pplx_cli
+try:
+    pplx_cli.main(sys.argv[1:])
+finally:
+    print(','.join(m for m in pplx_cli.HEAVY_MODULES if m in sys.modules), file=sys.stderr)
+"""
+
+_SMALL_HAR = """{"log": {"version": "1.2", "entries": [{
+  "request": {"method": "GET", "url": "https://www.perplexity.ai/rest/thread/1?limit=10&mode=full", "headers": []},
+  "response": {"status": 200, "statusText": "OK", "headers": [],
+               "content": {"mimeType": "application/json", "text": "{\\"id\\": 1, \\"title\\": \\"t\\"}"}}
+}]}}
+"""
+
+
+def print_usage(stream=sys.stdout) -> None:
+    """Print the command overview without importing any tool."""
+    print("usage: pplx-analyze <command> [options]\n", file=stream)
+    print("Capture analysis tools (run `pplx-analyze <command> --help` for options)\n", file=stream)
+    print("commands:", file=stream)
+    for name, (_, description) in COMMANDS.items():
+        print(f"  {name:<10} {description}", file=stream)
+    print(f"  {'selfcheck':<10} Check cold-start time against a budget", file=stream)
+
+
+def _timed_run(argv: List[str], runs: int, env: Dict[str, str]) -> Tuple[float, Any]:
+    """
+    Run a command several times in fresh interpreters.
+
+    Returns:
+        Tuple of (best wall time in ms, last completed process)
+    """
+    import subprocess
+    import time
+
+    best = float('inf')
+    completed = None
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(argv, env=env, capture_output=True, text=True)
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, completed
+
+
+def self_check(help_budget_ms: float, small_budget_ms: float, runs: int = 3) -> bool:
+    """
+    Measure cold starts in fresh interpreters and compare them to budgets.
+
+    Checks that `--help` stays fast and imports no heavy dependency, and that
+    a small HAR with a query string converts within the small-input budget
+    without importing any optional dependency (only yaml, for YAML output).
+
+    Args:
+        help_budget_ms: Budget for `pplx-analyze --help`
+        small_budget_ms: Budget for converting a one-entry HAR
+        runs: Runs per probe; the best time counts
+
+    Returns:
+        True if every probe is within budget
+    """
+    import subprocess
+    import tempfile
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [script_dir, env.get('PYTHONPATH')]))
+    cli = [sys.executable, os.path.abspath(__file__)]
+    ok = True
+
+    elapsed, completed = _timed_run(cli + ['--help'], runs, env)
+    passed = completed.returncode == 0 and elapsed <= help_budget_ms
+    ok &= passed
+    print(f"{'✅' if passed else '❌'} --help: {elapsed:.0f} ms (budget {help_budget_ms:.0f} ms)")
+
+    completed = subprocess.run([sys.executable, '-c', _IMPORT_PROBE], env=env, capture_output=True, text=True)
+    loaded = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else ''
+    passed = completed.returncode == 0 and not loaded
+    ok &= passed
+    print(f"{'✅' if passed else '❌'} Heavy imports during --help: {loaded or 'none'}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        har_path = os.path.join(tmp, 'small.har.json')
+        with open(har_path, 'w') as f:
+            f.write(_SMALL_HAR)
+        for label, argv, allowed in (
+            ('har (json)', ['har', har_path, '-o', os.path.join(tmp, 'openapi.json'), '--format', 'json'], ()),
+            ('har (yaml)', ['har', har_path, '-o', os.path.join(tmp, 'openapi.yaml')], ('yaml',)),
+        ):
+            elapsed, completed = _timed_run([sys.executable, '-c', _RUN_PROBE] + argv, runs, env)
+            stderr = completed.stderr.strip()
+            loaded = [m for m in (stderr.splitlines()[-1] if stderr else '').split(',') if m and m not in allowed]
+            passed = completed.returncode == 0 and elapsed <= small_budget_ms and not loaded
+            ok &= passed
+            print(f"{'✅' if passed else '❌'} {label}, 1 entry: {elapsed:.0f} ms (budget {small_budget_ms:.0f} ms), "
+                  f"heavy imports: {','.join(loaded) or 'none'}")
+            if completed.returncode != 0:
+                print(f"   {completed.stdout.strip()} {stderr}")
+
+    return ok
+
+
+def _self_check_main(argv: List[str]) -> None:
+    """Parse selfcheck options and exit with its result."""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog='pplx-analyze selfcheck',
+        description='Check cold-start time of the CLI against a budget (used in CI)'
+    )
+    parser.add_argument('--help-budget-ms', type=float, default=150.0,
+                        help='Budget for `pplx-analyze --help` (default: 150)')
+    parser.add_argument('--small-budget-ms', type=float, default=400.0,
+                        help='Budget for converting a one-entry HAR (default: 400)')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Runs per probe; the best time counts (default: 3)')
+    args = parser.parse_args(argv)
+
+    if not self_check(args.help_budget_ms, args.small_budget_ms, args.runs):
+        sys.exit(1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """CLI entry point."""
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] in ('-h', '--help'):
+        print_usage()
+        return
+    if argv[0] == '--version':
+        print(f"pplx-analyze {__version__}")
+        return
+
+    command, rest = argv[0], argv[1:]
+    if command == 'selfcheck':
+        _self_check_main(rest)
+        return
+    if command not in COMMANDS:
+        print(f"❌ Error: unknown command '{command}'\n", file=sys.stderr)
+        print_usage(sys.stderr)
+        sys.exit(2)
+
+    module_name = COMMANDS[command][0]
+    module = importlib.import_module(module_name)
+    sys.argv = [f"pplx-analyze {command}"] + rest
+    module.main()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Spec Diff
+
+Structural diff between two generated specifications for API drift detection.
+Supports the OpenAPI output of har_to_openapi.py and the AsyncAPI output of
+ws_schema_extractor.py.
+
+Every operation and schema node is compared by content hash first, so
+identical subtrees are skipped without being walked. Only changed operations
+are descended into, and each change is classified as breaking or non-breaking
+from the point of view of an API client:
+
+    - removed operations, response fields or response statuses are breaking
+    - new required request fields/parameters and type changes are breaking
+    - added operations, response fields and optional inputs are non-breaking
+
+Usage:
+    python scripts/spec_diff.py old/openapi.yaml new/openapi.yaml
+    python scripts/spec_diff.py old/asyncapi.json new/asyncapi.json --format json --fail-on-breaking
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+from compressed_io import open_input
+
+# Prefix of child digests inside a container's hashed items (NUL never occurs in specs)
+_DIGEST_MARK = '\x00#'
+
+_CONTAINERS = (dict, list)
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch', 'trace')
+
+# Request schemas are sent by the client, response schemas received by it
+REQUEST = 'request'
+RESPONSE = 'response'
+
+
+def load_spec(path: str) -> Dict[str, Any]:
+    """
+    Load a JSON or YAML spec (optionally compressed).
+
+    Args:
+        path: Spec file path
+
+    Returns:
+        Spec dictionary
+    """
+    with open_input(path) as f:
+        text = f.read()
+
+    stripped = text.lstrip()
+    if stripped.startswith('{'):
+        return json.loads(text)
+
+    import yaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    return yaml.load(text, Loader=loader)
+
+
+class SpecDiff:
+    """Compare two OpenAPI or AsyncAPI specs operation by operation."""
+
+    def __init__(self, old_spec: Dict[str, Any], new_spec: Dict[str, Any]):
+        """
+        Initialize diff.
+
+        Args:
+            old_spec: Previous spec
+            new_spec: Current spec
+        """
+        self.old_spec = old_spec
+        self.new_spec = new_spec
+        self.changes: List[Dict[str, Any]] = []
+        self.operations_compared = 0
+        self.operations_unchanged = 0
+        self._hashes: Dict[int, str] = {}
+
+    def _digest(self, node: Any) -> str:
+        """
+        Content hash of a container (Merkle style), memoized per node.
+
+        Children are hashed before their parent and every container is hashed
+        once per diff: the digest covers the repr of its items (sorted by key
+        for objects) with each child container replaced by that child's
+        digest. repr keeps scalar types apart (true/1/1.0).
+        """
+        cached = self._hashes.get(id(node))
+        if cached is None:
+            digest = self._digest
+            if type(node) is dict:
+                shallow: Any = sorted(
+                    ((str(name), digest(value) if type(value) in _CONTAINERS else value)
+                     for name, value in node.items()),
+                    key=itemgetter(0),
+                )
+            else:
+                shallow = [digest(value) if type(value) in _CONTAINERS else value for value in node]
+            cached = self._hashes[id(node)] = _DIGEST_MARK + hashlib.blake2b(
+                repr(shallow).encode('utf-8', 'surrogatepass'), digest_size=16
+            ).hexdigest()
+        return cached
+
+    def same(self, old: Any, new: Any) -> bool:
+        """Check two subtrees for equality by their memoized digests."""
+        if old is new:
+            return True
+        if type(old) is not type(new):
+            return False
+        if type(old) in _CONTAINERS:
+            return self._digest(old) == self._digest(new)
+        return old == new
+
+    @staticmethod
+    def operations(spec: Dict[str, Any]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        Index the operations of a spec.
+
+        Args:
+            spec: OpenAPI or AsyncAPI spec
+
+        Returns:
+            Mapping of operation id ("GET /path", "subscribe /channel") to
+            (kind, operation) where kind is 'http' or 'message'
+        """
+        result: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+
+        for path, path_item in (spec.get('paths') or {}).items():
+            for method in HTTP_METHODS:
+                if isinstance(path_item, dict) and method in path_item:
+                    result[f"{method.upper()} {path}"] = ('http', path_item[method])
+
+        for channel, channel_item in (spec.get('channels') or {}).items():
+            for action in ('publish', 'subscribe'):
+                if isinstance(channel_item, dict) and action in channel_item:
+                    result[f"{action} {channel}"] = ('message', channel_item[action])
+
+        return result
+
+    def compare(self) -> List[Dict[str, Any]]:
+        """
+        Compare the specs.
+
+        Returns:
+            List of changes with operation, location, change, breaking and detail
+        """
+        # Hashes are keyed by id(): valid only while both specs are unchanged
+        self._hashes.clear()
+        self.changes = []
+        self.operations_compared = 0
+        self.operations_unchanged = 0
+        if self.same(self.old_spec.get('paths'), self.new_spec.get('paths')) and \
+                self.same(self.old_spec.get('channels'), self.new_spec.get('channels')):
+            self.operations_compared = self.operations_unchanged = len(self.operations(self.new_spec))
+            return self.changes
+
+        old_ops = self.operations(self.old_spec)
+        new_ops = self.operations(self.new_spec)
+
+        for op_id, (_, old_op) in old_ops.items():
+            if op_id not in new_ops:
+                self._record(op_id, '', 'removed', True, 'operation removed')
+
+        for op_id, (kind, new_op) in new_ops.items():
+            if op_id not in old_ops:
+                self._record(op_id, '', 'added', False, 'operation added')
+                continue
+
+            self.operations_compared += 1
+            old_op = old_ops[op_id][1]
+            if self.same(old_op, new_op):
+                self.operations_unchanged += 1
+                continue
+
+            if kind == 'http':
+                self._diff_http_operation(op_id, old_op, new_op)
+            else:
+                direction = REQUEST if op_id.startswith('publish') else RESPONSE
+                self._diff_schema(op_id, 'payload',
+                                  (old_op.get('message') or {}).get('payload') or {},
+                                  (new_op.get('message') or {}).get('payload') or {},
+                                  direction)
+
+        return self.changes
+
+    def _record(self, operation: str, location: str, change: str, breaking: bool, detail: str) -> None:
+        """Append one change."""
+        self.changes.append({
+            'operation': operation,
+            'location': location,
+            'change': change,
+            'breaking': breaking,
+            'detail': detail,
+        })
+
+    def _diff_http_operation(self, op_id: str, old_op: Dict[str, Any], new_op: Dict[str, Any]) -> None:
+        """Diff parameters, request body and responses of an HTTP operation."""
+        if not self.same(old_op.get('parameters'), new_op.get('parameters')):
+            self._diff_parameters(op_id, old_op.get('parameters') or [], new_op.get('parameters') or [])
+
+        old_body = (old_op.get('requestBody') or {}).get('content') or {}
+        new_body = (new_op.get('requestBody') or {}).get('content') or {}
+        if not self.same(old_body, new_body):
+            self._diff_content(op_id, 'requestBody', old_body, new_body, REQUEST)
+
+        old_responses = old_op.get('responses') or {}
+        new_responses = new_op.get('responses') or {}
+        if self.same(old_responses, new_responses):
+            return
+
+        for status in old_responses:
+            if status not in new_responses:
+                self._record(op_id, f"responses/{status}", 'removed', True, 'response status removed')
+        for status, new_response in new_responses.items():
+            if status not in old_responses:
+                self._record(op_id, f"responses/{status}", 'added', False, 'response status added')
+                continue
+            old_response = old_responses[status]
+            if not self.same(old_response, new_response):
+                self._diff_content(op_id, f"responses/{status}",
+                                   old_response.get('content') or {}, new_response.get('content') or {},
+                                   RESPONSE)
+
+    def _diff_parameters(self, op_id: str, old_params: List[Dict[str, Any]], new_params: List[Dict[str, Any]]) -> None:
+        """Diff operation parameters keyed by (in, name)."""
+        old_by_key = {(p.get('in'), p.get('name')): p for p in old_params}
+        new_by_key = {(p.get('in'), p.get('name')): p for p in new_params}
+
+        for key, old_param in old_by_key.items():
+            if key not in new_by_key:
+                self._record(op_id, f"parameters/{key[0]}/{key[1]}", 'removed', False, 'parameter removed')
+
+        for key, new_param in new_by_key.items():
+            location = f"parameters/{key[0]}/{key[1]}"
+            old_param = old_by_key.get(key)
+            if old_param is None:
+                required = bool(new_param.get('required'))
+                self._record(op_id, location, 'added', required,
+                             'required parameter added' if required else 'optional parameter added')
+                continue
+            if self.same(old_param, new_param):
+                continue
+            if new_param.get('required') and not old_param.get('required'):
+                self._record(op_id, location, 'changed', True, 'parameter became required')
+            self._diff_schema(op_id, f"{location}/schema",
+                              old_param.get('schema') or {}, new_param.get('schema') or {}, REQUEST)
+
+    def _diff_content(self, op_id: str, location: str, old_content: Dict[str, Any],
+                      new_content: Dict[str, Any], direction: str) -> None:
+        """Diff media type maps of a request body or response."""
+        for media_type in old_content:
+            if media_type not in new_content:
+                self._record(op_id, f"{location}/{media_type}", 'removed', direction == RESPONSE,
+                             'media type removed')
+        for media_type, new_media in new_content.items():
+            old_media = old_content.get(media_type)
+            if old_media is None:
+                self._record(op_id, f"{location}/{media_type}", 'added', False, 'media type added')
+                continue
+            if not self.same(old_media, new_media):
+                self._diff_schema(op_id, f"{location}/{media_type}",
+                                  old_media.get('schema') or {}, new_media.get('schema') or {}, direction)
+
+    def _diff_schema(self, op_id: str, location: str, old: Dict[str, Any], new: Dict[str, Any],
+                     direction: str, pointer: str = '') -> None:
+        """
+        Recursively diff two JSON schemas, skipping identical subtrees.
+
+        Args:
+            op_id: Operation id
+            location: Location of the schema within the operation
+            old: Previous schema
+            new: Current schema
+            direction: REQUEST or RESPONSE
+            pointer: JSON pointer within the schema
+        """
+        if self.same(old, new):
+            return
+        where = f"{location}{pointer}"
+
+        old_type, new_type = old.get('type'), new.get('type')
+        if old_type != new_type:
+            if old_type is None or new_type is None:
+                self._record(op_id, where, 'changed', False, f"type {old_type} -> {new_type}")
+            else:
+                self._record(op_id, where, 'changed', True, f"type {old_type} -> {new_type}")
+                return
+
+        old_props = old.get('properties') or {}
+        new_props = new.get('properties') or {}
+        if not self.same(old_props, new_props):
+            new_required = set(new.get('required') or [])
+            for name in old_props:
+                if name not in new_props:
+                    self._record(op_id, f"{where}/properties/{name}", 'removed', direction == RESPONSE,
+                                 'field removed')
+            for name, new_prop in new_props.items():
+                if name not in old_props:
+                    breaking = direction == REQUEST and name in new_required
+                    self._record(op_id, f"{where}/properties/{name}", 'added', breaking,
+                                 'required field added' if breaking else 'field added')
+                elif isinstance(new_prop, dict) and isinstance(old_props[name], dict):
+                    self._diff_schema(op_id, location, old_props[name], new_prop, direction,
+                                      f"{pointer}/properties/{name}")
+
+        if direction == REQUEST:
+            added_required = set(new.get('required') or []) - set(old.get('required') or []) - \
+                (set(new_props) - set(old_props))
+            for name in sorted(added_required):
+                self._record(op_id, f"{where}/properties/{name}", 'changed', True, 'field became required')
+
+        old_items, new_items = old.get('items'), new.get('items')
+        if isinstance(old_items, dict) and isinstance(new_items, dict):
+            self._diff_schema(op_id, location, old_items, new_items, direction, f"{pointer}/items")
+
+        if not self.same(old.get('enum'), new.get('enum')) and (old.get('enum') or new.get('enum')):
+            # Canonical JSON keeps true, 1 and 1.0 apart
+            old_enum = set(json.dumps(value, sort_keys=True) for value in old.get('enum') or [])
+            new_enum = set(json.dumps(value, sort_keys=True) for value in new.get('enum') or [])
+            # Clients break when they may send values the server dropped, or
+            # receive values they have never seen
+            breaking = bool(old_enum - new_enum) if direction == REQUEST else bool(new_enum - old_enum)
+            self._record(op_id, f"{where}/enum", 'changed', breaking and bool(old_enum),
+                         f"enum -{sorted(old_enum - new_enum)} +{sorted(new_enum - old_enum)}")
+
+        for keyword in ('format', 'minimum', 'maximum', 'pattern', 'default'):
+            if not self.same(old.get(keyword), new.get(keyword)):
+                self._record(op_id, f"{where}/{keyword}", 'changed', False,
+                             f"{keyword} {old.get(keyword)!r} -> {new.get(keyword)!r}")
+
+
+def format_text(diff: SpecDiff, elapsed_ms: float) -> str:
+    """
+    Format a diff result for terminals.
+
+    Args:
+        diff: Compared SpecDiff
+        elapsed_ms: Comparison time
+
+    Returns:
+        Report text
+    """
+    breaking = [change for change in diff.changes if change['breaking']]
+    lines = [
+        f"{'❗' if breaking else '✅'} {len(breaking)} breaking, "
+        f"{len(diff.changes) - len(breaking)} non-breaking changes",
+        f"   Operations compared: {diff.operations_compared} ({diff.operations_unchanged} unchanged)",
+        f"   Compare time: {elapsed_ms:.2f} ms",
+    ]
+    for change in sorted(diff.changes, key=lambda c: (not c['breaking'], c['operation'], c['location'])):
+        label = 'BREAKING' if change['breaking'] else 'ok      '
+        location = f"  {change['location']}" if change['location'] else ''
+        lines.append(f"   {label} {change['operation']}{location}: {change['detail']}")
+    return '\n'.join(lines)
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Structural diff between generated OpenAPI/AsyncAPI specs',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/spec_diff.py old/openapi.yaml new/openapi.yaml
+  python scripts/spec_diff.py old/asyncapi.json new/asyncapi.json --format json --fail-on-breaking
+        """
+    )
+    parser.add_argument('old', help='Previous spec (JSON or YAML, optionally compressed)')
+    parser.add_argument('new', help='Current spec (JSON or YAML, optionally compressed)')
+    parser.add_argument(
+        '-f', '--format',
+        choices=['text', 'json'],
+        default='text',
+        help='Report format (default: text)'
+    )
+    parser.add_argument(
+        '--fail-on-breaking',
+        action='store_true',
+        help='Exit with status 2 when breaking changes are found'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        diff = SpecDiff(load_spec(args.old), load_spec(args.new))
+        started = time.perf_counter()
+        changes = diff.compare()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        if args.format == 'json':
+            print(json.dumps({
+                'operations_compared': diff.operations_compared,
+                'operations_unchanged': diff.operations_unchanged,
+                'breaking': sum(1 for change in changes if change['breaking']),
+                'compare_ms': round(elapsed_ms, 3),
+                'changes': changes,
+            }, indent=2))
+        else:
+            print(format_text(diff, elapsed_ms))
+
+        if args.fail_on_breaking and any(change['breaking'] for change in changes):
+            sys.exit(2)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
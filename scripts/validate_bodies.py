@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+"""
+Body Validator
+
+Validates captured traffic against a generated specification: every JSON
+request and response body of one or more HAR files against an OpenAPI spec,
+or every WebSocket frame of .ws.jsonl logs against an AsyncAPI spec.
+
+    - JSON schema validators are compiled once per operation/status or
+      message type and cached in each worker
+    - identical bodies are validated once per schema, keyed by content hash
+    - validation runs on a pool of worker processes fed in bounded batches
+
+The result is a summary of violations grouped by operation, with the most
+frequent error messages.
+
+Usage:
+    python scripts/validate_bodies.py openapi.yaml session-*.har.json
+    python scripts/validate_bodies.py asyncapi.yaml session.ws.jsonl --jobs 8 --format json -o report.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from compressed_io import open_input
+from har_content import ContentDecodeError, content_hash, decode_content
+from har_to_openapi import HARToOpenAPIConverter
+from spec_diff import HTTP_METHODS, load_spec
+from ws_schema_extractor import infer_message_type
+
+DEFAULT_BATCH_SIZE = 256
+
+# Error messages kept per validated body
+MAX_ERRORS_PER_BODY = 5
+
+# Worker state: schemas by key (set by the pool initializer) and compiled validators
+_SCHEMAS: Dict[str, Dict[str, Any]] = {}
+_VALIDATORS: Dict[str, Any] = {}
+
+
+def _init_worker(schemas: Dict[str, Dict[str, Any]]) -> None:
+    """Receive the schemas once per worker process."""
+    global _SCHEMAS
+    _SCHEMAS = schemas
+    _VALIDATORS.clear()
+
+
+def _validator(key: str) -> Any:
+    """Compile the validator for a schema key on first use."""
+    validator = _VALIDATORS.get(key)
+    if validator is None:
+        try:
+            from jsonschema import Draft7Validator
+            from jsonschema.validators import validator_for
+        except ImportError:
+            raise ImportError("jsonschema library not found. Please install: pip install jsonschema")
+        schema = _SCHEMAS[key]
+        validator = _VALIDATORS[key] = validator_for(schema, default=Draft7Validator)(schema)
+    return validator
+
+
+def validate_batch(batch: List[Tuple[str, bytes, Any, bool]]) -> List[Tuple[str, bytes, List[str]]]:
+    """
+    Validate a batch of bodies (in a worker process).
+
+    Args:
+        batch: Tuples of (schema key, body hash, payload, encoded) where
+            payload is a HAR content object if encoded, else decoded JSON
+
+    Returns:
+        Tuples of (schema key, body hash, error messages)
+    """
+    results = []
+    for key, body_hash, payload, encoded in batch:
+        if encoded:
+            try:
+                decoded = decode_content(payload)
+                data = json.loads(decoded) if decoded is not None else None
+            except (ContentDecodeError, UnicodeDecodeError, ValueError) as e:
+                results.append((key, body_hash, [f"body is not valid JSON: {e}"]))
+                continue
+        else:
+            data = payload
+
+        errors = []
+        for error in _validator(key).iter_errors(data):
+            location = '/' + '/'.join(str(part) for part in error.absolute_path)
+            errors.append(f"{location}: {error.message[:200]}")
+            if len(errors) >= MAX_ERRORS_PER_BODY:
+                break
+        results.append((key, body_hash, errors))
+    return results
+
+
+class BodyValidator:
+    """Validate captured bodies against an OpenAPI or AsyncAPI spec."""
+
+    def __init__(self, spec: Dict[str, Any], workers: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize validator.
+
+        Args:
+            spec: OpenAPI or AsyncAPI specification
+            workers: Worker processes (default: CPU count; 1 validates inline)
+            batch_size: Bodies per work item sent to a worker
+        """
+        self.spec = spec
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.schemas = self._collect_schemas(spec)
+        self._path_patterns = [
+            (re.compile('^' + re.sub(r'\\\{[^/]+?\\\}', '[^/]+', re.escape(path)) + '$'), path)
+            for path in spec.get('paths') or {}
+        ]
+        self._path_cache: Dict[str, Optional[str]] = {}
+
+        # (schema key, body hash) -> occurrences; verdicts arrive from workers
+        self.counts: Counter = Counter()
+        self.verdicts: Dict[Tuple[str, bytes], List[str]] = {}
+        self.unmatched: Counter = Counter()
+
+    @staticmethod
+    def _collect_schemas(spec: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Index the body schemas of a spec by validation key.
+
+        Keys are "METHOD /path request", "METHOD /path <status>" and
+        "send|receive <message type>". Local $refs to components stay
+        resolvable because the components are carried along.
+        """
+        components = spec.get('components')
+        schemas = {}
+
+        def add(key: str, schema: Any) -> None:
+            if isinstance(schema, dict) and schema:
+                schemas[key] = dict(schema, components=components) if components else schema
+
+        for path, path_item in (spec.get('paths') or {}).items():
+            for method in HTTP_METHODS:
+                operation = (path_item or {}).get(method)
+                if not operation:
+                    continue
+                prefix = f"{method.upper()} {path}"
+                for mime_type, media in ((operation.get('requestBody') or {}).get('content') or {}).items():
+                    if 'json' in mime_type:
+                        add(f"{prefix} request", media.get('schema'))
+                for status, response in (operation.get('responses') or {}).items():
+                    for mime_type, media in ((response or {}).get('content') or {}).items():
+                        if 'json' in mime_type:
+                            add(f"{prefix} {status}", media.get('schema'))
+
+        for channel in (spec.get('channels') or {}).values():
+            for action, direction in (('publish', 'send'), ('subscribe', 'receive')):
+                message = ((channel or {}).get(action) or {}).get('message') or {}
+                if message.get('name'):
+                    add(f"{direction} {message['name']}", message.get('payload'))
+
+        return schemas
+
+    def _spec_path(self, path: str, template: str) -> Optional[str]:
+        """Find the spec path of a request: converter template first, then path patterns."""
+        if template not in self._path_cache:
+            spec_paths = self.spec.get('paths') or {}
+            if template in spec_paths:
+                found = template
+            else:
+                found = next((spec_path for pattern, spec_path in self._path_patterns if pattern.match(path)), None)
+            self._path_cache[template] = found
+        return self._path_cache[template]
+
+    def iter_har_items(self, har_file: str) -> Iterator[Tuple[str, bytes, Any, bool]]:
+        """
+        Yield JSON bodies of a HAR file with their schema keys.
+
+        Args:
+            har_file: HAR file path
+
+        Yields:
+            Tuples of (schema key, body hash, HAR content object, True)
+        """
+        converter = HARToOpenAPIConverter(har_file, streaming=True)
+        for entry in converter.iter_entries():
+            endpoint_key = converter.endpoint_key(entry)
+            if endpoint_key is None:
+                continue
+            method, _, template = endpoint_key.partition(':')
+            request = entry.get('request', {})
+            response = entry.get('response', {})
+            spec_path = self._spec_path(urlparse(request.get('url', '')).path or '/', template)
+
+            for location, content in (
+                ('request', request.get('postData')),
+                (str(response.get('status', '')), response.get('content')),
+            ):
+                if not content or not content.get('text') or 'json' not in content.get('mimeType', ''):
+                    continue
+                if spec_path is None:
+                    self.unmatched['no operation in spec'] += 1
+                    continue
+                key = f"{method} {spec_path} {location}"
+                if key not in self.schemas:
+                    self.unmatched[f"no schema for {location}"] += 1
+                    continue
+                yield key, bytes.fromhex(content_hash(content)), content, True
+
+    def iter_ws_items(self, ws_log_file: str) -> Iterator[Tuple[str, bytes, Any, bool]]:
+        """
+        Yield WebSocket frames of a .ws.jsonl log with their schema keys.
+
+        Args:
+            ws_log_file: WebSocket log path
+
+        Yields:
+            Tuples of (schema key, body hash, decoded payload, False)
+        """
+        with open_input(ws_log_file) as f:
+            for line in f:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                data = message.get('data')
+                if not data or not isinstance(data, (dict, list)):
+                    continue
+                key = f"{message.get('direction', 'unknown')} {infer_message_type(data)}"
+                if key not in self.schemas:
+                    self.unmatched['no schema for message type'] += 1
+                    continue
+                canonical = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+                yield key, hashlib.blake2b(canonical, digest_size=16).digest(), data, False
+
+    def _batches(self, items: Iterator[Tuple[str, bytes, Any, bool]]) -> Iterator[List[Tuple[str, bytes, Any, bool]]]:
+        """Count every body and batch the ones not seen before."""
+        batch = []
+        for item in items:
+            body_key = (item[0], item[1])
+            self.counts[body_key] += 1
+            if self.counts[body_key] > 1:
+                continue
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _record(self, results: List[Tuple[str, bytes, List[str]]]) -> None:
+        """Store worker verdicts."""
+        for key, body_hash, errors in results:
+            self.verdicts[(key, body_hash)] = errors
+
+    def run(self, items: Iterator[Tuple[str, bytes, Any, bool]]) -> None:
+        """
+        Validate all items, deduplicated, on the worker pool.
+
+        Args:
+            items: Items from iter_har_items / iter_ws_items
+        """
+        if self.workers <= 1:
+            _init_worker(self.schemas)
+            for batch in self._batches(items):
+                self._record(validate_batch(batch))
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.schemas,)) as pool:
+            in_flight: Set[Future] = set()
+            for batch in self._batches(items):
+                # Bound memory: at most two batches queued per worker
+                if len(in_flight) >= 2 * self.workers:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._record(future.result())
+                in_flight.add(pool.submit(validate_batch, batch))
+            for future in in_flight:
+                self._record(future.result())
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize violations grouped by operation.
+
+        Returns:
+            Totals and per-operation rows, worst first
+        """
+        operations: Dict[str, Dict[str, Any]] = {}
+        for (key, body_hash), count in self.counts.items():
+            row = operations.setdefault(key, {
+                'operation': key, 'bodies': 0, 'unique': 0, 'invalid': 0, 'invalid_unique': 0, 'errors': Counter(),
+            })
+            errors = self.verdicts.get((key, body_hash), [])
+            row['bodies'] += count
+            row['unique'] += 1
+            if errors:
+                row['invalid'] += count
+                row['invalid_unique'] += 1
+                for error in errors:
+                    row['errors'][error] += count
+
+        rows = sorted(operations.values(), key=lambda row: (row['invalid'], row['bodies']), reverse=True)
+        for row in rows:
+            row['errors'] = [{'error': error, 'count': count} for error, count in row['errors'].most_common(10)]
+
+        return {
+            'bodies': sum(row['bodies'] for row in rows),
+            'validated': sum(row['unique'] for row in rows),
+            'invalid': sum(row['invalid'] for row in rows),
+            'unmatched': dict(self.unmatched),
+            'operations': rows,
+        }
+
+
+def main() -> None:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description='Validate captured HAR bodies and WebSocket frames against generated specs',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python scripts/validate_bodies.py openapi.yaml session-*.har.json
+  python scripts/validate_bodies.py asyncapi.yaml session.ws.jsonl --jobs 8
+  python scripts/validate_bodies.py openapi.yaml captures/*.har.json.zst --format json -o report.json --fail-on-violation
+        """
+    )
+    parser.add_argument('spec', help='OpenAPI or AsyncAPI spec (JSON or YAML, optionally compressed)')
+    parser.add_argument('inputs', nargs='+', help='HAR files (OpenAPI) or .ws.jsonl logs (AsyncAPI)')
+    parser.add_argument('-o', '--output', help='Write the report to this file instead of stdout')
+    parser.add_argument(
+        '-f', '--format',
+        choices=['text', 'json'],
+        default='text',
+        help='Report format (default: text)'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=os.cpu_count() or 1,
+        help=f'Worker processes, 1 to validate inline (default: {os.cpu_count() or 1})'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Bodies per work item (default: {DEFAULT_BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--fail-on-violation',
+        action='store_true',
+        help='Exit with status 2 when any body is invalid'
+    )
+
+    args = parser.parse_args()
+
+    try:
+        spec = load_spec(args.spec)
+        validator = BodyValidator(spec, workers=args.jobs, batch_size=args.batch_size)
+        if not validator.schemas:
+            raise ValueError(f"No body schemas found in {args.spec}")
+
+        def items() -> Iterator[Tuple[str, bytes, Any, bool]]:
+            for path in args.inputs:
+                if 'channels' in spec:
+                    yield from validator.iter_ws_items(path)
+                else:
+                    yield from validator.iter_har_items(path)
+
+        validator.run(items())
+        summary = validator.summary()
+
+        if args.format == 'json':
+            text = json.dumps(summary, indent=2)
+        else:
+            lines = [
+                f"{'❌' if summary['invalid'] else '✅'} {summary['invalid']} of {summary['bodies']} bodies invalid "
+                f"({summary['validated']} distinct bodies validated)",
+            ]
+            for reason, count in summary['unmatched'].items():
+                lines.append(f"   ⚠️  Skipped {count} bodies: {reason}")
+            for row in summary['operations']:
+                if not row['invalid']:
+                    continue
+                lines.append(f"   {row['operation']}: {row['invalid']}/{row['bodies']} invalid "
+                             f"({row['invalid_unique']} distinct)")
+                for error in row['errors'][:5]:
+                    lines.append(f"      {error['count']}x {error['error']}")
+            text = '\n'.join(lines)
+
+        if args.output:
+            with open(args.output, 'w') as f:
+                f.write(text + '\n')
+            print(f"✅ Validation report written to {args.output}")
+        else:
+            print(text)
+
+        if args.fail_on_violation and summary['invalid']:
+            sys.exit(2)
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
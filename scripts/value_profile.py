@@ -0,0 +1,527 @@
+#!/usr/bin/env python3
+"""
+Value Profiler
+
+Columnar profiling of JSON body values. Leaf values are collected per schema
+path into typed column buffers and profiled in batches:
+
+    - numbers: exact minimum/maximum
+    - strings: format detection (date-time, uuid, uri) and enum candidates
+    - all leaves: distinct-count sketch (HyperLogLog) and a bounded example
+      reservoir
+
+Results are emitted as JSON schema keywords (minimum, maximum, format, enum,
+example, x-distinct). ParameterProfile applies the same ideas to query
+parameters, whose values are strings. Memory per path is bounded by the batch size, the
+reservoir size, the enum threshold and the sketch registers, independent of
+traffic. NumPy is used for the numeric and sketch batches when installed.
+
+Usage:
+    profiler = ValueProfiler()
+    profiler.add(('GET:/rest/thread/{id}', '200'), body)
+    schema = profiler.annotate(('GET:/rest/thread/{id}', '200'), schema)
+"""
+
+import copy
+import hashlib
+import math
+import random
+import re
+from array import array
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+# NumPy is optional and imported on first use (see _load_numpy)
+np: Any = None
+_numpy_checked = False
+
+DEFAULT_RESERVOIR_SIZE = 64
+DEFAULT_ENUM_THRESHOLD = 16
+DEFAULT_BATCH_SIZE = 512
+
+_MASK64 = (1 << 64) - 1
+_INT64_MIN, _INT64_MAX = -(1 << 63), (1 << 63) - 1
+
+# Anchored per line: a batch is checked with one findall over the joined values
+STRING_FORMATS = (
+    ('uuid', re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$', re.M)),
+    ('date-time', re.compile(
+        r'^\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:[Zz]|[+-]\d{2}:?\d{2})?$', re.M)),
+    ('uri', re.compile(r'^[a-zA-Z][a-zA-Z0-9+.-]*://[^\s/?#]+[^\s]*$', re.M)),
+)
+
+
+def _load_numpy() -> Any:
+    """Import NumPy once if it is installed."""
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+
+# Reservoir values usable as `example` for each schema type
+_EXAMPLE_TYPES = {'string': str, 'integer': int, 'number': (int, float)}
+
+
+def _stable_hash(value: Hashable) -> int:
+    """
+    Hash a value identically in every process.
+
+    Built-in str hashes are salted per process (PYTHONHASHSEED), which would
+    make distinct counts vary between runs; numeric hashes are not salted.
+    """
+    if isinstance(value, str):
+        return int.from_bytes(
+            hashlib.blake2b(value.encode('utf-8', 'surrogatepass'), digest_size=8).digest(), 'little'
+        )
+    return hash(value) & _MASK64
+
+
+def _mix64(value: int) -> int:
+    """SplitMix64 finalizer, spreads stable hashes (identity for small ints)."""
+    value = (value ^ (value >> 30)) * 0xbf58476d1ce4e5b9 & _MASK64
+    value = (value ^ (value >> 27)) * 0x94d049bb133111eb & _MASK64
+    return value ^ (value >> 31)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct-count sketch with constant memory."""
+
+    def __init__(self, precision: int = 10):
+        """
+        Initialize sketch.
+
+        Args:
+            precision: Number of index bits; uses 2**precision one-byte
+                registers (standard error about 1.04 / sqrt(2**precision))
+        """
+        self.precision = precision
+        self.num_registers = 1 << precision
+        # Plain bytes: scalar adds need no NumPy; batches view them as a uint8 array
+        self.registers = bytearray(self.num_registers)
+
+    def add(self, value: Hashable) -> None:
+        """
+        Add one value.
+
+        Args:
+            value: Hashable value
+        """
+        hashed = _mix64(_stable_hash(value))
+        index = hashed >> (64 - self.precision)
+        rank = min(65 - ((hashed << self.precision) & _MASK64).bit_length(), 65 - self.precision)
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[Hashable]) -> None:
+        """
+        Add a batch of values.
+
+        Args:
+            values: Hashable values
+        """
+        if np is None:
+            for value in values:
+                self.add(value)
+            return
+
+        hashes = np.fromiter((_stable_hash(value) for value in values), dtype=np.uint64)
+        if not hashes.size:
+            return
+        hashes ^= hashes >> np.uint64(30)
+        hashes *= np.uint64(0xbf58476d1ce4e5b9)
+        hashes ^= hashes >> np.uint64(27)
+        hashes *= np.uint64(0x94d049bb133111eb)
+        hashes ^= hashes >> np.uint64(31)
+
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+
+        # Vectorized bit length of the remaining bits
+        bit_length = np.zeros(rest.shape, dtype=np.int64)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = rest >= (np.uint64(1) << np.uint64(shift))
+            bit_length += high * shift
+            rest = np.where(high, rest >> np.uint64(shift), rest)
+        bit_length += (rest > 0)
+
+        rank = np.minimum(65 - bit_length, 65 - self.precision).astype(np.uint8)
+        np.maximum.at(np.frombuffer(self.registers, dtype=np.uint8), index, rank)
+
+    def count(self) -> int:
+        """
+        Estimate the number of distinct values added.
+
+        Returns:
+            Distinct count estimate
+        """
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        registers = [int(register) for register in self.registers]
+        estimate = alpha * m * m / sum(2.0 ** -register for register in registers)
+        zeros = registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class ValueColumn:
+    """Typed column buffer and running profile for one JSON path."""
+
+    def __init__(self, reservoir_size: int, enum_threshold: int, batch_size: int, rng: random.Random):
+        """
+        Initialize column.
+
+        Args:
+            reservoir_size: Maximum example values kept
+            enum_threshold: Maximum distinct strings for an enum candidate
+            batch_size: Values buffered before a profiling batch runs
+            rng: Random source for reservoir sampling
+        """
+        self.reservoir_size = reservoir_size
+        self.enum_threshold = enum_threshold
+        self.batch_size = batch_size
+        self.rng = rng
+
+        self.count = 0
+        self.integers = array('q')
+        self.floats = array('d')
+        # Integers outside the int64 range (valid JSON, no typed buffer)
+        self.big_integers: List[int] = []
+        self.strings: List[str] = []
+        self.reservoir: List[Any] = []
+
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.string_count = 0
+        self.formats = {name: True for name, _ in STRING_FORMATS}
+        self.enum_values: Optional[set] = set()
+        self.sketch = HyperLogLog()
+
+    def add(self, value: Any) -> None:
+        """
+        Buffer one leaf value.
+
+        Args:
+            value: int, float or str
+        """
+        self.count += 1
+        if isinstance(value, str):
+            self.strings.append(value)
+        elif isinstance(value, int):
+            if _INT64_MIN <= value <= _INT64_MAX:
+                self.integers.append(value)
+            else:
+                self.big_integers.append(value)
+        else:
+            self.floats.append(value)
+
+        # Reservoir sampling (Algorithm R)
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(value)
+        else:
+            slot = self.rng.randrange(self.count)
+            if slot < self.reservoir_size:
+                self.reservoir[slot] = value
+
+        if len(self.integers) + len(self.floats) + len(self.big_integers) + len(self.strings) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Profile buffered values in one batch and release the buffers."""
+        for numbers in (self.integers, self.floats, self.big_integers):
+            if not numbers:
+                continue
+            if np is not None and isinstance(numbers, array):
+                column = np.frombuffer(numbers, dtype=np.int64 if numbers.typecode == 'q' else np.float64)
+                low, high = column.min().item(), column.max().item()
+            else:
+                low, high = min(numbers), max(numbers)
+            self.minimum = low if self.minimum is None else min(self.minimum, low)
+            self.maximum = high if self.maximum is None else max(self.maximum, high)
+            self.sketch.update(numbers)
+
+        if self.strings:
+            self._profile_strings(self.strings)
+
+        self.integers = array('q')
+        self.floats = array('d')
+        self.big_integers = []
+        self.strings = []
+
+    def _profile_strings(self, strings: List[str]) -> None:
+        """Run format, enum and sketch updates over a batch of strings."""
+        self.string_count += len(strings)
+        self.sketch.update(strings)
+
+        if any(self.formats.values()):
+            joined = '\n'.join(strings)
+            # A value containing a newline adds lines and can never match
+            lines = joined.count('\n') + 1
+            for name, pattern in STRING_FORMATS:
+                if self.formats[name] and (lines != len(strings) or len(pattern.findall(joined)) != lines):
+                    self.formats[name] = False
+
+        if self.enum_values is not None:
+            self.enum_values.update(strings)
+            if len(self.enum_values) > self.enum_threshold:
+                self.enum_values = None
+
+    def keywords(self, schema_type: Optional[str], enum_min_count: int) -> Dict[str, Any]:
+        """
+        Build schema keywords from the profile.
+
+        Args:
+            schema_type: Type of the schema node being annotated
+            enum_min_count: Minimum observations before an enum is proposed
+
+        Returns:
+            Schema keywords
+        """
+        self.flush()
+        keywords: Dict[str, Any] = {}
+
+        if schema_type in ('integer', 'number') and self.minimum is not None:
+            keywords['minimum'] = self.minimum
+            keywords['maximum'] = self.maximum
+
+        if schema_type == 'string' and self.string_count:
+            detected = next((name for name, _ in STRING_FORMATS if self.formats[name]), None)
+            if detected:
+                keywords['format'] = detected
+            elif self.enum_values is not None and self.string_count >= enum_min_count \
+                    and self.string_count >= 2 * len(self.enum_values):
+                keywords['enum'] = sorted(self.enum_values)
+
+        example_types = _EXAMPLE_TYPES.get(schema_type)
+        if example_types:
+            example = next((value for value in self.reservoir if isinstance(value, example_types)), None)
+            if example is not None:
+                keywords['example'] = example
+        keywords['x-distinct'] = min(self.sketch.count(), self.count)
+        return keywords
+
+
+class ParameterProfile:
+    """Constant-memory profile of one query parameter across requests."""
+
+    _INTEGER = re.compile(r'-?\d+')
+    _NUMBER = re.compile(r'-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+    def __init__(
+        self,
+        rng: random.Random,
+        reservoir_size: int = 3,
+        enum_threshold: int = DEFAULT_ENUM_THRESHOLD,
+        enum_min_count: int = 8,
+        precision: int = 8,
+    ):
+        """
+        Initialize profile.
+
+        Args:
+            rng: Random source for reservoir sampling
+            reservoir_size: Example values kept
+            enum_threshold: Maximum distinct values for an enum candidate
+            enum_min_count: Minimum observed values before proposing an enum
+            precision: HyperLogLog precision of the distinct-count sketch
+        """
+        self.rng = rng
+        self.reservoir_size = reservoir_size
+        self.enum_threshold = enum_threshold
+        self.enum_min_count = enum_min_count
+
+        self.presence = 0
+        self.values = 0
+        self.integers = 0
+        self.numbers = 0
+        self.booleans = 0
+        # Exact ints while every value is an integer, so IDs above 2**53 keep precision
+        self.minimum: Optional[Union[int, float]] = None
+        self.maximum: Optional[Union[int, float]] = None
+        self.reservoir: List[str] = []
+        self.enum_values: Optional[set] = set()
+        self.sketch = HyperLogLog(precision)
+
+    def add(self, values: List[str]) -> None:
+        """
+        Record the values of the parameter in one request.
+
+        Args:
+            values: Values of the parameter (repeated keys give several)
+        """
+        self.presence += 1
+        for value in values:
+            self.values += 1
+            self.sketch.add(value)
+
+            if value.lower() in ('true', 'false'):
+                self.booleans += 1
+            if self._NUMBER.fullmatch(value):
+                self.numbers += 1
+                number = self._parse_number(value)
+                if self._INTEGER.fullmatch(value):
+                    self.integers += 1
+                if number is not None:
+                    self.minimum = number if self.minimum is None else min(self.minimum, number)
+                    self.maximum = number if self.maximum is None else max(self.maximum, number)
+
+            if self.enum_values is not None:
+                self.enum_values.add(value)
+                if len(self.enum_values) > self.enum_threshold:
+                    self.enum_values = None
+
+            # Reservoir sampling (Algorithm R)
+            if len(self.reservoir) < self.reservoir_size:
+                self.reservoir.append(value)
+            else:
+                slot = self.rng.randrange(self.values)
+                if slot < self.reservoir_size:
+                    self.reservoir[slot] = value
+
+    def _parse_number(self, value: str) -> Optional[Union[int, float]]:
+        """
+        Parse a numeric value exactly: int for integers, float otherwise.
+
+        Returns:
+            The number, or None if it is not finite (e.g. "1e400") or too long
+        """
+        try:
+            number: Union[int, float] = int(value) if self._INTEGER.fullmatch(value) else float(value)
+        except ValueError:
+            return None
+        if isinstance(number, float) and not math.isfinite(number):
+            return None
+        return number
+
+    @property
+    def distinct(self) -> int:
+        """Estimated number of distinct values."""
+        return min(self.sketch.count(), self.values)
+
+    def schema(self) -> Dict[str, Any]:
+        """
+        Infer the parameter schema from the running counters.
+
+        Returns:
+            JSON schema for the parameter
+        """
+        if not self.values:
+            return {'type': 'string'}
+        if self.booleans == self.values:
+            return {'type': 'boolean'}
+        if self.integers == self.values or self.numbers == self.values:
+            schema: Dict[str, Any] = {'type': 'integer' if self.integers == self.values else 'number'}
+            if self.minimum is not None:
+                schema['minimum'], schema['maximum'] = self.minimum, self.maximum
+            return schema
+
+        schema = {'type': 'string'}
+        if self.enum_values is not None and self.values >= self.enum_min_count \
+                and self.values >= 2 * len(self.enum_values):
+            schema['enum'] = sorted(self.enum_values)
+        return schema
+
+    def examples(self) -> List[Any]:
+        """
+        Get example values converted to the inferred type.
+
+        Returns:
+            Sampled example values
+        """
+        schema_type = self.schema()['type']
+        if schema_type in ('integer', 'number'):
+            numbers = (self._parse_number(value) for value in self.reservoir)
+            return [number for number in numbers if number is not None]
+        if schema_type == 'boolean':
+            return [value.lower() == 'true' for value in self.reservoir]
+        return list(self.reservoir)
+
+
+class ValueProfiler:
+    """Collect and profile leaf values of JSON bodies per scope and schema path."""
+
+    def __init__(
+        self,
+        reservoir_size: int = DEFAULT_RESERVOIR_SIZE,
+        enum_threshold: int = DEFAULT_ENUM_THRESHOLD,
+        enum_min_count: int = 8,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        seed: int = 0,
+    ):
+        """
+        Initialize profiler.
+
+        Args:
+            reservoir_size: Example values kept per path
+            enum_threshold: Maximum distinct strings for an enum candidate
+            enum_min_count: Minimum string observations before proposing an enum
+            batch_size: Values buffered per path before a profiling batch runs
+            seed: Seed for reservoir sampling, for reproducible specs
+        """
+        self.reservoir_size = reservoir_size
+        self.enum_threshold = enum_threshold
+        self.enum_min_count = enum_min_count
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.columns: Dict[Tuple[Hashable, Tuple[str, ...]], ValueColumn] = {}
+        # Only the batched column path uses NumPy (ParameterProfile never loads it)
+        _load_numpy()
+
+    def add(self, scope: Hashable, data: Any) -> None:
+        """
+        Collect the leaf values of one decoded body.
+
+        Args:
+            scope: Where the body belongs (e.g. endpoint key and status)
+            data: Decoded JSON body
+        """
+        self._collect(scope, data, ())
+
+    def _collect(self, scope: Hashable, data: Any, path: Tuple[str, ...]) -> None:
+        """Walk a JSON value, appending leaves to the column for their schema path."""
+        if isinstance(data, dict):
+            for key, value in data.items():
+                self._collect(scope, value, path + ('properties', key))
+        elif isinstance(data, list):
+            item_path = path + ('items',)
+            for value in data:
+                self._collect(scope, value, item_path)
+        elif isinstance(data, (int, float, str)) and not isinstance(data, bool):
+            column = self.columns.get((scope, path))
+            if column is None:
+                column = self.columns[(scope, path)] = ValueColumn(
+                    self.reservoir_size, self.enum_threshold, self.batch_size, self.rng
+                )
+            column.add(data)
+
+    def annotate(self, scope: Hashable, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add profiled keywords to a schema.
+
+        Args:
+            scope: Scope the bodies were collected under
+            schema: Schema inferred for the scope (not modified)
+
+        Returns:
+            Annotated copy of the schema
+        """
+        annotated = copy.deepcopy(schema)
+        self._annotate(scope, annotated, ())
+        return annotated
+
+    def _annotate(self, scope: Hashable, schema: Dict[str, Any], path: Tuple[str, ...]) -> None:
+        """Recursively attach keywords to schema nodes with a profiled column."""
+        column = self.columns.get((scope, path))
+        if column is not None:
+            schema.update(column.keywords(schema.get('type'), self.enum_min_count))
+
+        for key, child in (schema.get('properties') or {}).items():
+            if isinstance(child, dict):
+                self._annotate(scope, child, path + ('properties', key))
+        if isinstance(schema.get('items'), dict):
+            self._annotate(scope, schema['items'], path + ('items',))
@@ -8,42 +8,102 @@ Supports .ws.jsonl files (newline-delimited JSON).
 Usage:
     python scripts/ws_schema_extractor.py input.ws.jsonl -o asyncapi.yaml
     python scripts/ws_schema_extractor.py input.ws.jsonl -o asyncapi.json --format json
+    python scripts/ws_schema_extractor.py input.ws.jsonl.gz -o asyncapi.yaml.zst
+    python scripts/ws_schema_extractor.py input.ws.jsonl -o asyncapi.yaml --sample-rate 0.05
+    capture-tool | python scripts/ws_schema_extractor.py - --ndjson --emit both > results.ndjson
 """
 
 import argparse
 import json
-from typing import Any, Dict, List
-import yaml
+import sys
+from typing import Any, Dict, List, Optional
 
-try:
-    from genson import SchemaBuilder
-except ImportError:
-    print("❌ Error: genson library not found")
-    print("Please install: pip install genson")
-    import sys
-    sys.exit(1)
+from body_sampling import BodySampler, add_sampling_arguments
+from compressed_io import open_binary_input, open_output
+from ndjson_stream import add_ndjson_arguments, stream_records
+
+
+def load_schema_builder() -> Any:
+    """
+    Import genson's SchemaBuilder on first use.
+
+    Returns:
+        SchemaBuilder class
+
+    Raises:
+        ImportError: If genson is not installed
+    """
+    try:
+        from genson import SchemaBuilder
+    except ImportError:
+        raise ImportError("genson library not found. Please install: pip install genson")
+    return SchemaBuilder
+
+
+def infer_message_type(data: Any) -> str:
+    """
+    Infer message type from data structure.
+
+    Args:
+        data: Message data
+
+    Returns:
+        Message type string
+    """
+    if isinstance(data, dict):
+        # Check for common type indicators
+        if 'type' in data:
+            return str(data['type'])
+        elif 'event' in data:
+            return str(data['event'])
+        elif 'action' in data:
+            return str(data['action'])
+        elif 'method' in data:
+            return str(data['method'])
+        else:
+            return 'message'
+    elif isinstance(data, list):
+        return 'array_message'
+    else:
+        return 'unknown'
 
 
 class WebSocketSchemaExtractor:
     """Extract JSON schemas from WebSocket logs and generate AsyncAPI specs."""
 
-    def __init__(self, ws_log_file: str):
+    def __init__(
+        self,
+        ws_log_file: str,
+        threaded_decompression: bool = False,
+        body_sampler: Optional[BodySampler] = None,
+    ):
         """
         Initialize extractor with WebSocket log file.
 
         Args:
-            ws_log_file: Path to .ws.jsonl file
+            ws_log_file: Path to .ws.jsonl file (optionally gzip/zstd/brotli compressed)
+            threaded_decompression: Decompress input on a background thread
+            body_sampler: Add only a sample of the payloads per direction and
+                message type to the schemas; adds x-sampling coverage to the spec
+
+        Raises:
+            ImportError: If genson is not installed
         """
         self.ws_log_file = ws_log_file
+        self.threaded_decompression = threaded_decompression
+        self.body_sampler = body_sampler
+        self.schema_builder = load_schema_builder()
         self.messages: List[Dict[str, Any]] = []
-        self.send_schemas: Dict[str, SchemaBuilder] = {}
-        self.receive_schemas: Dict[str, SchemaBuilder] = {}
+        # Raw length in bytes of each logged message line, parallel to self.messages
+        self.message_sizes: List[int] = []
+        self.send_schemas: Dict[str, Any] = {}
+        self.receive_schemas: Dict[str, Any] = {}
         self.urls: List[str] = []
 
     def load_messages(self) -> None:
         """Load and parse WebSocket messages from JSONL file."""
         try:
-            with open(self.ws_log_file, 'r', encoding='utf-8') as f:
+            with open_binary_input(self.ws_log_file, threaded=self.threaded_decompression) as f:
                 for line_num, line in enumerate(f, 1):
                     line = line.strip()
                     if not line:
@@ -51,12 +111,13 @@ class WebSocketSchemaExtractor:
                     try:
                         message = json.loads(line)
                         self.messages.append(message)
+                        self.message_sizes.append(len(line))
                         
                         # Track unique URLs
                         url = message.get('url', 'unknown')
                         if url not in self.urls:
                             self.urls.append(url)
-                    except json.JSONDecodeError as e:
+                    except ValueError as e:
                         print(f"⚠️  Warning: Invalid JSON on line {line_num}: {e}")
         except FileNotFoundError:
             raise FileNotFoundError(f"WebSocket log file not found: {self.ws_log_file}")
@@ -68,28 +129,70 @@ class WebSocketSchemaExtractor:
         Returns:
             Dictionary containing send and receive schemas
         """
-        for message in self.messages:
-            direction = message.get('direction', 'unknown')
-            data = message.get('data')
-
-            if not data or not isinstance(data, (dict, list)):
-                continue
-
-            # Infer message type
-            message_type = self._infer_message_type(data)
-
-            # Build schema for message type and direction
-            if direction == 'send':
-                if message_type not in self.send_schemas:
-                    self.send_schemas[message_type] = SchemaBuilder()
-                self.send_schemas[message_type].add_object(data)
-            elif direction == 'receive':
-                if message_type not in self.receive_schemas:
-                    self.receive_schemas[message_type] = SchemaBuilder()
-                self.receive_schemas[message_type].add_object(data)
-
-        # Convert SchemaBuilders to schemas
-        result = {
+        for message, size in zip(self.messages, self.message_sizes):
+            self.add_message(message, size)
+
+        return self.build_schemas()
+
+    def add_message(self, message: Dict[str, Any], size: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Add one WebSocket message to the schema builders.
+
+        Args:
+            message: Logged message with direction, url and data
+            size: Length in bytes of the logged message line, for sampling metadata
+
+        Returns:
+            Classification (direction, message type, whether the type is new)
+            or None if the message carries no JSON payload
+        """
+        url = message.get('url', 'unknown')
+        if url not in self.urls:
+            self.urls.append(url)
+
+        direction = message.get('direction', 'unknown')
+        data = message.get('data')
+        timestamp = message.get('timestamp')
+        if not isinstance(timestamp, (int, float)):
+            timestamp = None
+
+        if not data or not isinstance(data, (dict, list)):
+            # Counted so sampling totals cover every frame, payload or not
+            if self.body_sampler is not None:
+                self.body_sampler.sample((direction, None), size=size, timestamp=timestamp)
+            return None
+
+        # Infer message type
+        message_type = self._infer_message_type(data)
+
+        # Build schema for message type and direction
+        if direction == 'send':
+            builders = self.send_schemas
+        elif direction == 'receive':
+            builders = self.receive_schemas
+        else:
+            if self.body_sampler is not None:
+                self.body_sampler.sample((direction, message_type), size=size, timestamp=timestamp)
+            return None
+
+        is_new = message_type not in builders
+        if is_new:
+            builders[message_type] = self.schema_builder()
+        if self.body_sampler is None or self.body_sampler.sample(
+            (direction, message_type), size=size, timestamp=timestamp,
+        ):
+            builders[message_type].add_object(data)
+
+        return {'direction': direction, 'message_type': message_type, 'new_type': is_new}
+
+    def build_schemas(self) -> Dict[str, Any]:
+        """
+        Convert the current schema builders to schemas.
+
+        Returns:
+            Dictionary containing send and receive schemas
+        """
+        return {
             'send': {
                 msg_type: builder.to_schema()
                 for msg_type, builder in self.send_schemas.items()
@@ -100,8 +203,6 @@ class WebSocketSchemaExtractor:
             }
         }
 
-        return result
-
     def _infer_message_type(self, data: Any) -> str:
         """
         Infer message type from data structure.
@@ -112,31 +213,21 @@ class WebSocketSchemaExtractor:
         Returns:
             Message type string
         """
-        if isinstance(data, dict):
-            # Check for common type indicators
-            if 'type' in data:
-                return str(data['type'])
-            elif 'event' in data:
-                return str(data['event'])
-            elif 'action' in data:
-                return str(data['action'])
-            elif 'method' in data:
-                return str(data['method'])
-            else:
-                return 'message'
-        elif isinstance(data, list):
-            return 'array_message'
-        else:
-            return 'unknown'
+        return infer_message_type(data)
 
-    def generate_asyncapi(self) -> Dict[str, Any]:
+    def generate_asyncapi(self, schemas: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Generate AsyncAPI 2.6.0 specification.
 
+        Args:
+            schemas: Prebuilt send/receive schemas; extracted from the loaded
+                messages when omitted
+
         Returns:
             AsyncAPI specification dictionary
         """
-        schemas = self.extract_schemas()
+        if schemas is None:
+            schemas = self.extract_schemas()
 
         asyncapi_spec: Dict[str, Any] = {
             'asyncapi': '2.6.0',
@@ -170,6 +261,7 @@ class WebSocketSchemaExtractor:
                     }
                 }
             }
+            self._add_sampling(asyncapi_spec['channels'][channel_name]['publish'], 'send', message_type)
 
         # Add channels for receive messages
         for message_type, schema in schemas['receive'].items():
@@ -184,9 +276,18 @@ class WebSocketSchemaExtractor:
                     }
                 }
             }
+            self._add_sampling(asyncapi_spec['channels'][channel_name]['subscribe'], 'receive', message_type)
 
         return asyncapi_spec
 
+    def _add_sampling(self, operation: Dict[str, Any], direction: str, message_type: str) -> None:
+        """Attach the sample coverage of a message type to its channel operation."""
+        if self.body_sampler is None:
+            return
+        coverage = self.body_sampler.coverage((direction, message_type))
+        if coverage:
+            operation['x-sampling'] = coverage
+
     def extract(self) -> Dict[str, Any]:
         """
         Extract schemas and generate AsyncAPI (main method).
@@ -207,10 +308,13 @@ def main() -> None:
 Examples:
   python scripts/ws_schema_extractor.py input.ws.jsonl -o asyncapi.yaml
   python scripts/ws_schema_extractor.py input.ws.jsonl -o asyncapi.json --format json
+  python scripts/ws_schema_extractor.py input.ws.jsonl.gz -o asyncapi.yaml.zst
+  python scripts/ws_schema_extractor.py input.ws.jsonl -o asyncapi.yaml --sample-rate 0.05
+  capture-tool | python scripts/ws_schema_extractor.py - --ndjson --emit both > results.ndjson
         """
     )
-    parser.add_argument('input', help='Input WebSocket log file (.ws.jsonl)')
-    parser.add_argument('-o', '--output', required=True, help='Output file path')
+    parser.add_argument('input', help='Input WebSocket log file (.ws.jsonl, optionally .gz/.zst/.br), "-" for stdin with --ndjson')
+    parser.add_argument('-o', '--output', help='Output file path (.gz/.zst/.br to compress); optional with --ndjson')
     parser.add_argument(
         '-f', '--format',
         choices=['yaml', 'json'],
@@ -222,35 +326,72 @@ Examples:
         action='store_true',
         help='Pretty print JSON output'
     )
+    parser.add_argument(
+        '--decompress-thread',
+        action='store_true',
+        help='Decompress input on a background thread'
+    )
+    add_sampling_arguments(parser)
+    add_ndjson_arguments(parser)
 
     args = parser.parse_args()
+    if not args.output and not args.ndjson:
+        parser.error('-o/--output is required unless --ndjson is used')
+
+    # With --ndjson, stdout carries results: report on stderr
+    report = sys.stderr if args.ndjson else sys.stdout
 
     try:
         # Extract schemas and generate AsyncAPI
-        extractor = WebSocketSchemaExtractor(args.input)
-        asyncapi_spec = extractor.extract()
+        extractor = WebSocketSchemaExtractor(
+            args.input,
+            threaded_decompression=args.decompress_thread,
+            body_sampler=BodySampler.from_args(args),
+        )
+
+        if args.ndjson:
+            input_stream = sys.stdin.buffer if args.input == '-' else open_binary_input(args.input)
+            with input_stream:
+                stream_stats = stream_records(
+                    process=extractor.add_message,
+                    record_sizes=True,
+                    snapshot=lambda: {'spec': extractor.generate_asyncapi(extractor.build_schemas())},
+                    input_stream=input_stream,
+                    emit=args.emit,
+                    snapshot_every=args.snapshot_every,
+                    snapshot_interval=args.snapshot_interval,
+                )
+            messages_processed = stream_stats['records']
+            asyncapi_spec = extractor.generate_asyncapi(extractor.build_schemas())
+        else:
+            asyncapi_spec = extractor.extract()
+            messages_processed = len(extractor.messages)
 
         # Write output
-        with open(args.output, 'w', encoding='utf-8') as f:
-            if args.format == 'yaml':
-                yaml.dump(asyncapi_spec, f, default_flow_style=False, sort_keys=False)
-            else:
-                if args.pretty:
-                    json.dump(asyncapi_spec, f, indent=2)
+        if args.output:
+            with open_output(args.output) as f:
+                if args.format == 'yaml':
+                    import yaml
+                    yaml.dump(asyncapi_spec, f, default_flow_style=False, sort_keys=False)
                 else:
-                    json.dump(asyncapi_spec, f)
-
-        print(f"✅ Successfully extracted WebSocket schemas")
-        print(f"   Input: {args.input}")
-        print(f"   Output: {args.output}")
-        print(f"   Messages processed: {len(extractor.messages)}")
-        print(f"   Send message types: {len(extractor.send_schemas)}")
-        print(f"   Receive message types: {len(extractor.receive_schemas)}")
-        print(f"   WebSocket URLs: {len(extractor.urls)}")
+                    if args.pretty:
+                        json.dump(asyncapi_spec, f, indent=2)
+                    else:
+                        json.dump(asyncapi_spec, f)
+
+        print(f"✅ Successfully extracted WebSocket schemas", file=report)
+        print(f"   Input: {args.input}", file=report)
+        print(f"   Output: {args.output or 'stdout (ndjson)'}", file=report)
+        print(f"   Messages processed: {messages_processed}", file=report)
+        print(f"   Send message types: {len(extractor.send_schemas)}", file=report)
+        print(f"   Receive message types: {len(extractor.receive_schemas)}", file=report)
+        print(f"   WebSocket URLs: {len(extractor.urls)}", file=report)
+        if extractor.body_sampler is not None:
+            totals = extractor.body_sampler.totals()
+            print(f"   Sampled payloads: {totals['sampled']}/{totals['seen']}", file=report)
 
     except Exception as e:
-        print(f"❌ Error: {e}")
-        import sys
+        print(f"❌ Error: {e}", file=report)
         sys.exit(1)
 
 